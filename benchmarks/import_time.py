@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+"""Benchmark command line startup time.
+
+Each run starts a fresh interpreter that imports the command line script
+module and resolves a service class the same way `bite -c <connection> ...`
+does (including enabling demand loading like the bin/bite wrapper), both
+with a stale registry index forcing all service modules to be scanned and
+with an up to date one.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+STARTUP = """\
+import sys, time
+start = time.perf_counter()
+from snakeoil import demandimport
+demandimport.enable()
+from bite import const
+from bite.base import get_service_cls
+from bite.scripts import bite
+get_service_cls({service!r}, const.SERVICES)
+get_service_cls({service!r}, const.SERVICE_OPTS, fallbacks=(True,))
+elapsed = time.perf_counter() - start
+print(elapsed, len(sys.modules))
+"""
+
+
+def run(service, cache_dir):
+    env = dict(os.environ, XDG_CACHE_HOME=cache_dir)
+    output = subprocess.run(
+        [sys.executable, '-c', STARTUP.format(service=service)],
+        env=env, check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+    elapsed, modules = output.split()
+    return float(elapsed), int(modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '-n', '--runs', type=int, default=10, help='number of runs per benchmark')
+    parser.add_argument(
+        '-s', '--service', default='bugzilla5.2-rest', help='service type to resolve')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        index = os.path.join(cache_dir, 'registry.json')
+        for name, stale in (('stale index', True), ('current index', False)):
+            times = []
+            for _ in range(args.runs):
+                if stale and os.path.exists(index):
+                    os.remove(index)
+                elapsed, modules = run(args.service, cache_dir)
+                times.append(elapsed * 1000)
+            print(f'{name:<14}: min {min(times):.1f}ms, '
+                  f'median {statistics.median(times):.1f}ms, {modules} modules')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+"""Benchmark memory used by item related objects.
+
+Synthetic Bugzilla REST responses are decoded and used to create bug,
+comment, and change objects, reporting the average number of bytes per
+object retained after the decoded response data is released.
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from bite.service.bugzilla.objects import BugzillaBug, BugzillaComment, BugzillaEvent
+
+
+def bug_data(i):
+    return {
+        'id': i,
+        'alias': [],
+        'assigned_to': f'dev{i % 50}@example.com',
+        'blocks': [i + 1],
+        'cc': [f'user{x}@example.com' for x in range(i % 5)],
+        'classification': 'Unclassified',
+        'component': 'Core',
+        'creation_time': '2018-01-01T00:00:00Z',
+        'creator': f'user{i % 100}@example.com',
+        'depends_on': [],
+        'is_cc_accessible': True,
+        'is_confirmed': True,
+        'is_creator_accessible': True,
+        'keywords': ['PATCH'],
+        'last_change_time': '2019-01-01T00:00:00Z',
+        'op_sys': 'Linux',
+        'platform': 'All',
+        'priority': 'Normal',
+        'product': 'Product',
+        'resolution': 'FIXED',
+        'see_also': [],
+        'severity': 'normal',
+        'status': 'RESOLVED',
+        'summary': f'bug summary {i}',
+        'target_milestone': '---',
+        'url': '',
+        'version': 'unspecified',
+        'whiteboard': '',
+        'cf_stabilisation_atoms': '',
+        'cf_runtime_testing_required': '---',
+    }
+
+
+def comment_data(i):
+    return {
+        'id': i,
+        'creator': f'user{i % 100}@example.com',
+        'creation_time': '2018-01-01T00:00:00Z',
+        'count': i % 10,
+        'text': f'comment text {i}',
+    }
+
+
+def change_data(i):
+    return {
+        'who': f'user{i % 100}@example.com',
+        'when': '2018-01-01T00:00:00Z',
+        'changes': [{'field_name': 'status', 'removed': 'NEW', 'added': 'RESOLVED'}],
+    }
+
+
+def measure(name, count, data, func):
+    """Measure memory retained by objects created from decoded JSON data."""
+    text = json.dumps(data)
+    gc.collect()
+    tracemalloc.start()
+    data = json.loads(text)
+    objs = [func(i, x) for i, x in enumerate(data)]
+    del data
+    gc.collect()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{name:<8}: {size / count:.0f} bytes per object ({count} objects)')
+    return objs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '-n', '--count', type=int, default=10000, help='number of objects to create')
+    args = parser.parse_args()
+    n = args.count
+
+    measure('bugs', n, [bug_data(i) for i in range(n)],
+            lambda i, x: BugzillaBug(None, **x))
+    measure('comments', n, [comment_data(i) for i in range(n)],
+            lambda i, x: BugzillaComment(x, id=i, count=i))
+    measure('changes', n, [change_data(i) for i in range(n)],
+            lambda i, x: BugzillaEvent(x, id=i))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,714 @@
+"""Local stand-in tracker servers used for benchmarking.
+
+Each server speaks enough of a tracker's web service protocol to answer the
+requests bite sends for searching and retrieving items, comments, changes,
+and attachments. Responses are generated from a synthetic dataset of
+configurable size and an artificial delay can be added to every response in
+order to simulate network latency.
+"""
+
+import base64
+import csv
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import json
+import re
+import time
+from urllib.parse import urlencode, urlparse, parse_qs
+from xml.sax.saxutils import escape
+import xmlrpc.client
+
+_STATUSES = ('UNCONFIRMED', 'CONFIRMED', 'IN_PROGRESS', 'RESOLVED', 'VERIFIED')
+_PRIORITIES = ('Lowest', 'Low', 'Normal', 'High', 'Highest')
+_COMPONENTS = ('Core', 'Build', 'Documentation', 'Networking', 'UI')
+_START = datetime(2015, 1, 1, tzinfo=timezone.utc)
+
+# Jira project key used for issue IDs
+PROJECT = 'BENCH'
+
+
+class Dataset(object):
+    """Synthetic items generated on demand.
+
+    Item IDs run from 1 to the dataset size, each having the given number of
+    comments, changes, and attachments. Data is derived from item IDs so it's
+    identical across runs without having to be held in memory.
+    """
+
+    def __init__(self, size=1000, comments=5, changes=3, attachments=1, attachment_size=4096):
+        self.size = size
+        self.comments = comments
+        self.changes = changes
+        self.attachments = attachments
+        self.attachment_size = attachment_size
+
+    def ids(self, ids=None):
+        """Return the existing IDs out of the given ones, defaulting to all IDs."""
+        if ids is None:
+            return range(1, self.size + 1)
+        return [i for i in map(int, ids) if 1 <= i <= self.size]
+
+    def item(self, i):
+        created = _START + timedelta(seconds=i * 3607)
+        return {
+            'id': i,
+            'summary': f'synthetic item {i} summary text',
+            'description': f'Description of synthetic item {i}.\n\n' + 'Lorem ipsum. ' * 20,
+            'creator': f'user{i % 100}@example.com',
+            'assignee': f'dev{i % 50}@example.com',
+            'status': _STATUSES[i % len(_STATUSES)],
+            'priority': _PRIORITIES[i % len(_PRIORITIES)],
+            'component': _COMPONENTS[i % len(_COMPONENTS)],
+            'keywords': ['PATCH'] if i % 3 == 0 else [],
+            'cc': [f'user{x}@example.com' for x in range(i % 5)],
+            'created': created,
+            'modified': created + timedelta(days=1 + i % 30),
+        }
+
+    def comments_for(self, i):
+        created = _START + timedelta(seconds=i * 3607)
+        for j in range(1, self.comments + 1):
+            yield {
+                'id': i * 1000 + j,
+                'count': j,
+                'creator': f'user{(i + j) % 100}@example.com',
+                'created': created + timedelta(hours=j),
+                'text': f'Comment {j} on item {i}.\n' + 'More details follow. ' * 10,
+            }
+
+    def changes_for(self, i):
+        created = _START + timedelta(seconds=i * 3607)
+        for j in range(1, self.changes + 1):
+            yield {
+                'creator': f'dev{(i + j) % 50}@example.com',
+                'created': created + timedelta(hours=j, minutes=30),
+                'field': 'status',
+                'removed': _STATUSES[(i + j - 1) % len(_STATUSES)],
+                'added': _STATUSES[(i + j) % len(_STATUSES)],
+            }
+
+    def attachments_for(self, i):
+        created = _START + timedelta(seconds=i * 3607)
+        for j in range(1, self.attachments + 1):
+            yield {
+                'id': i * 100 + j,
+                'filename': f'file{j}.txt',
+                'creator': f'user{i % 100}@example.com',
+                'created': created + timedelta(hours=j, minutes=15),
+                'size': self.attachment_size,
+            }
+
+    def attachment_data(self, id):
+        line = f'attachment {id} data\n'.encode()
+        return (line * (self.attachment_size // len(line) + 1))[:self.attachment_size]
+
+
+def _rfc3339(dt):
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _jira_time(dt):
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.000+0000')
+
+
+class StandinServer(ThreadingHTTPServer):
+    """HTTP server answering requests using a synthetic dataset."""
+
+    daemon_threads = True
+
+    def __init__(self, address, handler, dataset, latency=0):
+        self.dataset = dataset
+        self.latency = latency
+        super().__init__(address, handler)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Generic stand-in request handler."""
+
+    # keep connections alive between requests like real services
+    protocol_version = 'HTTP/1.1'
+
+    # operations supported by the related bite service
+    operations = ('search', 'get', 'comments', 'changes', 'attachments')
+    # whether the related bite service pages search results
+    paged = True
+
+    @classmethod
+    def base(cls, url):
+        """Service base URL for a stand-in server URL."""
+        return url
+
+    @property
+    def data(self):
+        return self.server.dataset
+
+    def log_message(self, format, *args):
+        pass
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length)
+
+    def _query(self):
+        url = urlparse(self.path)
+        return url.path, parse_qs(url.query)
+
+    def respond(self, content, content_type, status=200, headers=()):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if isinstance(content, str):
+            content = content.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def respond_json(self, data, status=200, headers=()):
+        self.respond(json.dumps(data), 'application/json; charset=utf-8', status, headers)
+
+    def not_found(self):
+        self.respond_json({'error': True, 'code': 404, 'message': 'not found'}, status=404)
+
+
+def _ids(params, key):
+    """Extract IDs from query params, supporting both repeated and comma-separated values."""
+    return [x for v in params.get(key, ()) for x in v.split(',') if x]
+
+
+class BugzillaRestHandler(_Handler):
+    """Stand-in for Bugzilla's REST interface."""
+
+    def bug(self, i, fields=None):
+        item = self.data.item(i)
+        bug = {
+            'id': i,
+            'alias': [],
+            'summary': item['summary'],
+            'creator': item['creator'],
+            'assigned_to': item['assignee'],
+            'status': item['status'],
+            'resolution': 'FIXED' if item['status'] in ('RESOLVED', 'VERIFIED') else '',
+            'priority': item['priority'],
+            'severity': 'normal',
+            'product': 'Product',
+            'component': item['component'],
+            'version': 'unspecified',
+            'op_sys': 'Linux',
+            'platform': 'All',
+            'keywords': item['keywords'],
+            'cc': item['cc'],
+            'blocks': [],
+            'depends_on': [],
+            'creation_time': self.time(item['created']),
+            'last_change_time': self.time(item['modified']),
+        }
+        if fields:
+            bug = {k: v for k, v in bug.items() if k in fields}
+        return bug
+
+    @staticmethod
+    def time(dt):
+        return _rfc3339(dt)
+
+    def comments(self, i):
+        return {'comments': [
+            {'id': c['id'], 'bug_id': i, 'count': c['count'], 'creator': c['creator'],
+             'creation_time': self.time(c['created']), 'text': c['text'], 'is_private': False}
+            for c in self.data.comments_for(i)]}
+
+    def history(self, i):
+        return {'id': i, 'alias': [], 'history': [
+            {'who': c['creator'], 'when': self.time(c['created']), 'changes': [
+                {'field_name': c['field'], 'removed': c['removed'], 'added': c['added']}]}
+            for c in self.data.changes_for(i)]}
+
+    def attachments(self, i, data=True):
+        l = []
+        for a in self.data.attachments_for(i):
+            attachment = {
+                'id': a['id'], 'bug_id': i, 'file_name': a['filename'],
+                'summary': a['filename'], 'content_type': 'text/plain',
+                'size': a['size'], 'creator': a['creator'],
+                'creation_time': self.time(a['created']),
+                'last_change_time': self.time(a['created']),
+                'is_private': False, 'is_obsolete': False, 'is_patch': False,
+            }
+            if data:
+                attachment['data'] = self.encode_data(self.data.attachment_data(a['id']))
+            l.append(attachment)
+        return l
+
+    @staticmethod
+    def encode_data(data):
+        return base64.b64encode(data).decode()
+
+    def search(self, offset=0, limit=None, fields=None):
+        ids = self.data.ids()[offset:]
+        if limit:
+            ids = ids[:limit]
+        return {'bugs': [self.bug(i, fields) for i in ids]}
+
+    def do_GET(self):
+        path, params = self._query()
+        fields = params.get('include_fields')
+        m = re.match(r'^/rest/bug(?:/(\d+)/(comment|history|attachment))?$', path)
+        if path == '/attachment.cgi':
+            id = int(params['id'][0])
+            self.respond(self.data.attachment_data(id), 'text/plain')
+        elif m is None:
+            self.not_found()
+        elif m.group(1) is None:
+            if 'id' in params:
+                bugs = [self.bug(i, fields) for i in self.data.ids(_ids(params, 'id'))]
+                self.respond_json({'bugs': bugs, 'faults': []})
+            else:
+                offset = int(params.get('offset', [0])[0])
+                limit = int(params.get('limit', [0])[0])
+                self.respond_json(self.search(offset, limit, fields))
+        else:
+            ids = self.data.ids([m.group(1)] + _ids(params, 'ids'))
+            call = m.group(2)
+            if call == 'comment':
+                data = {'bugs': {str(i): self.comments(i) for i in ids}, 'comments': {}}
+            elif call == 'history':
+                data = {'bugs': [self.history(i) for i in ids]}
+            else:
+                inline = 'data' not in params.get('exclude_fields', ())
+                data = {
+                    'bugs': {str(i): self.attachments(i, inline) for i in ids},
+                    'attachments': {},
+                }
+            self.respond_json(data)
+
+
+class _RpcHandler(_Handler):
+    """Generic stand-in for RPC interfaces."""
+
+    # RPC endpoint path
+    endpoint = None
+
+    def decode(self, body):
+        """Decode a request body into its method and params."""
+        raise NotImplementedError
+
+    def encode(self, result):
+        """Encode a method's result, returning the response content and type."""
+        raise NotImplementedError
+
+    def multicall_result(self, result):
+        """Wrap the result of a single call in a multicall response."""
+        raise NotImplementedError
+
+    def multicall(self, calls):
+        raise NotImplementedError
+
+    def call(self, method, params):
+        if method == 'system.multicall':
+            return [
+                self.multicall_result(self.call(method, params))
+                for method, params in self.multicall(params)]
+        func = getattr(self, 'rpc_' + method.replace('.', '_'), None)
+        if func is None:
+            raise KeyError(method)
+        return func(*params)
+
+    def do_POST(self):
+        path, _params = self._query()
+        if path != self.endpoint:
+            self.not_found()
+            return
+        method, params = self.decode(self._body())
+        self.respond(*self.encode(self.call(method, params)))
+
+
+class _XmlrpcHandler(_RpcHandler):
+    """Stand-in for XML-RPC interfaces."""
+
+    def decode(self, body):
+        params, method = xmlrpc.client.loads(body)
+        return method, params
+
+    def encode(self, result):
+        content = xmlrpc.client.dumps((result,), methodresponse=True, allow_none=True)
+        return content, 'text/xml'
+
+    def multicall(self, params):
+        return ((c['methodName'], c['params']) for c in params[0])
+
+    def multicall_result(self, result):
+        return [result]
+
+
+class _JsonrpcHandler(_RpcHandler):
+    """Stand-in for JSON-RPC interfaces."""
+
+    def decode(self, body):
+        data = json.loads(body)
+        self._id = data.get('id')
+        return data['method'], data['params']
+
+    def encode(self, result):
+        content = json.dumps(
+            {'result': result, 'error': None, 'id': self._id}, default=self.encode_object)
+        return content, 'application/json'
+
+    @staticmethod
+    def encode_object(obj):
+        raise TypeError(f'unable to encode object: {obj!r}')
+
+    def multicall(self, params):
+        return ((c['method'], c['params']) for c in params)
+
+    def multicall_result(self, result):
+        return {'result': result, 'error': None, 'id': self._id}
+
+
+class BugzillaXmlrpcHandler(_XmlrpcHandler, BugzillaRestHandler):
+    """Stand-in for Bugzilla's XML-RPC interface."""
+
+    endpoint = '/xmlrpc.cgi'
+
+    @staticmethod
+    def time(dt):
+        return dt.replace(tzinfo=None)
+
+    @staticmethod
+    def encode_data(data):
+        return xmlrpc.client.Binary(data)
+
+    def rpc_Bug_search(self, params):
+        fields = params.get('include_fields')
+        return self.search(params.get('offset', 0), params.get('limit'), fields)
+
+    def rpc_Bug_get(self, params):
+        fields = params.get('include_fields')
+        return {'bugs': [self.bug(i, fields) for i in self.data.ids(params['ids'])], 'faults': []}
+
+    def rpc_Bug_comments(self, params):
+        ids = self.data.ids(params['ids'])
+        return {'bugs': {str(i): self.comments(i) for i in ids}, 'comments': {}}
+
+    def rpc_Bug_history(self, params):
+        return {'bugs': [self.history(i) for i in self.data.ids(params['ids'])]}
+
+    def rpc_Bug_attachments(self, params):
+        inline = 'data' not in params.get('exclude_fields', ())
+        ids = self.data.ids(params['ids'])
+        return {'bugs': {str(i): self.attachments(i, inline) for i in ids}, 'attachments': {}}
+
+
+class JiraHandler(_Handler):
+    """Stand-in for Jira's REST interface."""
+
+    operations = ('search', 'get', 'comments')
+
+    @classmethod
+    def base(cls, url):
+        return f'{url}/projects/{PROJECT}'
+
+    @staticmethod
+    def user(name):
+        return {'name': name, 'displayName': name.split('@')[0]}
+
+    def comment(self, c):
+        return {
+            'id': str(c['id']), 'author': self.user(c['creator']), 'body': c['text'],
+            'created': _jira_time(c['created']), 'updated': _jira_time(c['created']),
+        }
+
+    def issue(self, i, fields=None, expand=()):
+        item = self.data.item(i)
+        data = {
+            'summary': item['summary'],
+            'description': item['description'],
+            'creator': self.user(item['creator']),
+            'reporter': self.user(item['creator']),
+            'assignee': self.user(item['assignee']),
+            'status': {'name': item['status']},
+            'priority': {'name': item['priority']},
+            'created': _jira_time(item['created']),
+            'updated': _jira_time(item['modified']),
+            'votes': {'votes': i % 7},
+            'watches': {'watchCount': i % 11},
+            'labels': item['keywords'],
+        }
+        if 'comment' in expand:
+            comments = [self.comment(c) for c in self.data.comments_for(i)]
+            data['comment'] = {
+                'startAt': 0, 'maxResults': len(comments),
+                'total': len(comments), 'comments': comments,
+            }
+        if 'attachment' in expand:
+            data['attachment'] = [{
+                'id': str(a['id']), 'author': self.user(a['creator']),
+                'created': _jira_time(a['created']), 'size': a['size'],
+                'filename': a['filename'], 'mimeType': 'text/plain',
+                'content': f"{self.server.url}/secure/attachment/{a['id']}/{a['filename']}",
+            } for a in self.data.attachments_for(i)]
+        if fields and '*all' not in fields:
+            data = {k: v for k, v in data.items() if k in fields}
+        return {'id': str(10000 + i), 'key': f'{PROJECT}-{i}', 'fields': data}
+
+    def _issue_id(self, key):
+        project, _sep, id = key.partition('-')
+        if project != PROJECT or not self.data.ids([id]):
+            return None
+        return int(id)
+
+    def do_GET(self):
+        path, params = self._query()
+        m = re.match(r'^/rest/api/2/issue/([^/]+)(/comment)?$', path)
+        i = self._issue_id(m.group(1)) if m is not None else None
+        if i is None:
+            self.respond_json(
+                {'errorMessages': ['Issue does not exist'], 'errors': {}}, status=404)
+        elif m.group(2):
+            comments = [self.comment(c) for c in self.data.comments_for(i)]
+            start = int(params.get('startAt', [0])[0])
+            size = int(params.get('maxResults', [len(comments)])[0])
+            self.respond_json({
+                'startAt': start, 'maxResults': size, 'total': len(comments),
+                'comments': comments[start:start + size],
+            })
+        else:
+            expand = _ids(params, 'expand')
+            self.respond_json(self.issue(i, params.get('fields'), expand))
+
+    def do_POST(self):
+        path, _params = self._query()
+        if path != '/rest/api/2/search':
+            self.not_found()
+            return
+        params = json.loads(self._body())
+        start = params.get('startAt', 0)
+        size = params.get('maxResults', 50)
+        fields = params.get('fields')
+        expand = params.get('expand', ())
+        ids = self.data.ids()
+        self.respond_json({
+            'startAt': start, 'maxResults': size, 'total': len(ids),
+            'issues': [self.issue(i, fields, expand) for i in ids[start:start + size]],
+        })
+
+
+class GithubHandler(_Handler):
+    """Stand-in for Github's v3 REST interface."""
+
+    operations = ('search',)
+
+    @classmethod
+    def base(cls, url):
+        return f'{url}/bite/bench'
+
+    def issue(self, i):
+        item = self.data.item(i)
+        return {
+            'id': 100000 + i,
+            'number': i,
+            'title': item['summary'],
+            'body': item['description'],
+            'user': {'login': item['creator'].split('@')[0]},
+            'assignee': {'login': item['assignee'].split('@')[0]},
+            'labels': [{'name': x} for x in item['keywords']],
+            'state': 'open',
+            'comments': self.data.comments,
+            'created_at': _rfc3339(item['created']),
+            'updated_at': _rfc3339(item['modified']),
+            'closed_at': None,
+        }
+
+    def do_GET(self):
+        path, params = self._query()
+        if path != '/search/issues':
+            self.not_found()
+            return
+        page = int(params.get('page', [1])[0])
+        size = int(params.get('per_page', [30])[0])
+        ids = self.data.ids()
+        start = (page - 1) * size
+        headers = []
+        if start + size < len(ids):
+            query = urlencode({'q': params['q'][0], 'per_page': size, 'page': page + 1})
+            next_page = f'{self.server.url}{path}?{query}'
+            headers.append(('Link', f'<{next_page}>; rel="next"'))
+        self.respond_json({
+            'total_count': len(ids), 'incomplete_results': False,
+            'items': [self.issue(i) for i in ids[start:start + size]],
+        }, headers=headers)
+
+
+class _TracRpcHandler(_RpcHandler):
+    """Stand-in for Trac's RPC interfaces."""
+
+    endpoint = '/rpc'
+    paged = False
+
+    def time(self, dt):
+        return dt
+
+    def rpc_ticket_query(self, query):
+        return list(self.data.ids())
+
+    def rpc_ticket_get(self, id):
+        i = int(id)
+        item = self.data.item(i)
+        attrs = {
+            'summary': item['summary'],
+            'description': item['description'],
+            'reporter': item['creator'],
+            'owner': item['assignee'],
+            'status': item['status'].lower(),
+            'priority': item['priority'].lower(),
+            'component': item['component'],
+            'keywords': ' '.join(item['keywords']),
+            'cc': ', '.join(item['cc']),
+            'type': 'defect',
+            'milestone': '',
+            'version': '',
+        }
+        return [i, self.time(item['created']), self.time(item['modified']), attrs]
+
+    def rpc_ticket_changeLog(self, id):
+        i = int(id)
+        log = []
+        for c in self.data.comments_for(i):
+            log.append([self.time(c['created']), c['creator'], 'comment', str(c['count']), c['text'], 1])
+        for c in self.data.changes_for(i):
+            log.append([self.time(c['created']), c['creator'], c['field'], c['removed'], c['added'], 1])
+        return sorted(log, key=lambda x: x[0])
+
+    def rpc_ticket_listAttachments(self, id):
+        return [
+            [a['filename'], '', a['size'], self.time(a['created']), a['creator']]
+            for a in self.data.attachments_for(int(id))]
+
+    def rpc_system_getAPIVersion(self):
+        return [1, 1, 8]
+
+
+class TracJsonrpcHandler(_JsonrpcHandler, _TracRpcHandler):
+    """Stand-in for Trac's JSON-RPC interface."""
+
+    @staticmethod
+    def encode_object(obj):
+        if isinstance(obj, datetime):
+            return {'__jsonclass__': ['datetime', obj.replace(tzinfo=None).isoformat()]}
+        raise TypeError(f'unable to encode object: {obj!r}')
+
+
+class TracXmlrpcHandler(_XmlrpcHandler, _TracRpcHandler):
+    """Stand-in for Trac's XML-RPC interface."""
+
+    def time(self, dt):
+        return dt.replace(tzinfo=None)
+
+
+class TracCsvHandler(_Handler):
+    """Stand-in for Trac's CSV query export and RSS ticket feeds."""
+
+    paged = False
+
+    # column values derived from item fields
+    _columns = {
+        'id': lambda x: x['id'],
+        'summary': lambda x: x['summary'],
+        'status': lambda x: x['status'].lower(),
+        'priority': lambda x: x['priority'].lower(),
+        'owner': lambda x: x['assignee'],
+        'reporter': lambda x: x['creator'],
+        'type': lambda x: 'defect',
+        'component': lambda x: x['component'],
+        'keywords': lambda x: ' '.join(x['keywords']),
+        'cc': lambda x: ', '.join(x['cc']),
+        'description': lambda x: x['description'],
+        'time': lambda x: x['created'].isoformat(),
+        'changetime': lambda x: x['modified'].isoformat(),
+    }
+
+    def query(self, params):
+        ids = self.data.ids(_ids(params, 'id') or None)
+        columns = params.get('col', ['id', 'summary', 'status'])
+        f = io.StringIO()
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for i in ids:
+            item = self.data.item(i)
+            writer.writerow([self._columns.get(c, lambda x: '')(item) for c in columns])
+        # trac prefixes exports with a BOM
+        self.respond('\ufeff' + f.getvalue(), 'text/csv;charset=utf-8')
+
+    @staticmethod
+    def _rss_item(title, creator, created, desc):
+        return (
+            f'<item><dc:creator>{escape(creator)}</dc:creator>'
+            f'<pubDate>{format_datetime(created, usegmt=True)}</pubDate>'
+            f'<title>{escape(title)}</title>'
+            f'<description>{escape(desc)}</description></item>')
+
+    def feed(self, i):
+        events = []
+        for c in self.data.comments_for(i):
+            text = escape(c['text'])
+            events.append((c['created'], self._rss_item(
+                f"comment {c['count']}", c['creator'], c['created'], f'<p>{text}</p>')))
+        for c in self.data.changes_for(i):
+            desc = (
+                f"<ul><li><strong>{c['field']}</strong> changed from "
+                f"<em>{c['removed']}</em> to <em>{c['added']}</em></li></ul>")
+            events.append((c['created'], self._rss_item(
+                f"{c['field']} changed", c['creator'], c['created'], desc)))
+        for a in self.data.attachments_for(i):
+            desc = f"<ul><li><strong>attachment</strong> set to <em>{a['filename']}</em></li></ul>"
+            events.append((a['created'], self._rss_item(
+                'attachment set', a['creator'], a['created'], desc)))
+        items = ''.join(x for _created, x in sorted(events, key=lambda x: x[0]))
+        self.respond(
+            '<?xml version="1.0"?>\n'
+            '<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            f'<channel><title>#{i}</title>{items}</channel></rss>',
+            'application/rss+xml')
+
+    def do_GET(self):
+        path, params = self._query()
+        m = re.match(r'^/ticket/(\d+)$', path)
+        if path == '/query' and params.get('format') == ['csv']:
+            self.query(params)
+        elif m is not None and self.data.ids([m.group(1)]):
+            self.feed(int(m.group(1)))
+        else:
+            self.respond('not found', 'text/plain', status=404)
+
+
+# stand-in handlers for supported service types
+HANDLERS = {
+    'bugzilla5.2-rest': BugzillaRestHandler,
+    'bugzilla5.2-xmlrpc': BugzillaXmlrpcHandler,
+    'jira': JiraHandler,
+    'github-rest': GithubHandler,
+    'trac-jsonrpc': TracJsonrpcHandler,
+    'trac-xmlrpc': TracXmlrpcHandler,
+    'trac-scraper-csv': TracCsvHandler,
+}
+
+
+def serve(service, dataset, latency=0, address=('127.0.0.1', 0)):
+    """Create a stand-in server for a service type."""
+    return StandinServer(address, HANDLERS[service], dataset, latency=latency)
+
+
+def run(service, dataset, latency, conn):
+    """Run a stand-in server, sending its URL over a pipe once it's listening."""
+    server = serve(service, dataset, latency)
+    conn.send(server.url)
+    conn.close()
+    server.serve_forever()
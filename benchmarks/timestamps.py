@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+"""Benchmark timestamp parsing used when creating item objects.
+
+Parses a list of distinct RFC 3339 timestamps using dateutil, the generic
+RFC 3339 parser, and the UTC fast path, reporting the time taken and the
+rate for each parser.
+"""
+
+import argparse
+from datetime import datetime, timedelta, timezone
+import time
+
+from dateutil.parser import parse as dateparse
+
+from bite import rfc3339
+from bite.service.bugzilla.objects import parsetime
+
+
+def timestamps(count):
+    start = datetime(2000, 1, 1, tzinfo=timezone.utc)
+    return [(start + timedelta(seconds=i * 37)).strftime('%Y-%m-%dT%H:%M:%SZ')
+            for i in range(count)]
+
+
+def measure(name, data, func):
+    """Measure the time taken to parse all the given timestamps."""
+    start = time.perf_counter()
+    for x in data:
+        func(x)
+    elapsed = time.perf_counter() - start
+    print(f'{name:<20}: {elapsed:.2f}s ({len(data) / elapsed:,.0f} timestamps/s)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '-n', '--count', type=int, default=1000000, help='number of timestamps to parse')
+    args = parser.parse_args()
+    data = timestamps(args.count)
+
+    # sanity check that all the parsers agree
+    for x in data[:1000]:
+        assert dateparse(x) == rfc3339.parse_datetime(x) == rfc3339.parse_utc_datetime(x)
+
+    measure('dateutil', data, dateparse)
+    measure('rfc3339', data, rfc3339.parse_datetime)
+    measure('rfc3339 utc', data, rfc3339.parse_utc_datetime)
+    measure('bugzilla parsetime', data, parsetime)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+"""Benchmark service requests against local stand-in tracker servers.
+
+Stand-in servers speaking the Bugzilla REST, Bugzilla XML-RPC, Jira, Github,
+Trac RPC, and Trac CSV/RSS formats serve a synthetic dataset (see
+standins.py) while the related service classes run search, get, comments,
+changes, and attachments requests against them. Each operation runs in a
+fresh process, reporting the number of HTTP requests sent, the request and
+item rates, and the peak RSS of the process. The startup time of a fresh
+interpreter up to receiving the first requested item is also reported.
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import standins
+
+from bite import const
+from bite.base import get_service_cls
+from bite.service._trace import Hooks
+
+STARTUP = """\
+import sys, time
+start = time.perf_counter()
+from bite import const
+from bite.base import get_service_cls
+cls = get_service_cls({service!r}, const.SERVICES)
+service = cls(base={base!r}, connection=None, http_cache=False)
+{override}next(iter(service.SearchRequest(params={{'terms': ['synthetic']}}).send()))
+print(time.perf_counter() - start)
+"""
+
+OPERATIONS = ('search', 'get', 'comments', 'changes', 'attachments')
+
+
+def _count(results):
+    """Count the items, comments, changes, or attachments returned by a request."""
+    count = 0
+    for x in results:
+        count += len(x) if isinstance(x, tuple) else 1
+    return count
+
+
+class RequestCounter(Hooks):
+    """Count the HTTP requests sent by a service."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def on_request_done(self, req, error=None):
+        with self._lock:
+            self.count += 1
+
+
+def _api_base(service, url):
+    """Return the overridden API base URL for a stand-in server, if required."""
+    # github's API is normally served from a separate api.* host
+    return url if service == 'github-rest' else None
+
+
+def measure(service, url, operation, ids, kw):
+    """Run a single operation, returning its statistics."""
+    handler = standins.HANDLERS[service]
+    if not handler.paged:
+        kw = {k: v for k, v in kw.items() if k != 'max_results'}
+    cls = get_service_cls(service, const.SERVICES)
+    s = cls(base=handler.base(url), connection=None, http_cache=False, **kw)
+    api = _api_base(service, url)
+    if api is not None:
+        s._base = api
+    counter = RequestCounter()
+    s.hooks.append(counter)
+
+    start = time.perf_counter()
+    if operation == 'search':
+        results = s.SearchRequest(params={'terms': ['synthetic']}).send()
+    else:
+        results = getattr(s, operation)(ids=ids)
+    items = _count(results)
+    elapsed = time.perf_counter() - start
+
+    # kilobytes on linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss //= 1024
+    return elapsed, counter.count, items, rss
+
+
+def startup(service, url, cache_dir, runs):
+    """Measure the time taken for a fresh interpreter to receive a search result."""
+    api = _api_base(service, url)
+    code = STARTUP.format(
+        service=service, base=standins.HANDLERS[service].base(url),
+        override=f'service._base = {api!r}\n' if api is not None else '')
+    env = dict(os.environ, XDG_CACHE_HOME=cache_dir)
+    times = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', code], env=env, check=True,
+            stdout=subprocess.PIPE, universal_newlines=True).stdout
+        times.append(float(output) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '-s', '--service', action='append', choices=sorted(standins.HANDLERS),
+        help='service type to benchmark (defaults to all)')
+    parser.add_argument(
+        '-o', '--operation', action='append', choices=OPERATIONS,
+        help='operation to run (defaults to all supported)')
+    parser.add_argument(
+        '-n', '--items', type=int, default=1000, help='number of items in the dataset')
+    parser.add_argument(
+        '--ids', type=int, default=100, help='number of IDs requested by non-search operations')
+    parser.add_argument(
+        '--comments', type=int, default=5, help='number of comments per item')
+    parser.add_argument(
+        '--changes', type=int, default=3, help='number of changes per item')
+    parser.add_argument(
+        '--attachments', type=int, default=1, help='number of attachments per item')
+    parser.add_argument(
+        '--latency', type=float, default=0, help='milliseconds of latency added to responses')
+    parser.add_argument(
+        '--page-size', type=int, default=100, help='max number of search results per request')
+    parser.add_argument(
+        '-c', '--concurrent', type=int, help='max number of concurrent requests')
+    parser.add_argument(
+        '--engine', choices=('thread', 'async'), help='request dispatch engine')
+    parser.add_argument(
+        '-r', '--runs', type=int, default=3, help='number of runs measuring startup time')
+    args = parser.parse_args()
+
+    dataset = standins.Dataset(
+        size=args.items, comments=args.comments, changes=args.changes,
+        attachments=args.attachments)
+    ids = [str(i) for i in range(1, min(args.ids, args.items) + 1)]
+    kw = {'max_results': args.page_size, 'concurrent': args.concurrent, 'engine': args.engine}
+
+    # use separate processes so servers don't compete with clients for the GIL
+    # and the peak RSS of each operation is measured independently
+    ctx = multiprocessing.get_context('spawn')
+
+    print(f"{'service':<20} {'operation':<12} {'requests':>8} {'req/s':>9} "
+          f"{'items':>7} {'items/s':>10} {'peak RSS':>10}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for service in args.service or sorted(standins.HANDLERS):
+            handler = standins.HANDLERS[service]
+            recv, send = ctx.Pipe(duplex=False)
+            server = ctx.Process(
+                target=standins.run, args=(service, dataset, args.latency / 1000, send),
+                daemon=True)
+            server.start()
+            try:
+                url = recv.recv()
+                for operation in args.operation or OPERATIONS:
+                    if operation not in handler.operations:
+                        continue
+                    with ctx.Pool(1) as pool:
+                        elapsed, requests, items, rss = pool.apply(
+                            measure, (service, url, operation, ids, kw))
+                    print(f'{service:<20} {operation:<12} {requests:>8} '
+                          f'{requests / elapsed:>9.1f} {items:>7} {items / elapsed:>10.1f} '
+                          f'{rss / 1024:>7.1f}MiB')
+                elapsed = startup(service, url, cache_dir, args.runs)
+                print(f"{service:<20} {'startup':<12} {elapsed:>8.1f}ms")
+            finally:
+                server.terminate()
+                server.join()
+
+
+if __name__ == '__main__':
+    main()
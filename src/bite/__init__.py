@@ -4,4 +4,4 @@ __title__ = 'bite'
 __version__ = '0.0.2'
 
 from . import const
-from .base import get_service
+from .base import get_service, multi_search
@@ -12,6 +12,7 @@ import sys
 from . import const
 from .base import service_classes
 from .exceptions import BiteError
+from .utils import read_cached
 
 
 class ConfigInterpolationError(InterpolationError):
@@ -149,13 +150,11 @@ class Aliases(object):
     def load(self, path, force=False):
         """Create a config object loaded with alias file info."""
         try:
-            if force:
-                with open(path) as f:
-                    self._aliases.read_file(f)
-            else:
-                self._aliases.read(path)
+            self._aliases.read_string(read_cached(path), source=path)
         except IOError as e:
-            raise BiteError(f'cannot load aliases file {e.filename!r}: {e.strerror}')
+            # nonexistent or unreadable optional files are skipped
+            if force:
+                raise BiteError(f'cannot load aliases file {e.filename!r}: {e.strerror}')
         except (DuplicateSectionError, DuplicateOptionError) as e:
             raise BiteError(e)
 
@@ -1,4 +1,5 @@
-from argparse import Action, ArgumentError, ArgumentTypeError
+from argparse import Action, ArgumentError, ArgumentTypeError, _SubParsersAction
+from copy import copy
 from importlib import import_module
 import os
 import re
@@ -257,6 +258,61 @@ class parse_append(Action):
 
 class ArgumentParser(arghparse.ArgumentParser):
 
+    # initialized services reused between parsing runs keyed by their
+    # settings, used by long-running processes such as `bite serve`
+    services = None
+
+    def _get_service(self, service_name, args):
+        """Initialize a service, reusing a previous instance if enabled."""
+        cls = get_service_cls(service_name, const.SERVICES)
+        # services with per-run inputs or outputs can't be shared
+        if self.services is None or any(
+                args.get(x) is not None for x in ('input', 'trace', 'record')):
+            return cls(**args)
+        key = (service_name, repr(sorted(args.items())))
+        service = self.services.get(key)
+        if service is None:
+            service = self.services[key] = cls(**args)
+        return service
+
+    def checkpoint(self):
+        """Save the parser's current state, returning a function that restores it.
+
+        Parsing adds service specific options and subcommands to the parser so
+        long-running processes such as `bite serve` use this to reuse a single
+        parser for multiple commands instead of rebuilding it each time.
+        """
+        containers = []
+        for attr in ('_actions', '_option_string_actions', '_defaults', '_action_groups',
+                     '_mutually_exclusive_groups', '_has_negative_number_optionals'):
+            containers.append((self, attr))
+        for group in self._action_groups + self._mutually_exclusive_groups:
+            containers.append((group, '_group_actions'))
+        for action in self._actions:
+            if isinstance(action, _SubParsersAction):
+                containers.extend([(action, 'choices'), (action, '_choices_actions')])
+        containers = [(obj, attr, getattr(obj, attr)) for obj, attr in containers]
+        contents = [copy(x) for _obj, _attr, x in containers]
+
+        attrs = [(self, '_subparsers', self._subparsers)]
+        attrs.extend((x, 'default', x.default) for x in self._actions)
+        attrs.extend((x, 'title', x.title) for x in self._action_groups)
+
+        def restore():
+            for (obj, attr, value), saved in zip(containers, contents):
+                # containers are shared between parsers and their groups so
+                # they're altered in place
+                if isinstance(value, dict):
+                    value.clear()
+                    value.update(saved)
+                else:
+                    value[:] = saved
+                setattr(obj, attr, value)
+            for obj, attr, value in attrs:
+                setattr(obj, attr, value)
+
+        return restore
+
     @staticmethod
     def _substitute_args(args, initial_args):
         for input_list in initial_args.input:
@@ -321,7 +377,7 @@ class ArgumentParser(arghparse.ArgumentParser):
         service_opts.add_config_opts(args=initial_args, config_opts=config.opts)
 
         # initialize requested service
-        service = get_service_cls(service_name, const.SERVICES)(**vars(initial_args))
+        service = self._get_service(service_name, vars(initial_args))
 
         try:
             # add service specific main opts to the argparser
@@ -376,8 +432,8 @@ class ArgumentParser(arghparse.ArgumentParser):
 
         # client settings that override unset service level args
         for attr in ('verbosity', 'debug'):
-            if not getattr(service, attr):
-                setattr(service, attr, fcn_args.get(attr))
+            value = getattr(initial_args, attr, None)
+            setattr(service, attr, value if value else fcn_args.get(attr))
 
         # set args namespace items for the client
         initial_args.service = service
@@ -5,6 +5,7 @@ from functools import partial
 from snakeoil.cli import arghparse
 
 from .. import const
+from ..columns import FORMATS
 from ..exceptions import BiteError
 from ..argparser import (
     ParseStdin, Comment, IntList, IDList, StringList, IDs, ID_Maps, ID_Str_Maps,
@@ -104,11 +105,18 @@ class ServiceOpts(object, metaclass=_RegisterSubcmds):
     _config_map = {
         'skip_auth': str2bool,
         'verify': str2bool,
+        'http_cache': str2bool,
         'quiet': str2bool,
         'columns': lambda x: setattr(const, 'COLUMNS', int(x)),
         'concurrent': int,
         'timeout': int,
         'max_results': int,
+        'max_ids': int,
+        'prefetch': int,
+        'rate_limit': float,
+        'rate_burst': int,
+        'adaptive': str2bool,
+        'retries': int,
     }
 
     def __init__(self, parser, service_name):
@@ -239,6 +247,13 @@ class Search(TemplatedSubcmd, ReceiveSubcmd):
         self.parser.add_argument(
             'terms', nargs='*', metavar='TERM', action='parse_stdin',
             help=f"string(s) to search for in {self.service.item.type} summary/title")
+        # optional args
+        self.opts.add_argument(
+            '--format', dest='export_format', choices=FORMATS,
+            help='export results in a columnar format')
+        self.opts.add_argument(
+            '--export-file', metavar='PATH',
+            help='file to export results to (defaults to stdout)')
 
 
 class PagedSearch(Search):
@@ -278,6 +293,9 @@ class Get(ReceiveSubcmd):
         single_action.add_argument(
             '-U', '--url', dest='output_url', action='store_true',
             help=f'output {self.service.item.type} URL(s)')
+        self.opts.add_argument(
+            '-L', '--local', action='store_true',
+            help=f'get {self.service.item.type}(s) from the local store (see `bite sync`)')
         self.opts.add_argument(
             '-A', '--no-attachments', action='store_false', dest='get_attachments',
             help='do not show attachments')
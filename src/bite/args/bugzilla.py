@@ -21,13 +21,18 @@ class Bugzilla4_4Opts(args.ServiceOpts):
 
     _config_map = args.ServiceOpts._config_map.copy()
     _config_map['restrict_login'] = str2bool
+    _config_map['multicall_size'] = int
 
     def add_main_opts(self, service):
         """Add service specific arguments."""
-        from ..scripts.bite import auth_opts
+        from ..scripts.bite import auth_opts, connect_opts
         auth_opts.add_argument(
             '--restrict', action='store_true', dest='restrict_login',
             help='restrict the login to your IP address')
+        connect_opts.add_argument(
+            '--multicall-size', type=int, metavar='BYTES',
+            help='batch get calls into system.multicall requests of a maximum '
+                 'payload size (disabled by default)')
 
 
 class Bugzilla5_0Opts(Bugzilla4_4Opts):
@@ -1,5 +1,10 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from importlib import import_module
+from operator import attrgetter
+import queue
 import re
+import threading
 
 from . import const, service
 from .exceptions import BiteError
@@ -50,6 +55,79 @@ def get_service(connection, **kw):
     return service_cls(**args)
 
 
+def multi_search(connections, key=None, reverse=False, **params):
+    """Search multiple services concurrently.
+
+    Connections can be configured connection or service names, or service
+    objects. Results are yielded as (connection, item) tuples in the order
+    they're received from all services. If a sort key is given, either an item
+    attribute name or a function, results are merged by it as they arrive
+    instead, assuming each service returns its results in that order. Items
+    missing a sort key value are yielded after those that have one.
+    """
+    connections = list(connections)
+    services = [
+        x if isinstance(x, service.Service) else get_service(x) for x in connections]
+    if isinstance(key, str):
+        key = attrgetter(key)
+    select = max if reverse else min
+    if key is not None:
+        item_key = key
+
+        def key(item):
+            # sort missing values last without comparing them to others
+            value = item_key(item)
+            return ((value is None) != reverse, value)
+
+    results = queue.Queue()
+    done = threading.Event()
+
+    def _search(i, s):
+        try:
+            for item in s.SearchRequest(params=dict(params)).send():
+                if done.is_set():
+                    return
+                results.put((i, item, None))
+        except Exception as e:
+            results.put((i, None, e))
+            return
+        results.put((i, None, None))
+
+    def _next():
+        """Get the next result, marking searches finished when they run out."""
+        i, item, error = results.get()
+        if error is not None:
+            raise error
+        elif item is None:
+            running.discard(i)
+        else:
+            pending[i].append(item)
+
+    running = set(range(len(services)))
+    pending = [deque() for _ in services]
+    executor = ThreadPoolExecutor(max_workers=max(len(services), 1))
+    try:
+        for i, s in enumerate(services):
+            executor.submit(_search, i, s)
+        while running or any(pending):
+            if key is None:
+                while running and not any(pending):
+                    _next()
+                i = next((i for i, x in enumerate(pending) if x), None)
+            else:
+                # results can only be merged once every running search has one to compare
+                while any(not pending[i] for i in running):
+                    _next()
+                i = select(
+                    (i for i, x in enumerate(pending) if x),
+                    key=lambda i: key(pending[i][0]), default=None)
+            if i is not None:
+                yield connections[i], pending[i].popleft()
+    finally:
+        done.set()
+        executor.shutdown(wait=False)
+
+
 def service_classes(service_name):
     """Generator for service classes from specific to generic.
 
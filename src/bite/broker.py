@@ -0,0 +1,169 @@
+"""Local credential broker.
+
+Decrypting auth tokens and cookies with GPG on every run dominates the runtime
+of short-lived invocations. When a broker is running, decrypted data is held
+in its memory for a limited time and served to other processes of the same
+user over a Unix socket so only the first lookup pays the decryption cost.
+
+Entries are keyed by file path and modification time so updated or removed
+files are never served stale data.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+from . import __title__, const
+from .exceptions import BiteError
+
+# default number of seconds entries are kept
+DEFAULT_TTL = 3600
+
+# number of seconds clients wait on the broker before giving up
+_TIMEOUT = 1
+
+
+def socket_path(name='broker'):
+    """Path to a local server's Unix socket."""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, __title__, f'{name}.sock')
+    return os.path.join(const.USER_CACHE_PATH, f'{name}.sock')
+
+
+def authorized(sock):
+    """Verify connecting processes are run by the same user if possible."""
+    peercred = getattr(socket, 'SO_PEERCRED', None)
+    if peercred is None:
+        return True
+    creds = sock.getsockopt(socket.SOL_SOCKET, peercred, struct.calcsize('3i'))
+    _pid, uid, _gid = struct.unpack('3i', creds)
+    return uid == os.getuid()
+
+
+def _key(path):
+    """Create a key for a file that changes when the file does."""
+    st = os.stat(path)
+    return f'{os.path.abspath(path)}:{st.st_mtime_ns}:{st.st_size}'
+
+
+def query(msg, path=None):
+    """Send a message to the broker, returning its response.
+
+    Returns None if no broker is running or it fails to respond.
+    """
+    path = path if path is not None else socket_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(_TIMEOUT)
+            s.connect(path)
+            with s.makefile('rwb') as f:
+                f.write(json.dumps(msg).encode() + b'\n')
+                f.flush()
+                return json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+
+
+def cached(path, load):
+    """Return the data for a file from the broker if available.
+
+    On misses the data is loaded using the given function and stored in the
+    broker for later use.
+    """
+    try:
+        key = _key(path)
+    except OSError:
+        return load()
+
+    response = query({'cmd': 'get', 'key': key})
+    if response is not None and response.get('value') is not None:
+        return response['value']
+
+    value = load()
+    query({'cmd': 'set', 'key': key, 'value': value})
+    return value
+
+
+def stop(path=None):
+    """Stop a running broker, returning whether one was running."""
+    return query({'cmd': 'stop'}, path=path) is not None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Handle newline-delimited JSON messages from a client."""
+
+    def handle(self):
+        if not authorized(self.request):
+            return
+        for line in self.rfile:
+            try:
+                msg = json.loads(line)
+                response = self.server.handle_msg(msg)
+            except (ValueError, KeyError, TypeError):
+                response = {'error': 'invalid message'}
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+            self.wfile.flush()
+
+
+class Broker(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Broker serving decrypted credentials from memory."""
+
+    daemon_threads = True
+
+    def __init__(self, path=None, ttl=None):
+        self.path = path if path is not None else socket_path()
+        self.ttl = ttl if ttl is not None else DEFAULT_TTL
+        if self.ttl <= 0:
+            raise BiteError(f'invalid ttl: {self.ttl!r}')
+        self._data = {}
+        self._lock = threading.Lock()
+
+        try:
+            os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+            if os.path.exists(self.path):
+                if query({'cmd': 'ping'}, path=self.path) is not None:
+                    raise BiteError(f'broker already running: {self.path!r}')
+                # remove stale socket left by a broker that didn't exit cleanly
+                os.remove(self.path)
+            # only allow the current user to connect
+            umask = os.umask(0o177)
+            try:
+                super().__init__(self.path, _Handler)
+            finally:
+                os.umask(umask)
+        except OSError as e:
+            raise BiteError(f'failed starting broker: {self.path!r}: {e.strerror}')
+
+    def handle_msg(self, msg):
+        cmd = msg['cmd']
+        now = time.monotonic()
+        with self._lock:
+            # drop expired entries
+            self._data = {k: v for k, v in self._data.items() if v[1] > now}
+            if cmd == 'get':
+                value, _expires = self._data.get(msg['key'], (None, None))
+                return {'value': value}
+            elif cmd == 'set':
+                self._data[msg['key']] = (msg['value'], now + self.ttl)
+                return {}
+            elif cmd == 'ping':
+                return {}
+            elif cmd == 'stop':
+                self._data.clear()
+                threading.Thread(target=self.shutdown).start()
+                return {}
+        return {'error': f'unknown command: {cmd!r}'}
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -1,12 +1,16 @@
 import configparser
 from enum import Enum
+from functools import partial
 import gpg
+import hashlib
 from http.cookiejar import LWPCookieJar
 from io import StringIO
+import json
 import os
 import stat
+import tempfile
 
-from . import const
+from . import broker, const
 from .exceptions import BiteError
 
 
@@ -168,20 +172,24 @@ class Auth(object):
             except (PermissionError, IsADirectoryError) as e:
                 raise BiteError(f'failed writing auth token: {self.path!r}: {e.strerror}')
 
+    def _decrypt(self):
+        try:
+            with open(self.path, 'rb') as f:
+                try:
+                    with gpg.Context() as c:
+                        plaintext, _result, _verify_result = c.decrypt(f)
+                except gpg.errors.GpgError as e:
+                    raise BiteError(f'failed decrypting auth token: {self.path!r}')
+            return plaintext.decode().strip()
+        except FileNotFoundError:
+            raise
+        except IOError as e:
+            raise BiteError(f'failed reading auth token: {self.path!r}: {e}')
+
     def read(self):
         if self.path.endswith('.gpg'):
-            try:
-                with open(self.path, 'rb') as f:
-                    try:
-                        with gpg.Context() as c:
-                            plaintext, _result, _verify_result = c.decrypt(f)
-                    except gpg.errors.GpgError as e:
-                        raise BiteError(f'failed decrypting auth token: {self.path!r}')
-                token = plaintext.decode().strip()
-            except FileNotFoundError:
-                raise
-            except IOError as e:
-                raise BiteError(f'failed reading auth token: {self.path!r}: {e}')
+            # use the decrypted token held by a running broker if possible
+            token = broker.cached(self.path, self._decrypt)
         else:
             try:
                 with open(self.path, 'r') as f:
@@ -269,18 +277,24 @@ class Cookies(LWPCookieJar):
             except IOError as e:
                 raise BiteError(f'failed writing cookies: {filename!r}: {e}')
 
+    @staticmethod
+    def _decrypt(filename):
+        with open(filename, 'rb') as f:
+            try:
+                with gpg.Context() as c:
+                    plaintext, _result, _verify_result = c.decrypt(f)
+            except gpg.errors.GpgError as e:
+                raise BiteError(f'failed decrypting cookies: {filename!r}')
+        return plaintext.decode()
+
     def load(self, filename=None, ignore_discard=False, ignore_expires=False):
         filename = filename if filename is not None else self._path
         if filename is not None:
             try:
-                with open(filename, 'rb') as f:
-                    try:
-                        with gpg.Context() as c:
-                            plaintext, _result, _verify_result = c.decrypt(f)
-                    except gpg.errors.GpgError as e:
-                        raise BiteError(f'failed decrypting cookies: {filename!r}')
+                # use the decrypted cookies held by a running broker if possible
+                plaintext = broker.cached(filename, partial(self._decrypt, filename))
                 self._really_load(
-                    StringIO(plaintext.decode()), filename, ignore_discard, ignore_expires)
+                    StringIO(plaintext), filename, ignore_discard, ignore_expires)
                 if self.as_lwp_str:
                     self._exist = self._Exists.EXISTS
             except FileNotFoundError:
@@ -288,3 +302,137 @@ class Cookies(LWPCookieJar):
                 pass
             except IOError as e:
                 raise BiteError(f'failed loading cookies: {filename!r}: {e}')
+
+
+class HTTPCache(object):
+    """On-disk cache of HTTP response bodies and their validators.
+
+    Responses including ETag or Last-Modified headers are stored per URL so
+    later requests can be made conditionally, with 304 responses being served
+    from the stored body. The least recently used entries are removed when
+    the cache exceeds its size limit.
+    """
+
+    # validator response headers mapped to their related conditional request headers
+    _validators = (
+        ('ETag', 'If-None-Match'),
+        ('Last-Modified', 'If-Modified-Since'),
+    )
+
+    # response headers that don't apply to stored, decoded bodies
+    _skip_headers = frozenset(('content-encoding', 'content-length', 'transfer-encoding'))
+
+    # default max size of all stored responses in bytes
+    _max_size = 64 * 1024 * 1024
+
+    def __init__(self, connection, path=None, max_size=None):
+        if path is not None:
+            self.path = path
+        elif connection is not None:
+            self.path = os.path.join(const.USER_CACHE_PATH, 'http', connection)
+        else:
+            self.path = None
+        self.max_size = max_size if max_size is not None else self._max_size
+
+    def __bool__(self):
+        return self.path is not None
+
+    def _entry(self, req):
+        """Path to the cache entry for a request."""
+        # responses can vary by user so credentials are included in the key
+        key = '\0'.join((
+            req.url, req.headers.get('Authorization', ''), req.headers.get('Cookie', '')))
+        return os.path.join(self.path, hashlib.sha256(key.encode()).hexdigest())
+
+    def get(self, req):
+        """Return the stored headers and body for a request if they exist."""
+        path = self._entry(req)
+        try:
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+                # responses varying on request headers only match the same values
+                if any(req.headers.get(k) != v for k, v in meta['vary'].items()):
+                    return None
+                content = f.read()
+            # mark the entry as recently used
+            os.utime(path)
+            return meta['headers'], content
+        except (OSError, ValueError, KeyError, AttributeError):
+            return None
+
+    def conditional_headers(self, headers):
+        """Create conditional request headers from stored response headers."""
+        headers = {k.lower(): v for k, v in headers.items()}
+        return {
+            req_header: headers[header.lower()]
+            for header, req_header in self._validators if header.lower() in headers}
+
+    def update(self, req, response):
+        """Store a response if it includes validators."""
+        if not any(header in response.headers for header, _ in self._validators):
+            return
+        if 'no-store' in response.headers.get('Cache-Control', ''):
+            return
+        vary = [x.strip() for x in response.headers.get('Vary', '').split(',') if x.strip()]
+        if '*' in vary:
+            return
+        # skip responses taking up a large part of the cache
+        try:
+            if int(response.headers.get('Content-Length', 0)) > self.max_size // 8:
+                return
+        except ValueError:
+            return
+
+        meta = {
+            'headers': {
+                k: v for k, v in response.headers.items()
+                if k.lower() not in self._skip_headers},
+            'vary': {k: req.headers.get(k) for k in vary},
+        }
+        path = self._entry(req)
+        try:
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+            # write to a temporary file first so parallel requests never see partial entries
+            with tempfile.NamedTemporaryFile(dir=self.path, delete=False) as f:
+                f.write(json.dumps(meta).encode() + b'\n')
+                f.write(response.content)
+            os.replace(f.name, path)
+            self._evict()
+        except OSError:
+            # failing to cache a response shouldn't fail the request
+            pass
+
+    def _evict(self):
+        """Remove the least recently used entries until the cache fits its size limit."""
+        entries = []
+        size = 0
+        with os.scandir(self.path) as it:
+            for entry in it:
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                size += st.st_size
+        if size <= self.max_size:
+            return
+        for _mtime, entry_size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+            if size <= self.max_size:
+                break
+
+    def remove(self):
+        """Remove all cached responses."""
+        if self.path is not None:
+            try:
+                for name in os.listdir(self.path):
+                    os.remove(os.path.join(self.path, name))
+                os.rmdir(self.path)
+            except FileNotFoundError:
+                pass
+            except IOError as e:
+                raise BiteError(f'unable to remove cache: {self.path!r}: {e.strerror}')
@@ -1,3 +1,5 @@
+from concurrent.futures import as_completed
+from datetime import datetime, timedelta
 from functools import wraps
 import getpass
 from io import BytesIO
@@ -7,11 +9,17 @@ import subprocess
 import sys
 import tarfile
 import textwrap
+import time
 
+from snakeoil.osutils import sizeof_fmt
 from snakeoil.strings import pluralism
 
+from ..cache import HTTPCache
+from ..columns import Columns
 from ..exceptions import AuthError, BiteError
 from ..objects import TarAttachment
+from ..store import Store
+from ..utc import utc
 from ..utils import confirm, get_input, launch_browser
 
 from .. import const
@@ -94,6 +102,9 @@ class Client(object):
 class Cli(Client):
     """Generic commandline interface for a service."""
 
+    # number of items pulled per get request when syncing the local store
+    _sync_size = 500
+
     def __init__(self, service, quiet=False, verbosity=0, debug=False, color=False,
                  connection=None, passwordcmd=None, skip_auth=True, **kw):
         super().__init__(service)
@@ -152,7 +163,7 @@ class Cli(Client):
 
     @dry_run
     @login_retry
-    def get(self, ids, browser=False, output_url=False, **kw):
+    def get(self, ids, browser=False, output_url=False, local=False, **kw):
         """Get item(s) from a service and all related info."""
         if not ids:
             raise RuntimeError(f'No {self.service.item.type} ID(s) specified')
@@ -164,6 +175,12 @@ class Cli(Client):
             launch_browser(urls)
         elif output_url:
             print(*self.service.item_urls(ids), sep='\n')
+        elif local:
+            store = Store(connection=self.service.connection, service=self.service)
+            self.log_t(f"Getting local {self.service.item.type}{pluralism(ids)}: {', '.join(map(str, ids))}")
+
+            lines = chain.from_iterable(self._render_item(item, **kw) for item in store.get(ids))
+            print(*lines, sep='\n')
         else:
             request = self.service.GetRequest(ids=ids, **kw)
             self.log_t(f"Getting {self.service.item.type}{pluralism(ids)}: {', '.join(map(str, ids))}")
@@ -189,6 +206,9 @@ class Cli(Client):
         """Get attachments from a service."""
         # skip pulling data if we don't need it
         get_data = (not output_url and not browser)
+        # attachments being saved are downloaded separately if supported
+        if get_data and not kw.get('view_attachment') and self.service.attachment_downloads:
+            get_data = False
 
         # extract attachment IDs to display if the service uses ID maps
         display_ids = []
@@ -245,18 +265,50 @@ class Cli(Client):
     def _process_attachments(self, attachments, show_metadata=False, view_attachment=False,
                              save_to=None, **kw):
         """Process a list of attachment objects."""
-        for f in attachments:
-            if view_attachment:
+        if view_attachment:
+            for f in attachments:
                 self._view_attachment(f, show_metadata)
+            return
+
+        # confirm overwriting files before any downloads start
+        files = []
+        for f in attachments:
+            if save_to is not None:
+                path = os.path.join(save_to, f.filename)
             else:
-                if save_to is not None:
-                    path = os.path.join(save_to, f.filename)
-                else:
-                    path = os.path.join(os.getcwd(), f.filename)
-                self._save_attachment(f, path=path)
+                path = os.path.join(os.getcwd(), f.filename)
+            if os.path.exists(path):
+                print(f' ! Warning: existing file: {path!r}')
+                if not confirm('Do you want to overwrite it?'):
+                    continue
+            files.append((f, path))
+
+        # save attachments concurrently using the service's thread pool
+        start = time.monotonic()
+        jobs = {self.service.executor.submit(self._save_attachment, f, path): path
+                for f, path in files}
+        total = 0
+        try:
+            for job in as_completed(jobs):
+                size = job.result()
+                total += size
+                self.log(f'Saved attachment: {jobs[job]!r} ({sizeof_fmt(size)})')
+        except BaseException:
+            for job in jobs:
+                job.cancel()
+            raise
+
+        if len(files) > 1:
+            elapsed = time.monotonic() - start
+            rate = total / elapsed if elapsed else 0
+            self.log(
+                f'Saved {len(files)} attachments: {sizeof_fmt(total)} '
+                f'in {elapsed:.2f}s ({sizeof_fmt(rate)}/s)')
 
     def _view_attachment(self, f, show_metadata):
         """Output attachment data to stdout."""
+        # attachment data may not be pulled from the service until it's read
+        data = f.read()
         compressed = set(['x-bzip2', 'x-bzip', 'x-gzip', 'gzip', 'x-tar', 'x-xz'])
         mime_type, mime_subtype = f.mimetype.split('/')
         if sys.stdout.isatty() and not (mime_type == 'text' or mime_subtype in compressed):
@@ -267,7 +319,7 @@ class Cli(Client):
         self.log(f'Viewing file: {f.filename}')
 
         if mime_subtype == 'x-tar':
-            tar_file = tarfile.open(fileobj=BytesIO(f.read()))
+            tar_file = tarfile.open(fileobj=BytesIO(data))
             if show_metadata:
                 # show listing of tarfile elements
                 tar_file.list()
@@ -284,20 +336,14 @@ class Cli(Client):
                         print(prefix + '=' * (const.COLUMNS - len(prefix)))
                         sys.stdout.write(TarAttachment(tarfile=tar_file, cfile=tarinfo_file).data())
         else:
-            data = f.read().decode()
+            data = data.decode()
             sys.stdout.write(data)
             if not data.endswith('\n'):
                 self.log('', prefix='')
 
     def _save_attachment(self, f, path):
-        """Save attachment to a specified path."""
-        if os.path.exists(path):
-            print(f' ! Warning: existing file: {path!r}')
-            if not confirm('Do you want to overwrite it?'):
-                return
-
-        self.log(f'Saving attachment: {path!r}')
-        f.write(path)
+        """Save attachment to a specified path, returning its size."""
+        return f.write(path)
 
     @dry_run
     @login_retry
@@ -340,7 +386,7 @@ class Cli(Client):
 
     @dry_run
     @login_retry
-    def search(self, **kw):
+    def search(self, export_format=None, export_file=None, **kw):
         """Search for items on the service."""
         request = self.service.SearchRequest(params=kw)
 
@@ -349,6 +395,12 @@ class Cli(Client):
 
         data = request.send()
 
+        if export_format is not None:
+            columns = Columns(data, fields=kw.get('fields'))
+            self._export(columns, export_format, export_file)
+            self.log(f"{len(columns)} {self.service.item.type}{pluralism(len(columns))} exported.")
+            return
+
         lines = self._render_search(data, **kw)
         count = 0
         for line in lines:
@@ -356,6 +408,20 @@ class Cli(Client):
             print(line[:const.COLUMNS])
         self.log(f"{count} {self.service.item.type}{pluralism(count)} found.")
 
+    def _export(self, columns, format, path=None):
+        """Write columnar data to a file or stdout."""
+        if path is None or path == '-':
+            if sys.stdout.isatty():
+                raise BiteError(f'refusing to write {format} data to a terminal, use --export-file')
+            columns.write(sys.stdout.buffer, format)
+            sys.stdout.flush()
+            return
+        try:
+            with open(path, 'wb') as f:
+                columns.write(f, format)
+        except IOError as e:
+            raise BiteError(f'failed writing file: {path!r}: {e.strerror}')
+
     def _header(self, char, msg):
         return f'{char * 3} {msg} {char * (const.COLUMNS - len(msg) - 5)}'
 
@@ -417,6 +483,46 @@ class Cli(Client):
                 self.service.cache.write(updates=updates)
         elif remove:
             self.service.cache.remove()
+            # remove stored responses even if caching them is currently disabled
+            HTTPCache(self.service.connection).remove()
+
+    @login_retry
+    def sync(self, *args, remove=False, **kw):
+        """Pull items modified since the previous sync into the local store."""
+        store = Store(connection=self.service.connection, service=self.service)
+        if remove:
+            store.remove()
+            return
+
+        # pull all items for the initial sync
+        since = store.synced
+        if since is None:
+            since = datetime.fromtimestamp(0, utc)
+            modified = since
+        else:
+            # Modification times only have one second resolution and searches
+            # match items modified after the given time, so overlap the previous
+            # sync to catch items changed during its last second. Items already
+            # stored are replaced.
+            modified = since - timedelta(seconds=1)
+        params = dict(self.service.sync_params, modified=modified)
+
+        self.log_t(f'Syncing {self.service.item.type}s modified since: {since.isoformat()}')
+        ids = [item.id for item in self.service.SearchRequest(params=params).send()]
+
+        # only move the high-water mark once all matching items are stored
+        latest = since
+        get_changes = hasattr(self.service, 'ChangesRequest')
+        for i in range(0, len(ids), self._sync_size):
+            chunk = ids[i:i + self._sync_size]
+            items = self.service.GetRequest(ids=chunk, get_changes=get_changes).send()
+            modified = store.update(items)
+            if modified is not None and modified > latest:
+                latest = modified
+            self.log(f'{i + len(chunk)}/{len(ids)} {self.service.item.type}s synced')
+
+        store.synced = latest
+        store.close()
 
     def _render_modifications(self, data, **kw):
         raise NotImplementedError
@@ -0,0 +1,287 @@
+"""Columnar storage and export of item data.
+
+Items are converted into typed columns as they're received so large result
+sets can be aggregated using vectorized operations via NumPy, pandas, or Arrow
+instead of iterating over item objects.
+"""
+
+from array import array
+from datetime import datetime, timezone
+from importlib import import_module
+
+from .exceptions import BiteError
+from .objects import DateTime, obj_attrs
+
+# string fields with few distinct values that are stored as categories
+CATEGORICAL_FIELDS = frozenset([
+    'status', 'resolution', 'product', 'component', 'classification', 'priority',
+    'severity', 'platform', 'op_sys', 'version', 'target_milestone', 'type',
+    'state', 'milestone', 'category', 'tracker', 'project',
+])
+
+# supported export formats
+FORMATS = ('parquet', 'arrow', 'npy')
+
+# item attributes that aren't exported
+_SKIP_FIELDS = frozenset(['service', 'comments', 'attachments', 'changes', 'history'])
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _import(name):
+    """Import an optional dependency required for columnar output."""
+    try:
+        return import_module(name)
+    except ImportError:
+        raise BiteError(f'{name.split(".")[0]} is required for columnar output')
+
+
+def _timestamp(value):
+    """Convert a datetime into microseconds since the epoch."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+class _Column(object):
+    """Column of item field values stored by type."""
+
+    def __init__(self, name, categorical=False, size=0):
+        self.name = name
+        self.categorical = categorical
+        # column type is determined by the first non-null value
+        self.kind = None
+        self.values = None
+        self.valid = bytearray(size)
+        self._size = size
+        self._categories = None
+
+    def __len__(self):
+        return self._size
+
+    def _init(self, value):
+        if isinstance(value, bool):
+            self.kind, self.values = 'bool', array('b')
+        elif isinstance(value, int):
+            self.kind, self.values = 'int', array('q')
+        elif isinstance(value, (datetime, DateTime)):
+            self.kind, self.values = 'datetime', array('q')
+        elif isinstance(value, str) and self.categorical:
+            self.kind, self.values = 'category', array('l')
+            self._categories = {}
+        else:
+            self.kind, self.values = 'object', []
+        # pad values for previous rows missing this field
+        self.values.extend([0 if self.kind != 'object' else None] * self._size)
+
+    def _convert(self, value):
+        """Convert a value to its stored form, returning None if it doesn't fit the column."""
+        kind = self.kind
+        if kind == 'int':
+            return value if isinstance(value, int) and not isinstance(value, bool) else None
+        elif kind == 'datetime':
+            if isinstance(value, DateTime):
+                value = value._datetime
+            return _timestamp(value) if isinstance(value, datetime) else None
+        elif kind == 'category':
+            if not isinstance(value, str):
+                return None
+            return self._categories.setdefault(value, len(self._categories))
+        elif kind == 'bool':
+            return int(value) if isinstance(value, bool) else None
+        return value
+
+    def _demote(self):
+        """Convert the column to generic objects when it contains mixed types."""
+        values = list(self)
+        self.kind, self.values, self._categories = 'object', values, None
+
+    def append(self, value):
+        if value is None:
+            if self.values is not None:
+                self.values.append(0 if self.kind != 'object' else None)
+            self.valid.append(0)
+        else:
+            if self.kind is None:
+                self._init(value)
+            converted = self._convert(value)
+            if converted is None:
+                self._demote()
+                converted = value
+            self.values.append(converted)
+            self.valid.append(1)
+        self._size += 1
+
+    @property
+    def categories(self):
+        """Category values ordered by their codes."""
+        return list(self._categories) if self._categories is not None else []
+
+    @property
+    def nullable(self):
+        return 0 in self.valid
+
+    def __iter__(self):
+        """Iterate over the column's values in their native python form."""
+        categories = self.categories
+        for valid, value in zip(self.valid, self.values or [None] * self._size):
+            if not valid:
+                yield None
+            elif self.kind == 'datetime':
+                yield datetime.fromtimestamp(value / 1000000, timezone.utc)
+            elif self.kind == 'category':
+                yield categories[value]
+            elif self.kind == 'bool':
+                yield bool(value)
+            else:
+                yield value
+
+    def to_numpy(self, categorical_codes=False):
+        """Convert the column into a NumPy array."""
+        np = _import('numpy')
+        valid = np.frombuffer(bytes(self.valid), dtype=np.bool_)
+        if self.kind in ('int', 'bool'):
+            dtype = np.int64 if self.kind == 'int' else np.bool_
+            values = np.array(self.values, dtype=dtype)
+            if self.nullable:
+                values = values.astype(np.float64)
+                values[~valid] = np.nan
+            return values
+        elif self.kind == 'datetime':
+            values = np.frombuffer(self.values, dtype=np.int64).astype('datetime64[us]')
+            values[~valid] = np.datetime64('NaT')
+            return values
+        elif self.kind == 'category':
+            codes = np.where(valid, np.array(self.values, dtype=np.int64), -1)
+            if categorical_codes:
+                return codes
+            categories = np.array(self.categories + [''])
+            return categories[codes]
+        # generic objects are stored as strings
+        return np.array(['' if x is None else str(x) for x in self])
+
+    def to_arrow(self):
+        """Convert the column into an Arrow array."""
+        pa = _import('pyarrow')
+        mask = [not x for x in self.valid] if self.nullable else None
+        if self.kind == 'int':
+            return pa.array(list(self.values), type=pa.int64(), mask=mask)
+        elif self.kind == 'bool':
+            return pa.array([bool(x) for x in self.values], type=pa.bool_(), mask=mask)
+        elif self.kind == 'datetime':
+            return pa.array(list(self.values), type=pa.timestamp('us', tz='UTC'), mask=mask)
+        elif self.kind == 'category':
+            codes = pa.array(list(self.values), type=pa.int32(), mask=mask)
+            return pa.DictionaryArray.from_arrays(codes, pa.array(self.categories, type=pa.string()))
+        values = list(self)
+        try:
+            return pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return pa.array([None if x is None else str(x) for x in values], type=pa.string())
+
+
+class Columns(object):
+    """Item field values stored in typed columns.
+
+    Integers are stored as 64-bit ints, datetimes as microseconds since the
+    epoch, and fields with few distinct string values such as status or
+    product as integer category codes.
+    """
+
+    def __init__(self, items=(), fields=None, categorical=CATEGORICAL_FIELDS):
+        self.fields = list(fields) if fields is not None else None
+        self.categorical = categorical
+        self._columns = {}
+        self._size = 0
+        if self.fields is not None:
+            for field in self.fields:
+                self._add_column(field)
+        self.extend(items)
+
+    def _add_column(self, name):
+        column = _Column(name, categorical=name in self.categorical, size=self._size)
+        self._columns[name] = column
+        return column
+
+    def append(self, item):
+        """Add an item's field values to the columns."""
+        if self.fields is not None:
+            values = ((field, getattr(item, field, None)) for field in self.fields)
+        else:
+            values = (
+                (k, v) for k, v in obj_attrs(item).items()
+                if not k.startswith('_') and k not in _SKIP_FIELDS)
+
+        seen = set()
+        for name, value in values:
+            column = self._columns.get(name)
+            if column is None:
+                column = self._add_column(name)
+            column.append(value)
+            seen.add(name)
+
+        # pad columns for fields the item doesn't have
+        if len(seen) != len(self._columns):
+            for name, column in self._columns.items():
+                if name not in seen:
+                    column.append(None)
+        self._size += 1
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def keys(self):
+        return self._columns.keys()
+
+    def __getitem__(self, name):
+        """Return a column as a NumPy array."""
+        try:
+            column = self._columns[name]
+        except KeyError:
+            raise BiteError(f'unknown field: {name!r}')
+        return column.to_numpy()
+
+    def categories(self, name):
+        """Return a categorical column's categories and integer codes."""
+        column = self._columns[name]
+        return column.categories, column.to_numpy(categorical_codes=True)
+
+    def to_numpy(self):
+        """Convert the columns into a NumPy record array."""
+        np = _import('numpy')
+        arrays = [self._columns[name].to_numpy() for name in self._columns]
+        return np.rec.fromarrays(arrays, names=list(self._columns)) if arrays else np.rec.array([])
+
+    def to_arrow(self):
+        """Convert the columns into an Arrow table."""
+        pa = _import('pyarrow')
+        return pa.table({name: column.to_arrow() for name, column in self._columns.items()})
+
+    def to_pandas(self):
+        """Convert the columns into a pandas data frame."""
+        return self.to_arrow().to_pandas()
+
+    def write(self, file, format):
+        """Write the columns to a binary file object using the given format."""
+        if format == 'parquet':
+            pq = _import('pyarrow.parquet')
+            pq.write_table(self.to_arrow(), file)
+        elif format == 'arrow':
+            pa = _import('pyarrow')
+            table = self.to_arrow()
+            with pa.ipc.new_file(file, table.schema) as writer:
+                writer.write_table(table)
+        elif format == 'npy':
+            np = _import('numpy')
+            np.save(file, self.to_numpy(), allow_pickle=False)
+        else:
+            raise BiteError(
+                f'unsupported format: {format!r} (available formats: {", ".join(FORMATS)})')
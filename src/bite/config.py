@@ -6,6 +6,7 @@ from snakeoil.mappings import ImmutableDict
 
 from . import const
 from .exceptions import BiteError
+from .utils import read_cached
 
 
 class Config(object):
@@ -64,13 +65,11 @@ class Config(object):
 
         for path in paths:
             try:
-                if force:
-                    with open(path) as f:
-                        self._config.read_file(f)
-                else:
-                    self._config.read(path)
+                self._config.read_string(read_cached(path), source=path)
             except IOError as e:
-                raise BiteError(f'cannot load config file {e.filename!r}: {e.strerror}')
+                # nonexistent or unreadable optional files are skipped
+                if force:
+                    raise BiteError(f'cannot load config file {e.filename!r}: {e.strerror}')
 
     @staticmethod
     def service_files(connection=None, user_dir=True):
@@ -1,14 +1,16 @@
-from functools import partial
 from importlib import import_module
+import hashlib
 import inspect
+import json
 import os
 import pkgutil
 from shutil import get_terminal_size
 import sys
+import tempfile
 
 from snakeoil import demandimport, mappings
 
-from . import __title__
+from . import __title__, __version__
 
 
 _reporoot = os.path.realpath(__file__).rsplit(os.path.sep, 3)[0]
@@ -78,21 +80,76 @@ def _find_service_classes(module_name, matcher=_service_cls):
     return classes
 
 
-def _GET_VALS(attr, func):
+# registry attributes mapped to the packages scanned for their service classes
+_REGISTRY_PACKAGES = {
+    'CLIENTS': 'client',
+    'SERVICES': 'service',
+    'SERVICE_OPTS': 'args',
+}
+
+
+def _registry_fingerprint():
+    """Generate a fingerprint for the current state of all scanned modules."""
+    fingerprint = hashlib.sha1(__version__.encode())
+    base = os.path.dirname(os.path.realpath(__file__))
+    for package in sorted(_REGISTRY_PACKAGES.values()):
+        for root, dirs, files in os.walk(os.path.join(base, package)):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+            for f in sorted(x for x in files if x.endswith('.py')):
+                path = os.path.join(root, f)
+                st = os.stat(path)
+                fingerprint.update(f'{path}:{st.st_size}:{st.st_mtime_ns}'.encode())
+    return fingerprint.hexdigest()
+
+
+def _load_registry():
+    """Load the service class registry index, regenerating it if it's stale.
+
+    The index maps service names to class paths so services can be resolved
+    without importing every client, service, and args module.
+    """
+    path = os.path.join(USER_CACHE_PATH, 'registry.json')
+    fingerprint = _registry_fingerprint()
+    try:
+        with open(path) as f:
+            registry = json.load(f)
+        if registry.get('fingerprint') == fingerprint:
+            return registry
+    except (OSError, ValueError):
+        pass
+
     try:
-        result = getattr(_defaults, attr)
-    except AttributeError:
         with demandimport.disabled():
-            result = func()
-    return result
+            registry = {
+                attr: dict(_find_service_classes(package))
+                for attr, package in _REGISTRY_PACKAGES.items()}
+    except SyntaxError as e:
+        raise SyntaxError(f'invalid syntax: {e.filename}, line {e.lineno}')
+    registry['version'] = __version__
+    registry['fingerprint'] = fingerprint
 
+    try:
+        os.makedirs(USER_CACHE_PATH, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=USER_CACHE_PATH, delete=False) as f:
+            json.dump(registry, f)
+        os.replace(f.name, path)
+    except OSError:
+        # failing to write the index only means it's regenerated next run
+        pass
+    return registry
+
+
+def __getattr__(name):
+    """Lazily load service class registries on first access."""
+    if name not in _REGISTRY_PACKAGES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    # use the registry generated during installation if it exists
+    try:
+        registry = {attr: getattr(_defaults, attr) for attr in _REGISTRY_PACKAGES}
+    except AttributeError:
+        registry = _load_registry()
 
-try:
-    CLIENTS = mappings.ImmutableDict(_GET_VALS(
-        'CLIENTS', partial(_find_service_classes, 'client')))
-    SERVICES = mappings.ImmutableDict(_GET_VALS(
-        'SERVICES', partial(_find_service_classes, 'service')))
-    SERVICE_OPTS = mappings.ImmutableDict(_GET_VALS(
-        'SERVICE_OPTS', partial(_find_service_classes, 'args')))
-except SyntaxError as e:
-    raise SyntaxError(f'invalid syntax: {e.filename}, line {e.lineno}')
+    for attr in _REGISTRY_PACKAGES:
+        setattr(_module, attr, mappings.ImmutableDict(registry[attr]))
+    return getattr(_module, name)
@@ -0,0 +1,283 @@
+"""Local daemon running commands with warm services.
+
+Every invocation pays for starting the interpreter, importing service and
+parsing modules, initializing services, and setting up fresh connections
+including TLS handshakes. When a daemon is running, search and get commands
+are forwarded to it over a Unix socket along with the caller's standard
+streams. It runs them using previously initialized services that keep their
+connection pools, thread pools, and caches so only the first command per
+connection pays those costs.
+
+Commands are run one at a time using the caller's environment and working
+directory which are swapped in for the whole process while they run. The
+argument parser is reused between commands, being reset to its initial
+state before each one, while configuration and alias files are only reread
+when they change. Clients only run commands
+themselves if the daemon refuses them before running anything, otherwise
+the daemon's exit status is used so output is never duplicated.
+"""
+
+import array
+import json
+import os
+from shutil import get_terminal_size
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+
+from . import __title__, const
+from .broker import authorized, query, socket_path as _socket_path
+from .exceptions import BiteError
+
+# commands that are run by the daemon when available
+COMMANDS = frozenset(['search', 'get'])
+
+# number of seconds the daemon waits on clients sending commands
+_TIMEOUT = 1
+
+# max size of command messages
+_MSG_SIZE = 1024 * 1024
+
+
+def socket_path():
+    """Path to the daemon's Unix socket."""
+    return _socket_path('daemon')
+
+
+def _send(sock, msg, fds=()):
+    """Send a message with attached file descriptors."""
+    data = json.dumps(msg).encode() + b'\n'
+    anc = [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', fds))] if fds else []
+    sent = sock.sendmsg([data], anc)
+    if sent < len(data):
+        sock.sendall(data[sent:])
+
+
+def _recv(sock):
+    """Receive a message and any attached file descriptors."""
+    fds = array.array('i')
+    data, ancdata, _flags, _addr = sock.recvmsg(_MSG_SIZE, socket.CMSG_LEN(3 * fds.itemsize))
+    for level, kind, cdata in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(cdata[:len(cdata) - (len(cdata) % fds.itemsize)])
+    while data and not data.endswith(b'\n') and len(data) < _MSG_SIZE:
+        chunk = sock.recv(_MSG_SIZE)
+        if not chunk:
+            break
+        data += chunk
+    return json.loads(data), list(fds)
+
+
+def forward(args, path=None):
+    """Run a command using the daemon, returning its exit status.
+
+    Returns None if no daemon is running or it refused the command before
+    running anything so it should be run directly instead.
+    """
+    # skip commands that can't be handled and ones reading args from stdin
+    if COMMANDS.isdisjoint(args) or '-' in args:
+        return None
+    path = path if path is not None else socket_path()
+    if not os.path.exists(path):
+        return None
+
+    msg = {
+        'cmd': 'run', 'args': args, 'cwd': os.getcwd(), 'env': dict(os.environ),
+        'columns': get_terminal_size()[0],
+    }
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            try:
+                s.connect(path)
+                _send(s, msg, fds=(0, 1, 2))
+            except OSError:
+                # nothing is run unless the entire message is received
+                return None
+            with s.makefile('rb') as f:
+                response = json.loads(f.readline())
+    except (OSError, ValueError):
+        # the command may have already run so it can't be rerun locally
+        sys.stderr.write(f'{__title__}: error: lost connection to daemon\n')
+        return 1
+    if 'refused' in response:
+        return None
+    return response.get('status', 1)
+
+
+class _Writer(object):
+    """Line-based writer passed to script functions in place of formatters."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, *args):
+        self.stream.write(''.join(map(str, args)) + '\n')
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """Handle a single message from a client."""
+
+    def handle(self):
+        if not authorized(self.request):
+            return
+        self.request.settimeout(_TIMEOUT)
+        fds = []
+        try:
+            msg, fds = _recv(self.request)
+            self.request.settimeout(None)
+            response = self.server.handle_msg(msg, fds)
+        except (ValueError, KeyError, TypeError):
+            response = {'refused': 'invalid message'}
+        except OSError:
+            return
+        finally:
+            for fd in fds:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        try:
+            self.request.sendall(json.dumps(response).encode() + b'\n')
+        except OSError:
+            pass
+
+
+class Daemon(socketserver.UnixStreamServer):
+    """Daemon running forwarded commands with warm services."""
+
+    # required fields of run messages and their types
+    _run_fields = {'args': list, 'cwd': str, 'env': dict, 'columns': int}
+
+    def __init__(self, path=None):
+        self.path = path if path is not None else socket_path()
+        # initialized services reused between commands
+        self.services = {}
+        from .scripts import bite as script
+        self._script = script
+        # parsing adds service specific options to the parser so it's reset
+        # to its initial state for every command
+        self._reset_parser = script.argparser.checkpoint()
+        # commands alter process-wide state while running so they can't overlap
+        self._lock = threading.Lock()
+
+        try:
+            os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+            if os.path.exists(self.path):
+                if query({'cmd': 'ping'}, path=self.path) is not None:
+                    raise BiteError(f'daemon already running: {self.path!r}')
+                # remove stale socket left by a daemon that didn't exit cleanly
+                os.remove(self.path)
+            # only allow the current user to connect
+            umask = os.umask(0o177)
+            try:
+                super().__init__(self.path, _Handler)
+            finally:
+                os.umask(umask)
+        except OSError as e:
+            raise BiteError(f'failed starting daemon: {self.path!r}: {e.strerror}')
+
+    def handle_msg(self, msg, fds):
+        cmd = msg['cmd']
+        if cmd == 'run':
+            if len(fds) != 3:
+                return {'refused': 'missing standard streams'}
+            if not all(isinstance(msg[k], t) for k, t in self._run_fields.items()):
+                return {'refused': 'invalid message'}
+            status = self.run(msg, fds)
+            if status is None:
+                return {'refused': 'unsupported command'}
+            return {'status': status}
+        elif cmd == 'ping':
+            return {}
+        elif cmd == 'stop':
+            threading.Thread(target=self.shutdown).start()
+            return {}
+        return {'refused': f'unknown command: {cmd!r}'}
+
+    def run(self, msg, fds):
+        """Run a command using a client's standard streams and settings.
+
+        Returns the command's exit status or None if it should be run by the
+        client instead. The standard streams, environment, and working
+        directory are swapped for the entire process while commands run so
+        they're serialized.
+        """
+        # streams take ownership of duplicated descriptors, the originals are
+        # closed by the handler
+        streams = (
+            open(os.dup(fds[0]), 'r'),
+            open(os.dup(fds[1]), 'w'),
+            open(os.dup(fds[2]), 'w'),
+        )
+        with self._lock:
+            saved = (sys.stdin, sys.stdout, sys.stderr, sys.argv, const.COLUMNS, os.getcwd())
+            environ = dict(os.environ)
+            try:
+                sys.stdin, sys.stdout, sys.stderr = streams
+                sys.argv = [__title__] + msg['args']
+                const.COLUMNS = msg['columns']
+                os.environ.clear()
+                os.environ.update(msg['env'])
+                os.chdir(msg['cwd'])
+                return self._run(msg['args'])
+            except OSError as e:
+                sys.stderr.write(f'{__title__}: error: {e}\n')
+                return 1
+            finally:
+                for f in streams:
+                    try:
+                        f.close()
+                    except OSError:
+                        pass
+                sys.stdin, sys.stdout, sys.stderr, sys.argv, const.COLUMNS, cwd = saved
+                os.environ.clear()
+                os.environ.update(environ)
+                os.chdir(cwd)
+
+    def _run(self, args):
+        script = self._script
+        self._reset_parser()
+        parser = script.argparser
+        parser.services = self.services
+        options = None
+        try:
+            options = parser.parse_args(args)
+            fcn_args = getattr(options, 'fcn_args', None)
+            if not isinstance(fcn_args, dict) or fcn_args.get('fcn') not in COMMANDS:
+                return None
+            return script.main(options, _Writer(sys.stdout), _Writer(sys.stderr))
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                return e.code or 0
+            sys.stderr.write(f'{e.code}\n')
+            return 1
+        except BiteError as e:
+            if getattr(options, 'debug', False):
+                traceback.print_exc()
+                return 1
+            msg = e.message if getattr(options, 'verbosity', 0) else str(e)
+            try:
+                parser.error(msg)
+            except SystemExit as exit:
+                return exit.code
+            return 1
+        except BrokenPipeError:
+            # client output was closed early, e.g. when piped to head
+            return 1
+        except Exception:
+            traceback.print_exc()
+            return 1
+        finally:
+            try:
+                sys.stdout.flush()
+            except OSError:
+                pass
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
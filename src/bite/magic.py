@@ -85,13 +85,21 @@ class Magic:
         self.cookie = magic_open(self.flags)
         self.lock = threading.Lock()
 
-        magic_load(self.cookie, magic_file)
+        # the magic database is loaded on first use
+        self.magic_file = magic_file
+        self._loaded = False
+
+    def _load(self):
+        if not self._loaded:
+            magic_load(self.cookie, self.magic_file)
+            self._loaded = True
 
     def from_buffer(self, buf):
         """
         Identify the contents of `buf`
         """
         with self.lock:
+            self._load()
             try:
                 # if we're on python3, convert buf to bytes
                 # otherwise this string is passed as wchar*
@@ -107,6 +115,7 @@ class Magic:
         with open(filename):
             pass
         with self.lock:
+            self._load()
             try:
                 return maybe_decode(magic_file(self.cookie, filename))
             except MagicException as e:
@@ -136,13 +145,18 @@ class Magic:
             magic_close(self.cookie)
             self.cookie = None
 
-_instances = {}
+# libmagic cookies aren't safe to share between threads so each thread gets
+# its own instances, closed when the thread exits
+_instances = threading.local()
 
 
 def _get_magic_type(mime):
-    i = _instances.get(mime)
+    instances = getattr(_instances, 'magic', None)
+    if instances is None:
+        instances = _instances.magic = {}
+    i = instances.get(mime)
     if i is None:
-        i = _instances[mime] = Magic(mime=mime)
+        i = instances[mime] = Magic(mime=mime)
     return i
 
 
@@ -214,7 +228,7 @@ def errorcheck_null(result, func, args):
         return result
 
 def errorcheck_negative_one(result, func, args):
-    if result is -1:
+    if result == -1:
         err = magic_error(args[0])
         raise MagicException(err)
     else:
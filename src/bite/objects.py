@@ -4,7 +4,8 @@ from datetime import datetime
 import lzma
 import os
 import re
-import stat
+import sys
+import tempfile
 import zlib
 
 try:
@@ -20,6 +21,157 @@ from .exceptions import BiteError
 from .utc import utc, parse_date
 
 
+# Slots for every known item attribute only save memory before CPython 3.11.
+# Later versions store instance dict values inline using keys shared between
+# instances of a class, so unset slots on items that only populate some of
+# their many optional fields end up costing more. On 3.11,
+# benchmarks/objects_memory.py measures Bugzilla bugs at 1143 bytes with
+# attribute slots and 1023 bytes without them.
+_SLOT_ATTRIBUTES = sys.version_info < (3, 11)
+
+
+def compact(value):
+    """Intern strings so repeated values share a single object.
+
+    Values such as statuses and products are repeated across many items while
+    decoding responses creates separate objects for each. Interned strings
+    live as long as the process so only use this for fields with values from
+    small sets defined by the service, not free-form text or user names.
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    elif isinstance(value, list):
+        return [compact(x) for x in value]
+    return value
+
+
+def obj_attrs(obj):
+    """Return a dict of all attributes set on an object, slotted or not."""
+    d = {}
+    for k in getattr(obj.__class__, '_slot_names', ()):
+        try:
+            d[k] = object.__getattribute__(obj, k)
+        except AttributeError:
+            pass
+    d.update(getattr(obj, '__dict__', {}))
+    return d
+
+
+class _Slotted(type):
+    """Metaclass that stores known object attributes in slots.
+
+    Along with any explicitly defined slots, classes get slots for the fields
+    listed in their attributes mapping where it saves memory. Any other
+    attributes (e.g. custom fields) are stored in the instance dict which is
+    only created when first required.
+    """
+
+    def __new__(meta, name, bases, namespace):
+        slots = tuple(namespace.get('__slots__', ()))
+        if _SLOT_ATTRIBUTES:
+            slots += tuple(
+                k for k in namespace.get('attributes', ())
+                if k.isidentifier() and k not in slots and k not in namespace
+                and not any(hasattr(b, k) for b in bases))
+        namespace['__slots__'] = slots
+        cls = super().__new__(meta, name, bases, namespace)
+        cls._slot_names = tuple(
+            k for c in reversed(cls.__mro__) for k in c.__dict__.get('__slots__', ())
+            if k not in ('__dict__', '__weakref__'))
+        return cls
+
+
+# number of leading bytes of data used to detect its MIME type
+MAGIC_PREFIX_SIZE = 16 * 1024
+
+_BZIP2 = (bz2.BZ2Decompressor, b'BZh')
+_GZIP = (lambda: zlib.decompressobj(16 + zlib.MAX_WBITS), b'\x1f\x8b')
+_XZ = (lzma.LZMADecompressor, b'\xfd7zXZ\x00')
+
+# compressed MIME subtypes mapped to their streaming decompressor factories and
+# the magic bytes starting their streams
+_DECOMPRESSORS = {
+    'x-bzip2': _BZIP2,
+    'x-bzip': _BZIP2,
+    'bzip': _BZIP2,
+    'x-gzip': _GZIP,
+    'gzip': _GZIP,
+    'x-xz': _XZ,
+}
+
+
+def _chunked(data, chunk_size=64 * 1024):
+    """Split data into chunks without copying it."""
+    data = memoryview(data)
+    for i in range(0, len(data), chunk_size):
+        yield data[i:i + chunk_size]
+
+
+def sniff(chunks):
+    """Detect the MIME type of chunked data using a bounded prefix.
+
+    Returns the MIME type and an iterator over all the data chunks.
+    """
+    chunks = iter(chunks)
+    head = []
+    prefix = bytearray()
+    for chunk in chunks:
+        head.append(chunk)
+        prefix += chunk
+        if len(prefix) >= MAGIC_PREFIX_SIZE:
+            break
+    mimetype = magic.from_buffer(bytes(prefix[:MAGIC_PREFIX_SIZE]), mime=True)
+    return mimetype, chain(head, chunks)
+
+
+def _decompressed(chunks, factory, magic):
+    """Iterate over decompressed data chunks.
+
+    Concatenated streams, e.g. created by pbzip2, are decompressed in order
+    while any trailing data that doesn't start another stream such as padding
+    is ignored.
+    """
+    chunks = iter(chunks)
+    # start of the next stream
+    head = b''
+    try:
+        while True:
+            decompressor = factory()
+            for chunk in chain([head], chunks):
+                data = decompressor.decompress(chunk)
+                if data:
+                    yield data
+                if decompressor.eof:
+                    break
+            else:
+                return
+
+            head = decompressor.unused_data
+            while len(head) < len(magic):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                head += chunk
+            if not head.startswith(magic):
+                return
+    except (OSError, EOFError, zlib.error, lzma.LZMAError) as e:
+        raise BiteError(f'failed decompressing data: {e}')
+
+
+def decompress_chunks(chunks):
+    """Decompress chunked data while it's streamed.
+
+    Nested compression layers are removed until no supported compression
+    format is identified. Returns the MIME type of the decompressed data and
+    an iterator over its chunks.
+    """
+    mimetype, chunks = sniff(chunks)
+    while mimetype.split('/')[-1] in _DECOMPRESSORS:
+        chunks = _decompressed(chunks, *_DECOMPRESSORS[mimetype.split('/')[-1]])
+        mimetype, chunks = sniff(chunks)
+    return mimetype, chunks
+
+
 def decompress(fcn):
     """Decorator that decompresses returned data.
 
@@ -33,16 +185,8 @@ def decompress(fcn):
             # return raw data without decompressing
             return data
 
-        mime_type, mime_subtype = magic.from_buffer(data, mime=True).split('/')
-        while mime_subtype in ('x-bzip2', 'x-bzip', 'bzip', 'x-gzip', 'gzip', 'x-xz'):
-            if mime_subtype in ('x-bzip2', 'x-bzip', 'bzip'):
-                data = bz2.decompress(data)
-            elif mime_subtype in ('x-gzip', 'gzip'):
-                data = zlib.decompress(data, 16 + zlib.MAX_WBITS)
-            elif mime_subtype in ('x-xz'):
-                data = lzma.decompress(data)
-            mime_type, mime_subtype = magic.from_buffer(data, mime=True).split('/')
-        return data
+        _mimetype, chunks = decompress_chunks(_chunked(data))
+        return b''.join(chunks)
     return wrapper
 
 
@@ -206,9 +350,11 @@ class IntRange(object):
         return iter((self.start, self.end))
 
 
-class Item(object):
+class Item(object, metaclass=_Slotted):
     """Generic bug/issue/ticket object used by a service."""
 
+    __slots__ = ('_events', '__dict__', '__weakref__')
+
     attributes = {}
     attribute_aliases = {}
     type = None
@@ -287,15 +433,17 @@ class Item(object):
 
     # allow items to be used as mapping args to functions
     def __getitem__(self, key):
-        return self.__dict__[key]
+        return obj_attrs(self)[key]
 
     def keys(self):
-        return self.__dict__.keys()
+        return obj_attrs(self).keys()
 
 
-class Change(object):
+class Change(object, metaclass=_Slotted):
     """Generic change event on a service."""
 
+    __slots__ = ('id', 'creator', 'created', 'changes', 'count', '__dict__', '__weakref__')
+
     change_aliases = {}
 
     def __init__(self, creator, created, changes, id=None, count=None):
@@ -351,6 +499,8 @@ class Change(object):
 class Comment(Change):
     """Generic comment on a service."""
 
+    __slots__ = ('modified', 'text')
+
     def __init__(self, creator, created, modified=None,
                  id=None, count=None, changes=None, text=None):
         self.modified = modified
@@ -375,9 +525,17 @@ class Comment(Change):
         return '\n'.join(lines)
 
 
-class Attachment(object):
+class Attachment(object, metaclass=_Slotted):
     """Generic attachment to an item on a service."""
 
+    # size of data chunks written to disk
+    _chunk_size = 64 * 1024
+
+    __slots__ = (
+        'id', 'filename', 'url', 'size', '_mimetype', '_sniff', 'data', 'creator', 'created',
+        'modified', '__dict__', '__weakref__',
+    )
+
     def __init__(self, id=None, filename=None, url=None, size=None,
                  mimetype=None, data=None, creator=None, created=None, modified=None):
         self.id = id
@@ -395,13 +553,27 @@ class Attachment(object):
         self.modified = modified
 
         # don't trust the content type -- users often set the wrong mimetypes
-        if self.data is not None:
-            mimetype = magic.from_buffer(self.read(), mime=True)
+        self._sniff = self.data is not None
+
+    @property
+    def mimetype(self):
+        """MIME type of the attachment.
+
+        When data is available the type is detected on first access using the
+        start of the decompressed data.
+        """
+        if getattr(self, '_sniff', False):
+            self._sniff = False
+            mimetype, _chunks = decompress_chunks(self.iter_content())
             if mimetype == 'application/octet-stream':
                 # assume these are plaintext
-                self.mimetype = 'text/plain'
-            else:
-                self.mimetype = mimetype
+                mimetype = 'text/plain'
+            self._mimetype = mimetype
+        return self._mimetype
+
+    @mimetype.setter
+    def mimetype(self, value):
+        self._mimetype = value
 
     def __str__(self):
         l = ['Attachment:']
@@ -418,21 +590,45 @@ class Attachment(object):
             return self.data.encode()
         return self.data
 
+    def iter_content(self, chunk_size=None):
+        """Iterate over the raw attachment data in chunks."""
+        chunk_size = chunk_size if chunk_size is not None else self._chunk_size
+        data = memoryview(self.read(raw=True))
+        for i in range(0, len(data), chunk_size):
+            yield data[i:i + chunk_size]
+
     def write(self, path):
+        """Write the raw attachment data to a file, returning the number of bytes written.
+
+        Data is streamed to a temporary file in the same directory which
+        replaces the target path once complete so interrupted downloads never
+        leave partial files behind.
+        """
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(path)),
+                prefix=f'.{os.path.basename(path)}.')
+        except IOError as e:
+            raise BiteError(f'failed writing file: {path!r}: {e.strerror}')
+
         try:
-            with open(path, 'wb+') as f:
-                os.chmod(path, stat.S_IREAD | stat.S_IWRITE)
-                f.write(self.read(raw=True))
-        except Exception as e:
-            # toss file stub if it got created
+            # temporary files are only readable and writable by their owner
+            size = 0
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in self.iter_content():
+                    size += f.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException as e:
+            # toss partially written file
             try:
-                os.remove(path)
+                os.remove(tmp_path)
             except FileNotFoundError:
                 pass
 
             if isinstance(e, IOError):
                 raise BiteError(f'failed writing file: {path!r}: {e.strerror}')
             raise
+        return size
 
 
 class TarAttachment(object):
@@ -446,7 +642,7 @@ class TarAttachment(object):
 
     def data(self):
         data = self.read()
-        mime = magic.from_buffer(data, mime=True)
+        mime = magic.from_buffer(data[:MAGIC_PREFIX_SIZE], mime=True)
         if mime.startswith('text'):
             for encoding in ('utf-8', 'latin-1'):
                 try:
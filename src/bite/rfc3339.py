@@ -97,7 +97,7 @@ Here's an excerpt from RFC 3339 itself:
 import datetime, time, calendar
 import re
 
-__all__ = ["tzinfo", "UTC_TZ", "parse_date", "parse_datetime", "now", "utcfromtimestamp", "utctotimestamp", "datetimetostr", "timestamptostr", "strtotimestamp"]
+__all__ = ["tzinfo", "UTC_TZ", "parse_date", "parse_datetime", "parse_utc_datetime", "now", "utcfromtimestamp", "utctotimestamp", "datetimetostr", "timestamptostr", "strtotimestamp"]
 
 ZERO = datetime.timedelta(0)
 
@@ -143,6 +143,7 @@ def make_re(*parts):
 
 date_re = make_re(date_re_str)
 datetime_re = make_re(date_re_str, r'[ tT]', time_re_str)
+utc_datetime_re = re.compile(r'\d\d\d\d-\d\d-\d\d[tT]\d\d:\d\d:\d\d[zZ]$')
 
 def parse_date(s):
     """
@@ -323,6 +324,27 @@ def parse_datetime(s):
     else:
         raise ValueError('Invalid RFC 3339 datetime string', s)
 
+def parse_utc_datetime(s):
+    """
+    Fast path for the common case of 'date-time' strings in UTC without
+    fractional seconds, falling back to parse_datetime() for all other
+    strings. Any deviation from the allowed format will produce a raised
+    ValueError.
+
+    Matching strings are handed off to the C implementation of
+    datetime.datetime.fromisoformat() so the returned instances use the
+    datetime.timezone.utc timezone instead of rfc3339.UTC_TZ.
+
+    >>> parse_utc_datetime("2008-08-24T00:00:00Z")
+    datetime.datetime(2008, 8, 24, 0, 0, tzinfo=datetime.timezone.utc)
+    >>> parse_utc_datetime("2008-08-24T00:00:00+01:00")
+    datetime.datetime(2008, 8, 24, 0, 0, tzinfo=rfc3339.tzinfo(60,'+01:00'))
+    """
+    if utc_datetime_re.match(s):
+        return datetime.datetime.fromisoformat(s[:19] + '+00:00')
+    else:
+        return parse_datetime(s)
+
 def now():
     """Return a timezone-aware datetime.datetime object in
     rfc3339.UTC_TZ timezone, representing the current moment
@@ -12,6 +12,12 @@ def run(script_name):
     try:
         from snakeoil import demandimport
         demandimport.enable()
+        # hand commands off to a running daemon, skipping the startup overhead
+        if script_name == 'bite':
+            from bite.daemon import forward
+            status = forward(sys.argv[1:])
+            if status is not None:
+                sys.exit(status)
         from bite.argparser import Tool
         script_module = '.'.join(
             os.path.realpath(__file__).split(os.path.sep)[-3:-1] +
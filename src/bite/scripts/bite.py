@@ -11,6 +11,8 @@ import os
 
 from ..argparser import ArgumentParser, parse_file, override_attr
 from ..base import get_service_cls
+from ..broker import Broker, stop as stop_broker
+from ..daemon import Daemon, socket_path as daemon_path
 from ..alias import Aliases
 from ..client import Cli
 from ..config import Config
@@ -58,6 +60,41 @@ connect_opts.add_argument(
 connect_opts.add_argument(
     '-C', '--concurrent', type=int,
     help='maximum number of allowed concurrent requests to a service')
+connect_opts.add_argument(
+    '--engine', choices=('thread', 'async'),
+    help='request dispatch engine to use (defaults to thread)')
+connect_opts.add_argument(
+    '--rate-limit', type=float, metavar='REQUESTS',
+    help='maximum number of requests per second sent to each host')
+connect_opts.add_argument(
+    '--rate-burst', type=int, metavar='REQUESTS',
+    help='number of requests allowed to exceed the rate limit in bursts')
+connect_opts.add_argument(
+    '--no-adaptive', action='store_false', dest='adaptive', default=None,
+    help='disable adjusting concurrency when a service throttles requests')
+connect_opts.add_argument(
+    '--prefetch', type=int, metavar='PAGES',
+    help='number of result pages to request ahead of time when the total is unknown')
+connect_opts.add_argument(
+    '--http-cache', action='store_true', default=None,
+    help='cache responses to make later requests conditional')
+connect_opts.add_argument(
+    '--retries', type=int, metavar='COUNT',
+    help='number of times to retry failed idempotent requests (defaults to 3)')
+connect_opts.add_argument(
+    '--trace', metavar='FILE',
+    help='write a Chrome trace of request timings to a file and output '
+         'a latency summary per endpoint')
+cassette_opts = connect_opts.add_mutually_exclusive_group()
+cassette_opts.add_argument(
+    '--record', metavar='FILE',
+    help='record HTTP exchanges to a compressed cassette file')
+cassette_opts.add_argument(
+    '--replay', metavar='FILE',
+    help='replay HTTP exchanges from a cassette file instead of using the network')
+connect_opts.add_argument(
+    '--replay-timing', action='store_true',
+    help='delay replayed responses by the time they originally took')
 connect_opts.add_argument(
     '--timeout', type=float, metavar='SECONDS',
     help='amount of time to wait before timing out requests (defaults to 30 seconds)')
@@ -109,6 +146,34 @@ cache_opts.add_argument(
     '-r', '--remove', action='store_true',
     help='remove various data caches')
 
+sync = subparsers.add_parser(
+    'sync', description='update local item stores')
+sync.add_argument(
+    'connections', nargs='*', metavar='connection',
+    help='connection store(s) to sync')
+sync_opts = sync.add_argument_group('Sync options')
+sync_opts.add_argument(
+    '-r', '--remove', action='store_true',
+    help='remove local item stores')
+
+broker = subparsers.add_parser(
+    'broker', description='run a local broker caching decrypted credentials')
+broker_opts = broker.add_argument_group('Broker options')
+broker_opts.add_argument(
+    '--ttl', type=float, metavar='SECONDS',
+    help='amount of time credentials are kept in memory (defaults to 1 hour)')
+broker_opts.add_argument(
+    '--stop', action='store_true',
+    help='stop a running broker')
+
+serve = subparsers.add_parser(
+    'serve', description='run a local daemon handling search and get commands '
+                         'using warm services')
+serve_opts = serve.add_argument_group('Daemon options')
+serve_opts.add_argument(
+    '--stop', action='store_true',
+    help='stop a running daemon')
+
 
 def get_cli(args):
     if not isinstance(args, dict):
@@ -169,8 +234,8 @@ def _cache_validate_args(parser, namespace):
         cache.error('either -u/--update or -r/--remove must be specified')
 
 
-@cache.bind_main_func
-def _cache(options, out, err):
+def _update_connections(options, err, action, desc):
+    """Run client actions for the specified connections in parallel."""
     # load all service connections
     config = Config(connection=None)
     connections = options.pop('connections')
@@ -179,7 +244,7 @@ def _cache(options, out, err):
     elif connections == ['all']:
         connections = config.sections()
 
-    def _cache_update(options, connection):
+    def _update(options, connection):
         service = config.get(connection, 'service', fallback=None)
         base = config.get(connection, 'base', fallback=None)
         if service is None or base is None:
@@ -190,33 +255,91 @@ def _cache(options, out, err):
         options.service = get_service_cls(service, const.SERVICES)(**args)
         client = get_service_cls(args['service'], const.CLIENTS, fallbacks=(Cli,))(**args)
         try:
-            client.cache(**args)
+            getattr(client, action)(**args)
         except RequestError as e:
-            err.write(f'failed updating cached data: {connection}: {e}')
+            err.write(f'failed updating {desc}: {connection}: {e}')
             return 1
         return 0
 
-    # run all cache updates in parallel
+    # run all connection updates in parallel
     if len(connections) > 1:
         options.quiet = True
-    options.skip_auth = True
     ret = []
     with concurrent.futures.ThreadPoolExecutor(max_workers=len(connections)) as executor:
-        future_to_c = {executor.submit(_cache_update, options, c): c for c in connections}
+        future_to_c = {executor.submit(_update, options, c): c for c in connections}
         for future in concurrent.futures.as_completed(future_to_c):
             ret.append(future.result())
     return int(any(ret))
 
 
+@cache.bind_main_func
+def _cache(options, out, err):
+    options.skip_auth = True
+    return _update_connections(options, err, 'cache', 'cached data')
+
+
+@sync.bind_main_func
+def _sync(options, out, err):
+    return _update_connections(options, err, 'sync', 'local store')
+
+
+@broker.bind_main_func
+def _broker(options, out, err):
+    if options.stop:
+        if not stop_broker():
+            err.write('no broker running')
+            return 1
+        return 0
+
+    with Broker(ttl=options.ttl) as server:
+        if options.verbosity > 0:
+            out.write(f'broker listening: {server.path}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+@serve.bind_main_func
+def _serve(options, out, err):
+    if options.stop:
+        if not stop_broker(path=daemon_path()):
+            err.write('no daemon running')
+            return 1
+        return 0
+
+    with Daemon() as server:
+        if options.verbosity > 0:
+            out.write(f'daemon listening: {server.path}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
 @argparser.bind_final_check
 def _validate_args(parser, namespace):
     if namespace.auth_file is not None:
         namespace.auth_file = os.path.abspath(namespace.auth_file)
+    if namespace.replay_timing and namespace.replay is None:
+        parser.error('--replay-timing requires --replay')
 
 
 @argparser.bind_main_func
 def main(options, out, err):
     client, fcn_args = get_cli(options)
     cmd = getattr(client, fcn_args.pop('fcn'))
-    cmd(**fcn_args)
+    try:
+        cmd(**fcn_args)
+    finally:
+        tracer = client.service.tracer
+        if tracer is not None:
+            try:
+                tracer.write(options.trace)
+            except IOError as e:
+                err.write(f'failed writing trace: {options.trace!r}: {e.strerror}')
+            for line in tracer.summary():
+                err.write(line)
     return 0
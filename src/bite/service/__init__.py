@@ -1,7 +1,13 @@
+import asyncio
 import atexit
 from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from multiprocessing import cpu_count
+import os
+import random
+import stat
+import time
+from types import GeneratorType
 from urllib.parse import urlparse, urlunparse
 import warnings
 import urllib3
@@ -9,19 +15,44 @@ import urllib3
 import requests
 from snakeoil.sequences import iflatten_instance
 
+from ._cassette import RecordAdapter, ReplayAdapter
 from ._reqs import Request, ExtractData
+from ._throttle import RequestPolicy, retry_after
+from ._trace import Tracer, timed
 from .. import __title__, __version__
-from ..cache import Cache, Auth, Cookies
+from ..cache import Cache, Auth, Cookies, HTTPCache
+from ..columns import Columns
 from ..exceptions import RequestError, AuthError, BiteError
 from ..objects import Item, Attachment
 
 
+def ident(x):
+    return x
+
+
 class Session(requests.Session):
 
+    # HTTP methods that are safe to automatically retry after any transient failure
+    _retry_methods = frozenset(('GET', 'HEAD', 'OPTIONS'))
+    # response status codes signaling transient failures
+    _retry_statuses = frozenset((429, 502, 503, 504))
+    # Response status codes signaling requests were rejected before being
+    # processed, other methods are only retried on these or if they failed to
+    # connect since they may have already reached the service otherwise.
+    _unprocessed_statuses = frozenset((429,))
+    # initial and maximum number of seconds to wait between retries
+    _retry_backoff = 0.5
+    _retry_max_delay = 60
+
     def __init__(self, concurrent=None, verify=True, stream=True,
-                 timeout=None, allow_redirects=False):
+                 timeout=None, allow_redirects=False, http_cache=None, policy=None,
+                 retries=None, record=None, replay=None, replay_timing=False):
         super().__init__()
         self.verify = verify
+        self.http_cache = http_cache
+        self.policy = policy
+        # default to retrying failed requests three times
+        self.retries = retries if retries is not None else 3
         self.stream = stream
         self.allow_redirects = allow_redirects
         if timeout == 0:
@@ -33,7 +64,13 @@ class Session(requests.Session):
 
         # block when urllib3 connection pool is full
         concurrent = concurrent if concurrent is not None else cpu_count() * 5
-        a = requests.adapters.HTTPAdapter(pool_maxsize=concurrent, pool_block=True)
+        if replay is not None:
+            # respond using previously recorded exchanges instead of the network
+            a = ReplayAdapter(replay, timing=replay_timing)
+        elif record is not None:
+            a = RecordAdapter(record, pool_maxsize=concurrent, pool_block=True)
+        else:
+            a = requests.adapters.HTTPAdapter(pool_maxsize=concurrent, pool_block=True)
         self.mount('https://', a)
         self.mount('http://', a)
 
@@ -46,7 +83,7 @@ class Session(requests.Session):
         self.headers['User-Agent'] = f'{__title__}-{__version__}'
         self.headers['Accept-Encoding'] = ', '.join(('gzip', 'deflate', 'compress'))
 
-    def send(self, req, **kw):
+    def send(self, req, cache=True, **kw):
         # use session settings if not explicitly passed
         kw.setdefault('timeout', self.timeout)
         kw.setdefault('allow_redirects', self.allow_redirects)
@@ -54,24 +91,108 @@ class Session(requests.Session):
         if not isinstance(req, requests.PreparedRequest):
             req = self.prepare_request(req)
 
-        try:
-            return super().send(req, **kw)
-        except requests.exceptions.RequestException as e:
-            if isinstance(e, requests.exceptions.SSLError):
-                msg = 'SSL certificate verification failed'
-            elif isinstance(e, requests.exceptions.ConnectionError):
-                url = urlparse(req.url)
-                base_url = urlunparse((
-                    url.scheme,
-                    url.netloc,
-                    '',
-                    None, None, None))
-                msg = f'failed to establish connection: {base_url}'
-            elif isinstance(e, requests.exceptions.ReadTimeout):
-                msg = f'request timed out (timeout: {self.timeout}s)'
+        # make GET requests conditional if a previous response was cached
+        cache = self.http_cache if cache and self.http_cache and req.method == 'GET' else None
+        cached = cache.get(req) if cache is not None else None
+        if cached is not None:
+            req = req.copy()
+            req.headers.update(cache.conditional_headers(cached[0]))
+
+        # only automatically retry requests that are safe to repeat
+        idempotent = req.method in self._retry_methods
+        statuses = self._retry_statuses if idempotent else self._unprocessed_statuses
+        attempt = 0
+        while True:
+            delay = None
+            try:
+                response = self._send(req, **kw)
+            except requests.exceptions.RequestException as e:
+                if attempt < self.retries and self._transient_error(e, idempotent):
+                    delay = self._retry_delay(attempt)
+                else:
+                    raise self._request_error(req, e)
             else:
-                msg = str(e)
-            raise RequestError(msg, request=e.request, response=e.response)
+                if attempt < self.retries and response.status_code in statuses:
+                    delay = self._retry_delay(attempt, response)
+                if delay is None:
+                    break
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+        if cached is not None and response.status_code == 304:
+            return self._cached_response(response, *cached)
+        elif cache is not None and response.status_code == 200:
+            cache.update(req, response)
+        return response
+
+    def _send(self, req, **kw):
+        """Send a single HTTP request attempt."""
+        if self.policy is not None:
+            self.policy.acquire(req.url)
+        response = None
+        try:
+            response = super().send(req, **kw)
+        finally:
+            if self.policy is not None:
+                self.policy.release(req.url, response)
+        return response
+
+    @staticmethod
+    def _transient_error(e, idempotent=True):
+        """Determine if a request failed for reasons that may resolve themselves."""
+        if isinstance(e, requests.exceptions.SSLError):
+            return False
+        elif not idempotent:
+            # requests that timed out connecting never reached the service
+            return isinstance(e, requests.exceptions.ConnectTimeout)
+        return isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+    def _retry_delay(self, attempt, response=None):
+        """Return the number of seconds to wait before retrying a request.
+
+        Returns None if the service asks clients to wait longer than allowed.
+        """
+        delay = retry_after(response)
+        if delay is None:
+            # exponential backoff with full jitter
+            return random.uniform(0, min(self._retry_max_delay, self._retry_backoff * 2 ** attempt))
+        return delay if delay <= self._retry_max_delay else None
+
+    def _request_error(self, req, e):
+        """Convert a requests exception into a request error."""
+        if isinstance(e, requests.exceptions.SSLError):
+            msg = 'SSL certificate verification failed'
+        elif isinstance(e, requests.exceptions.ConnectionError):
+            url = urlparse(req.url)
+            base_url = urlunparse((
+                url.scheme,
+                url.netloc,
+                '',
+                None, None, None))
+            msg = f'failed to establish connection: {base_url}'
+        elif isinstance(e, requests.exceptions.ReadTimeout):
+            msg = f'request timed out (timeout: {self.timeout}s)'
+        else:
+            msg = str(e)
+        return RequestError(msg, request=e.request, response=e.response)
+
+    @staticmethod
+    def _cached_response(response, headers, content):
+        """Create a response from cached data for a 304 response."""
+        cached = requests.Response()
+        cached.status_code = 200
+        cached.reason = 'OK'
+        cached.headers = requests.structures.CaseInsensitiveDict(headers)
+        cached._content = content
+        cached._content_consumed = True
+        cached.url = response.url
+        cached.request = response.request
+        cached.encoding = requests.utils.get_encoding_from_headers(cached.headers)
+        cached.elapsed = response.elapsed
+        cached.from_cache = True
+        response.close()
+        return cached
 
 
 class ClientCallbacks(object):
@@ -100,15 +221,31 @@ class Service(object):
     _service = None
     _service_error_cls = RequestError
     _cache_cls = Cache
+    _policy_cls = RequestPolicy
 
     item = Item
     item_endpoint = None
     attachment = Attachment
     attachment_endpoint = None
+    # attachments being saved are downloaded from raw URLs instead of
+    # including their data in attachment requests
+    attachment_downloads = False
+
+    # supported request dispatch engines
+    engines = ('thread', 'async')
+
+    # extra search params used to pull all items when syncing the local store
+    sync_params = {}
+
+    # max encoded URL length and data body size before requests get split
+    max_url_length = 8000
+    max_body_size = 1024 * 1024
 
     def __init__(self, *, base, endpoint='', connection=None, verify=True, user=None, password=None,
                  auth_file=None, auth_token=None, suffix=None, timeout=None, concurrent=None,
-                 max_results=None, debug=None, verbosity=0, **kw):
+                 max_results=None, max_ids=None, prefetch=None, engine=None, http_cache=None,
+                 rate_limit=None, rate_burst=None, adaptive=None, retries=None, trace=None,
+                 record=None, replay=None, replay_timing=None, debug=None, verbosity=0, **kw):
         self.base = base
         self.webbase = base
         self.connection = connection
@@ -118,9 +255,26 @@ class Service(object):
         self.verbosity = verbosity
         self.debug = debug
         self.max_results = max_results
+        # max number of IDs per request before requests get split
+        self.max_ids = max_ids
+        # number of result pages to speculatively request ahead of the current one
+        self.prefetch = prefetch if prefetch is not None else 0
+
+        # default to running request trees via nested thread pool jobs
+        self.engine = engine if engine is not None else 'thread'
+        if self.engine not in self.engines:
+            raise BiteError(
+                f'invalid engine: {self.engine!r} '
+                f"(available engines: {', '.join(self.engines)})")
 
         self.client = ClientCallbacks()
 
+        # request lifecycle hooks, optionally including a tracer collecting timings
+        self.hooks = []
+        self.tracer = Tracer(endpoint=self._endpoint) if trace else None
+        if self.tracer is not None:
+            self.hooks.append(self.tracer)
+
         # max workers defaults to system CPU count * 5 if concurrent is None
         self.executor = ThreadPoolExecutor(max_workers=concurrent)
 
@@ -136,7 +290,24 @@ class Service(object):
         self.auth = Auth(connection, path=auth_file, token=auth_token)
 
         concurrent = self.executor._max_workers
-        self.session = Session(concurrent=concurrent, verify=verify, timeout=timeout)
+        # optionally cache responses for conditional requests, recorded
+        # exchanges are replayed as is so they're sent unconditionally
+        if record is not None or replay is not None:
+            http_cache = False
+        http_cache = HTTPCache(connection) if http_cache else None
+        if rate_limit is not None and rate_limit < 0:
+            raise BiteError(f'invalid rate limit: {rate_limit!r}')
+        # buckets must be able to hold at least a single request's token
+        if rate_burst is not None and rate_burst < 1:
+            raise BiteError(f'invalid rate burst: {rate_burst!r}')
+        # limit request rates and adapt concurrency per host to service throttling
+        self.policy = self._policy_cls(
+            concurrent, rate_limit=rate_limit, rate_burst=rate_burst,
+            adaptive=adaptive if adaptive is not None else True)
+        self.session = Session(
+            concurrent=concurrent, verify=verify, timeout=timeout,
+            http_cache=http_cache, policy=self.policy, retries=retries,
+            record=record, replay=replay, replay_timing=bool(replay_timing))
         self._web_session = None
 
         # login if user/pass was specified and the auth token isn't set
@@ -164,6 +335,16 @@ class Service(object):
         """Get an authentication token from the service."""
         return self.send(self.LoginRequest(user=user, password=password, **kw))
 
+    def search_frame(self, fields=None, **params):
+        """Search for items, returning the results as typed columns.
+
+        Results are added to the columns as they're received, see
+        :class:`bite.columns.Columns` for conversion to NumPy, Arrow, or pandas.
+        """
+        if fields is not None:
+            params['fields'] = fields
+        return Columns(self.SearchRequest(params=params).send(), fields=fields)
+
     def __str__(self):
         return f'{self.webbase} -- {self._service}'
 
@@ -305,26 +486,88 @@ class Service(object):
 
     def send(self, *reqs, **kw):
         """Send requests and return parsed response data."""
-        # TODO: simplify this using async/await
         if not reqs:
             return None
 
-        ident = lambda x: x
+        if self.engine == 'async' and not self._loop_running():
+            data = self._send_async(reqs, **kw)
+        else:
+            data = self._send_threads(reqs, **kw)
+
+        generator = isinstance(reqs[0], (list, tuple))
+        if len(reqs) == 1 and not generator:
+            return next(data)
+        else:
+            return data
+
+    @staticmethod
+    def _loop_running():
+        """Determine if an event loop is already running in the current thread.
+
+        Requests sent from parsing code that executes inside the async engine's
+        event loop can't start a nested loop so they fall back to threads.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+
+    @staticmethod
+    def _split(req):
+        """Split requests that are too large into multiple requests."""
+        if isinstance(req, Request):
+            return req.split()
+        return req
 
+    @staticmethod
+    def _req_attrs(req):
+        """Pull the sending and parsing related attributes from a request."""
+        return (
+            getattr(req, 'parse', ident),
+            getattr(req, '_iterate', ExtractData),
+            getattr(req, 'parse_response', None),
+            getattr(req, '_raw', None),
+            bool(getattr(req, '_reqs', ())),
+            getattr(req, '_cacheable', True),
+        )
+
+    def _hook(self, name, *args):
+        """Run a given hook for all registered hook objects."""
+        for hook in self.hooks:
+            getattr(hook, name)(*args)
+
+    def _endpoint(self, req):
+        """Name used to group requests to the same endpoint when tracing."""
+        return f'{req.method} {urlparse(req.url).path}'
+
+    def _traced_parse(self, parse, results):
+        """Parse request results, timing the parsing for registered hooks."""
+        req = getattr(parse, '__self__', None)
+        callback = partial(self._hook, 'on_parse_done', req)
+        start = time.perf_counter()
+        data = parse(results)
+        # time spent in lazy parsers is tracked as their data is consumed
+        if isinstance(data, GeneratorType):
+            return timed(data, callback)
+        callback(time.perf_counter() - start)
+        return data
+
+    def _send_threads(self, reqs, **kw):
+        """Send requests in parallel using nested thread pool jobs."""
         def _parse(parse, iterate, reqs, generator=False):
             results = iterate(x.result() for x in reqs)
             if len(reqs) == 1 and not generator:
                 results = next(results)
+            if self.hooks:
+                return self._traced_parse(parse, results)
             return parse(results)
 
         def _send_jobs(reqs):
             jobs = []
             for req in iflatten_instance(reqs, Request):
-                parse = getattr(req, 'parse', ident)
-                iterate = getattr(req, '_iterate', ExtractData)
-                req_parse = getattr(req, 'parse_response', None)
-                raw = getattr(req, '_raw', None)
-                generator = bool(getattr(req, '_reqs', ()))
+                req = self._split(req)
+                parse, iterate, req_parse, raw, generator, cacheable = self._req_attrs(req)
 
                 if isinstance(req, Request) and generator:
                     # force subreqs to be sent and parsed in parallel
@@ -336,10 +579,12 @@ class Service(object):
                     if not hasattr(req, '__iter__'):
                         req = [req]
 
+                    send_kw = kw if cacheable else dict(kw, cache=False)
                     for r in iflatten_instance(req, requests.Request):
                         if isinstance(r, requests.Request):
                             func = partial(
-                                self._http_send, raw=raw, req_parse=req_parse, **kw)
+                                self._http_send, raw=raw, req_parse=req_parse,
+                                queued=time.perf_counter(), **send_kw)
                         else:
                             func = ident
                         http_reqs.append(self.executor.submit(func, r))
@@ -349,18 +594,90 @@ class Service(object):
                             _parse, parse, iterate, http_reqs, generator))
             return jobs
 
-        data = (x.result() for x in _send_jobs(reqs))
+        return (x.result() for x in _send_jobs(reqs))
 
-        generator = isinstance(reqs[0], (list, tuple))
-        if len(reqs) == 1 and not generator:
-            return next(data)
-        else:
-            return data
+    def _send_async(self, reqs, **kw):
+        """Send requests in parallel as coroutines running on a single event loop.
+
+        Request trees are walked and parsed on the event loop while only the
+        blocking HTTP calls for leaf requests are run using the executor, so
+        nested requests don't tie up worker threads waiting on their subreqs.
+        """
+        def _results(results):
+            # raise exceptions lazily to match the thread engine
+            for x in results:
+                if isinstance(x, Exception):
+                    raise x
+                yield x
+
+        async def _parse(parse, iterate, jobs, generator=False):
+            results = await asyncio.gather(*jobs, return_exceptions=True)
+            results = iterate(_results(results))
+            if len(jobs) == 1 and not generator:
+                results = next(results)
+            if self.hooks:
+                return self._traced_parse(parse, results)
+            return parse(results)
+
+        async def _ident(x):
+            return x
+
+        def _send_jobs(loop, reqs):
+            jobs = []
+            for req in iflatten_instance(reqs, Request):
+                req = self._split(req)
+                parse, iterate, req_parse, raw, generator, cacheable = self._req_attrs(req)
+
+                if isinstance(req, Request) and generator:
+                    # subreqs are sent and parsed concurrently
+                    data = _send_jobs(loop, iter(req))
+                    jobs.append(_parse(parse, iterate, data, generator))
+                else:
+                    http_reqs = []
+                    if not hasattr(req, '__iter__'):
+                        req = [req]
+
+                    send_kw = kw if cacheable else dict(kw, cache=False)
+                    for r in iflatten_instance(req, requests.Request):
+                        if isinstance(r, requests.Request):
+                            func = partial(
+                                self._http_send, r, raw=raw, req_parse=req_parse,
+                                queued=time.perf_counter(), **send_kw)
+                            http_reqs.append(loop.run_in_executor(self.executor, func))
+                        else:
+                            http_reqs.append(_ident(r))
+
+                    if http_reqs:
+                        jobs.append(_parse(parse, iterate, http_reqs, generator))
+            return jobs
+
+        async def _send(reqs):
+            loop = asyncio.get_running_loop()
+            return await asyncio.gather(*_send_jobs(loop, reqs), return_exceptions=True)
 
-    def _http_send(self, req, raw=None, req_parse=None, **kw):
+        return _results(asyncio.run(_send(reqs)))
+
+    def _http_send(self, req, raw=None, req_parse=None, queued=None, **kw):
         """Send an HTTP request and return the parsed response."""
-        response = self.session.send(req, **kw)
+        if not self.hooks:
+            return self._http_response(req, self.session.send(req, **kw), raw, req_parse)
 
+        # time spent waiting for a free worker after being submitted
+        queued = time.perf_counter() - queued if queued is not None else 0
+        self._hook('on_request_start', req, queued)
+        error = None
+        try:
+            response = self.session.send(req, **kw)
+            self._hook('on_response', req, response)
+            return self._http_response(req, response, raw, req_parse)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._hook('on_request_done', req, error)
+
+    def _http_response(self, req, response, raw=None, req_parse=None):
+        """Handle the response for an HTTP request, returning its parsed data."""
         if response.status_code == 301:
             old = self.base
             new = response.headers['Location']
@@ -380,6 +697,65 @@ class Service(object):
         else:
             self._failed_http_response(response)
 
+    def stream(self, url, offset=0, **kw):
+        """Request a file, returning the response with its body left unread.
+
+        Streamed responses skip the HTTP cache so large files such as
+        attachments can be written to disk without being buffered in memory.
+        A nonzero offset requests the file's data starting at that byte.
+        """
+        req, = Request(service=self, method='GET', url=url).prepare()
+        if offset:
+            req.headers['Range'] = f'bytes={offset}-'
+        kw.setdefault('allow_redirects', True)
+        response = self.session.send(req, stream=True, cache=False, **kw)
+        if not response.ok:
+            self._failed_http_response(response)
+        return response
+
+    def download(self, url, path, chunk_size=64 * 1024):
+        """Download a file, resuming previously interrupted downloads.
+
+        Data is written to a partial file alongside the target path that's
+        moved into place once complete. Partial files left behind by failed
+        downloads are continued using range requests if the server supports
+        them.
+
+        Returns the number of bytes downloaded.
+        """
+        part_path = f'{path}.part'
+        try:
+            offset = os.path.getsize(part_path)
+        except OSError:
+            offset = 0
+
+        try:
+            response = self.stream(url, offset=offset)
+        except RequestError as e:
+            # partial file doesn't match the remote file, start over
+            if not offset or e.code != 416:
+                raise
+            offset = 0
+            response = self.stream(url)
+
+        # servers that don't support range requests send the entire file
+        if response.status_code != 206:
+            offset = 0
+
+        size = 0
+        try:
+            with response, open(part_path, 'ab' if offset else 'wb') as f:
+                os.chmod(part_path, stat.S_IREAD | stat.S_IWRITE)
+                for chunk in response.iter_content(chunk_size):
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(part_path, path)
+        except requests.exceptions.RequestException as e:
+            raise self.session._request_error(response.request, e)
+        except IOError as e:
+            raise BiteError(f'failed writing file: {path!r}: {e.strerror}')
+        return size
+
     def _failed_http_response(self, response):
         if response.status_code == 401:
             raise AuthError('authentication failed', text=response.text)
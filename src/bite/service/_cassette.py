@@ -0,0 +1,212 @@
+"""Record and replay HTTP exchanges.
+
+Responses received from services can be recorded to a cassette file and
+later replayed instead of using the network, making it possible to profile
+parsing and request handling offline against real-world data. Replayed
+responses are returned immediately or after the delays they originally took.
+
+Cassettes are gzip-compressed files holding a JSON object per exchange.
+Credentials passed in URL params and cookies set by services aren't stored
+and tokens returned in JSON or XML-RPC response bodies, e.g. by logins, are
+redacted.
+"""
+
+import atexit
+import base64
+from collections import defaultdict, deque
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+from requests import Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.exceptions import RequestException
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from ..exceptions import BiteError
+
+# URL params holding credentials that are dropped from stored URLs
+_SENSITIVE_PARAMS = re.compile(r'token|api_?key|password|login', re.IGNORECASE)
+
+# JSON object keys and XML-RPC struct members holding credentials in responses
+_SENSITIVE_FIELDS = re.compile(r'token|api_?key|password|secret', re.IGNORECASE)
+
+# XML-RPC struct members with their values
+_XMLRPC_MEMBER = re.compile(
+    rb'(<member>\s*<name>([^<]*)</name>\s*<value>\s*(?:<string>)?)([^<]*)', re.IGNORECASE)
+
+# placeholder for redacted credentials
+_REDACTED = 'REDACTED'
+
+# response headers that aren't stored
+_SKIP_HEADERS = frozenset([
+    # bodies are stored decoded and possibly redacted
+    'content-encoding', 'content-length', 'transfer-encoding',
+    'set-cookie',
+])
+
+
+class CassetteError(RequestException):
+    """No recorded response exists for a request."""
+
+
+def _scrub_url(url):
+    """Remove credentials from a URL."""
+    url = urlparse(url)
+    params = [(k, v) for k, v in parse_qsl(url.query, keep_blank_values=True)
+              if not _SENSITIVE_PARAMS.search(k)]
+    return urlunparse(url._replace(query=urlencode(params)))
+
+
+def _redact(obj):
+    """Replace credentials held in decoded JSON data, returning if any were found."""
+    redacted = False
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if isinstance(v, str) and _SENSITIVE_FIELDS.search(k):
+                obj[k] = _REDACTED
+                redacted = True
+            else:
+                redacted |= _redact(v)
+    elif isinstance(obj, list):
+        for x in obj:
+            redacted |= _redact(x)
+    return redacted
+
+
+def _scrub_content(content, headers):
+    """Remove credentials from a response body."""
+    content_type = headers.get('Content-Type', '')
+    if 'json' in content_type:
+        try:
+            data = json.loads(content)
+        except ValueError:
+            return content
+        if _redact(data):
+            return json.dumps(data).encode()
+    elif 'xml' in content_type:
+        def redact(m):
+            if _SENSITIVE_FIELDS.search(m.group(2).decode('utf-8', 'replace')) and m.group(3):
+                return m.group(1) + _REDACTED.encode()
+            return m.group(0)
+        return _XMLRPC_MEMBER.sub(redact, content)
+    return content
+
+
+def _digest(body):
+    """Hash a request body so it's matched without being stored."""
+    if body is None:
+        return None
+    if isinstance(body, str):
+        body = body.encode()
+    return hashlib.sha1(body).hexdigest()
+
+
+def _key(method, url, body):
+    return f'{method} {url} {body}'
+
+
+class RecordAdapter(HTTPAdapter):
+    """Transport adapter recording the exchanges it sends to a cassette."""
+
+    def __init__(self, path, **kw):
+        super().__init__(**kw)
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            self._file = gzip.open(path, 'wt', encoding='utf-8')
+        except IOError as e:
+            raise BiteError(f'failed opening cassette: {path!r}: {e.strerror}')
+        # make sure the compressed stream is finalized when exiting
+        atexit.register(self.close)
+
+    def send(self, request, **kw):
+        start = time.perf_counter()
+        response = super().send(request, **kw)
+        # read the entire body so it can be stored, later reads use the buffered content
+        content = response.content
+        elapsed = time.perf_counter() - start
+
+        entry = {
+            'method': request.method,
+            'url': _scrub_url(request.url),
+            'body': _digest(request.body),
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': [
+                (k, v) for k, v in response.headers.items() if k.lower() not in _SKIP_HEADERS],
+            'elapsed': round(elapsed, 6),
+            'content': base64.b64encode(_scrub_content(content, response.headers)).decode(),
+        }
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(json.dumps(entry) + '\n')
+        return response
+
+    def close(self):
+        super().close()
+        with self._lock:
+            self._file.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter returning recorded responses from a cassette.
+
+    Requests are matched by method, URL, and body. Repeated requests get
+    recorded responses in order with the last one being reused once they run
+    out.
+    """
+
+    def __init__(self, path, timing=False):
+        super().__init__()
+        self.path = path
+        self.timing = timing
+        self._responses = defaultdict(deque)
+        self._lock = threading.Lock()
+
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    key = _key(entry['method'], entry['url'], entry['body'])
+                    self._responses[key].append(entry)
+        except EOFError:
+            # cassette wasn't closed cleanly, use all complete exchanges
+            pass
+        except IOError as e:
+            raise BiteError(f'failed reading cassette: {path!r}: {e.strerror}')
+        except ValueError as e:
+            raise BiteError(f'invalid cassette: {path!r}: {e}')
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        url = _scrub_url(request.url)
+        key = _key(request.method, url, _digest(request.body))
+        with self._lock:
+            entries = self._responses.get(key)
+            if not entries:
+                raise CassetteError(
+                    f'no recorded response: {request.method} {url}', request=request)
+            entry = entries.popleft() if len(entries) > 1 else entries[0]
+
+        if self.timing:
+            time.sleep(entry['elapsed'])
+
+        response = Response()
+        response.status_code = entry['status']
+        response.reason = entry['reason']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = base64.b64decode(entry['content'])
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
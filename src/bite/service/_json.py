@@ -1,3 +1,7 @@
+import codecs
+import re
+import weakref
+
 try: import simplejson as json
 except ImportError: import json
 
@@ -5,9 +9,149 @@ from . import Service
 from ..exceptions import ParsingError, RequestError
 
 
+class JsonStream(object):
+    """Incrementally decode a JSON object from a chunked response body.
+
+    Top-level members are decoded as they're encountered until the array
+    member matching the given key is reached. That array's elements are then
+    lazily decoded as they're consumed so only a single element needs to be
+    held in memory at a time.
+
+    The given close function is called to release the underlying response
+    once the object is fully decoded, when decoding fails, or when the
+    streamed elements are discarded before being exhausted.
+    """
+
+    _whitespace = re.compile(r'\S')
+    _number = frozenset('0123456789.eE+-')
+
+    def __init__(self, chunks, key, close=None):
+        self.chunks = chunks
+        self.key = key
+        # run close() at most once, including if the stream is garbage collected
+        self._close = weakref.finalize(self, close) if close is not None else None
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8-sig')()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def close(self):
+        """Release the underlying response."""
+        if self._close is not None:
+            self._close()
+
+    def _read(self):
+        """Read the next chunk of data, returns False if no more data exists."""
+        if self._eof:
+            return False
+        # drop consumed data to keep the buffer small
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        try:
+            chunk = next(self.chunks)
+        except StopIteration:
+            self._eof = True
+            self._buf += self._text.decode(b'', final=True)
+            return True
+        self._buf += self._text.decode(chunk)
+        return True
+
+    def _peek(self):
+        """Skip whitespace and return the next character."""
+        while True:
+            m = self._whitespace.search(self._buf, self._pos)
+            if m is not None:
+                self._pos = m.start()
+                return self._buf[self._pos]
+            self._pos = len(self._buf)
+            if not self._read():
+                raise json.decoder.JSONDecodeError(
+                    'unexpected end of data', self._buf, self._pos)
+
+    def _expect(self, chars):
+        """Consume and return the next character if it's one of the given characters."""
+        c = self._peek()
+        if c not in chars:
+            raise json.decoder.JSONDecodeError(
+                f'expecting one of {chars!r}', self._buf, self._pos)
+        self._pos += 1
+        return c
+
+    def _value(self):
+        """Decode the next value, reading more data until it's complete."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # numbers running up to the end of the buffer could be truncated
+                if self._eof or (end < len(self._buf) and self._buf[end] not in self._number):
+                    self._pos = end
+                    return value
+            except json.decoder.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._read()
+
+    def _members(self, data):
+        """Decode object members, stopping at the start of the streamed array."""
+        if self._peek() == '}':
+            self._pos += 1
+            return False
+        while True:
+            key = self._value()
+            self._expect(':')
+            if key == self.key and self._peek() == '[':
+                self._pos += 1
+                return True
+            data[key] = self._value()
+            if self._expect(',}') == '}':
+                return False
+
+    def _elements(self, data):
+        """Lazily decode streamed array elements followed by any remaining members."""
+        try:
+            if self._peek() == ']':
+                self._pos += 1
+            else:
+                while True:
+                    yield self._value()
+                    if self._expect(',]') == ']':
+                        break
+            if self._expect(',}') == ',':
+                self._members(data)
+        except json.decoder.JSONDecodeError as e:
+            raise ParsingError(msg=f'failed parsing JSON: {e}')
+        finally:
+            self.close()
+
+    def parse(self):
+        """Decode the object up to its streamed array.
+
+        The returned dict maps the streamed key to a generator of its
+        elements, members following the array are added to it once all
+        elements have been consumed. If the key doesn't exist, the fully
+        decoded object is returned.
+        """
+        data = {}
+        try:
+            self._expect('{')
+            if self._members(data):
+                data[self.key] = self._elements(data)
+                return data
+        except BaseException:
+            self.close()
+            raise
+        self.close()
+        return data
+
+
 class Json(Service):
     """Support generic services that use JSON to communicate."""
 
+    # size of data chunks read from the network when streaming responses
+    _stream_chunk_size = 64 * 1024
+
     def __init__(self, **kw):
         super().__init__(**kw)
         self.session.headers.update({
@@ -15,14 +159,25 @@ class Json(Service):
             'Content-Type': 'application/json'
         })
 
-    def parse_response(self, response, **kw):
-        """Parse the returned response."""
+    def parse_response(self, response, stream=None, **kw):
+        """Parse the returned response.
+
+        If a stream key is given, the elements of the related array are
+        decoded incrementally as they're consumed (see JsonStream).
+        """
         if not response.headers.get('Content-Type', '').startswith('application/json'):
             msg = 'non-JSON response from server'
             if self.verbosity > 0:
                 msg += ' (use verbose mode to see it)'
             raise RequestError(
                 msg, code=response.status_code, text=response.text, response=response)
+        if stream is not None:
+            chunks = response.iter_content(chunk_size=self._stream_chunk_size)
+            try:
+                return JsonStream(chunks, stream, close=response.close).parse()
+            except json.decoder.JSONDecodeError as e:
+                raise ParsingError(msg=f'failed parsing JSON: {e}')
+
         try:
             return response.json(**kw)
         except json.decoder.JSONDecodeError as e:
@@ -1,4 +1,8 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
 from functools import partial
+from itertools import chain
 import re
 from urllib.parse import urlencode
 
@@ -127,10 +131,24 @@ class Request(object):
         """Parse the data returned from a given request."""
         return data
 
+    def split(self):
+        """Split the request into multiple requests if it's too large to send."""
+        return self
+
     def send(self, **kw):
         """Send a request object to the related service."""
         return self.service.send(self, **kw)
 
+    def __copy__(self):
+        """Copy a request so its params and HTTP request can be altered independently."""
+        req = self.__class__.__new__(self.__class__)
+        req.__dict__.update(self.__dict__)
+        req.params = copy(self.params)
+        if self._req is not None:
+            req._req = requests.Request(
+                method=self._req.method, url=self._req.url, headers=dict(self._req.headers))
+        return req
+
     def __len__(self):
         return len(list(self._requests))
 
@@ -195,11 +213,122 @@ class NullRequest(Request):
         return self._none_gen
 
 
+class IDsRequest(Request):
+    """Construct a request for a list of IDs that can be split into chunks.
+
+    Requests for more IDs than the service allows or that are encoded into
+    URLs or data bodies larger than the service's limits are split into
+    multiple requests for chunks of IDs that are sent in parallel.
+    """
+
+    def __new__(cls, *args, **kw):
+        # save the original args to recreate the request for chunks of IDs
+        obj = super().__new__(cls)
+        obj._init_args = args
+        obj._init_kw = kw.copy()
+        return obj
+
+    def _request_ids(self):
+        """Return the IDs the request targets."""
+        return self._init_kw.get('ids')
+
+    def split(self):
+        ids = self._request_ids()
+        if not ids or len(ids) == 1:
+            return self
+        reqs = tuple(self._chunks(list(ids)))
+        if len(reqs) == 1:
+            return self
+        return ChunkedRequest(req=self, reqs=reqs)
+
+    def _chunk(self, ids):
+        """Create a request for the given IDs."""
+        return self.__class__(*self._init_args, **dict(self._init_kw, ids=ids))
+
+    def _chunks(self, ids):
+        """Split the request into chunks within the service's limits."""
+        chunk_size = self._chunk_size(ids)
+        if self.service.max_ids:
+            chunk_size = min(chunk_size, self.service.max_ids)
+        if chunk_size >= len(ids):
+            yield self
+            return
+        i = 0
+        while i < len(ids):
+            req = self._chunk(ids[i:i + chunk_size])
+            # IDs lengthen as they increase so shrink chunks exceeding the estimate
+            while chunk_size > 1 and not self._small(ids[i:i + chunk_size]):
+                sizes = self._encoded_size(req)
+                scale = max(size / limit for size, limit in zip(sizes, self._limits))
+                if scale <= 1:
+                    break
+                chunk_size = max(1, min(chunk_size - 1, int(chunk_size / scale)))
+                req = self._chunk(ids[i:i + chunk_size])
+            yield req
+            i += chunk_size
+
+    @property
+    def _limits(self):
+        return (self.service.max_url_length, self.service.max_body_size)
+
+    def _small(self, ids):
+        """Determine if IDs only account for a small fraction of the service's size limits."""
+        # allow for percent-encoded separators and the rest of the request
+        ids_size = sum(len(str(x)) + 3 for x in ids)
+        return all(ids_size * 4 <= limit for limit in self._limits)
+
+    def _chunk_size(self, ids):
+        """Estimate the number of IDs per request within the service's size limits."""
+        # skip preparing requests when they can't be near the limits
+        if self._small(ids):
+            return len(ids)
+
+        limits = self._limits
+        sizes = self._encoded_size(self)
+        if all(size <= limit for size, limit in zip(sizes, limits)):
+            return len(ids)
+
+        # estimate the encoded size per ID from the full and single ID requests
+        chunk_size = len(ids)
+        base_sizes = self._encoded_size(self._chunk(ids[:1]))
+        for size, base, limit in zip(sizes, base_sizes, limits):
+            if size > limit:
+                id_size = max((size - base) / (len(ids) - 1), 1)
+                chunk_size = min(chunk_size, max(1, int((limit - base) // id_size) + 1))
+        return chunk_size
+
+    @staticmethod
+    def _encoded_size(req):
+        """Return the longest encoded URL and data body of a request."""
+        url_length = body_size = 0
+        for r in copy(req).prepare():
+            if r is None:
+                continue
+            url_length = max(url_length, len(r.url))
+            if r.body is not None:
+                body_size = max(body_size, len(r.body))
+        return url_length, body_size
+
+
+class ChunkedRequest(Request):
+    """Combine requests for chunks of IDs, merging their results in order."""
+
+    def __init__(self, *, req, reqs):
+        super().__init__(service=req.service, reqs=reqs, options=req.options)
+        self._iterate = req._iterate
+
+    def parse(self, data):
+        return chain.from_iterable(data)
+
+
 class _BasePagedRequest(Request):
 
     # total results parameter key for a related service query
     _total_key = None
 
+    # result pages are parsed while they're streamed so they skip the HTTP cache
+    _cacheable = False
+
     def __init__(self, **kw):
         super().__init__(**kw)
 
@@ -208,8 +337,6 @@ class _BasePagedRequest(Request):
 
         # Total number of potential elements to request, some services don't
         # return the number of matching elements so this is optional.
-        # TODO: For services that return total number of matches on the first
-        # request, send the remaining requests asynchronously.
         self._total = None
 
     def parse(self, data):
@@ -227,9 +354,21 @@ class _BasePagedRequest(Request):
         try:
             while True:
                 data = self.service.send(self)
+                seen = self._seen
                 for x in data:
                     self._seen += 1
                     yield x
+
+                # send all remaining page requests in parallel if possible
+                reqs = self.remaining_pages(self._seen - seen)
+                if reqs is not None:
+                    if reqs:
+                        for data in self.service.send(list(reqs)):
+                            for x in data:
+                                self._seen += 1
+                                yield x
+                    return
+
                 self.next_page()
         except StopIteration:
             return
@@ -238,8 +377,23 @@ class _BasePagedRequest(Request):
         """Modify a request in order to grab the next page of results."""
         raise StopIteration
 
+    def remaining_pages(self, size):
+        """Return requests for all remaining pages of results.
+
+        This is only possible for services that return the total number of
+        matches, otherwise None is returned and pages are requested serially
+        via next_page().
+        """
+        return None
+
+    def _page_request(self, **params):
+        """Create a request for a different page of results."""
+        req = copy(self)
+        req.params.update(params)
+        req._finalized = False
+        return req
+
 
-# TODO: run these asynchronously
 class PagedRequest(_BasePagedRequest):
     """Keep requesting matching records until all relevant results are returned."""
 
@@ -258,6 +412,7 @@ class PagedRequest(_BasePagedRequest):
         if limit is not None:
             self.params[self._size_key] = limit
             self.options.append(f'Limit: {limit}')
+        self._limit = limit
 
         if page is not None:
             self.params[self._page_key] = page
@@ -271,14 +426,31 @@ class PagedRequest(_BasePagedRequest):
         super()._finalize()
 
     def next_page(self):
-        # if no more results exist, stop requesting them
-        if self._total is None or self._seen >= self._total:
+        # if no more results exist or the search is limited, stop requesting them
+        if self._limit is not None or self._total is None or self._seen >= self._total:
             raise StopIteration
 
         # increment page param
         self.params[self._page_key] += 1
         self._finalized = False
 
+    def remaining_pages(self, size):
+        if self._total is None:
+            return None
+        # only the first page of results is returned for limited searches
+        if self._limit is not None:
+            return ()
+
+        # pages are indexed using the requested page size if it's known
+        size = self.params.get(self._size_key, size)
+        if not size:
+            return ()
+
+        page = self.params[self._page_key]
+        last_page = self._start_page + -(-self._total // size) - 1
+        return tuple(
+            self._page_request(**{self._page_key: x}) for x in range(page + 1, last_page + 1))
+
 
 # TODO: run these asynchronously
 class FlaggedPagedRequest(_BasePagedRequest):
@@ -323,7 +495,6 @@ class FlaggedPagedRequest(_BasePagedRequest):
         self._finalized = False
 
 
-# TODO: run these asynchronously
 class OffsetPagedRequest(_BasePagedRequest):
     """Keep requesting matching records until all relevant results are returned."""
 
@@ -341,9 +512,13 @@ class OffsetPagedRequest(_BasePagedRequest):
         if limit is not None:
             self.params[self._size_key] = limit
             self.options.append(f'Limit: {limit}')
+        self._limit = limit
         if offset is not None:
             self.params[self._offset_key] = offset
 
+        # initial result offset
+        self._offset = offset if offset is not None else 0
+
         # total number of elements parsed at previous paged request
         self._prev_seen = 0
 
@@ -352,18 +527,79 @@ class OffsetPagedRequest(_BasePagedRequest):
             self.params[self._size_key] = self.service.max_results
         super()._finalize()
 
+    def send(self):
+        """Send a request object to the related service."""
+        if self._total_key is None and self.service.prefetch > 0:
+            size = self.service.max_results
+            # only prefetch when continued requests are made using full pages
+            if size and self._limit is None and self.params.get(self._size_key, size) == size:
+                yield from self._send_prefetched(size, self.service.prefetch)
+                return
+        yield from super().send()
+
+    def _send_prefetched(self, size, depth):
+        """Request upcoming pages while the current one is being consumed.
+
+        Since the total number of results is unknown, pages are speculatively
+        requested until a short page marks the end of the results. Any pending
+        requests past that point are cancelled or have their results discarded.
+        """
+        offset = self._offset
+        pages = deque()
+        # Pages are sent from a separate pool since sending blocks on jobs
+        # queued to the service's executor, running them from the same pool
+        # could tie up all its workers waiting on each other.
+        executor = ThreadPoolExecutor(max_workers=depth + 1)
+        try:
+            while True:
+                while len(pages) <= depth:
+                    req = self._page_request(**{self._offset_key: offset})
+                    pages.append(executor.submit(self.service.send, req))
+                    offset += size
+
+                seen = self._seen
+                for x in pages.popleft().result():
+                    self._seen += 1
+                    yield x
+
+                # no more results exist, stop requesting them
+                if self._seen - seen < size:
+                    break
+        finally:
+            for future in pages:
+                future.cancel()
+            executor.shutdown(wait=False)
+
     def next_page(self):
         seen = self._seen - self._prev_seen
 
-        # no more results exist, stop requesting them
-        if self.service.max_results is None or seen < self.service.max_results:
+        # no more results exist or the search is limited, stop requesting them
+        if (self._limit is not None or self.service.max_results is None or
+                seen < self.service.max_results):
             raise StopIteration
 
         # set offset and send new request
         self._prev_seen = self._seen
-        self.params[self._offset_key] = self._seen
+        self.params[self._offset_key] = self._offset + self._seen
         self._finalized = False
 
+    def remaining_pages(self, size):
+        if self._total is None:
+            return None
+        # only the first page of results is returned for limited searches
+        if self._limit is not None:
+            return ()
+
+        # Use the number of results returned in the first page as the page
+        # size since services often cap it below the requested amount.
+        start = self._offset + self._seen
+        if not size or start >= self._total:
+            return ()
+
+        return tuple(
+            self._page_request(**{self._offset_key: offset})
+            for offset in range(start, self._total, size))
+
 
 # TODO: run these asynchronously
 class LinkPagedRequest(_BasePagedRequest):
@@ -19,6 +19,11 @@ class RESTRequest(URLRequest):
         super().__init__(**kw)
         self.data = {}
 
+    def __copy__(self):
+        req = super().__copy__()
+        req.data = self.data.copy()
+        return req
+
     def params_to_data(self):
         """Convert params to encoded request data."""
         self.data.update(self.params)
@@ -21,6 +21,11 @@ class Rpc(Service):
     def multicall(self, **kw):
         return Multicall(service=self, **kw)
 
+    def _endpoint(self, req):
+        # all requests use the same URL so include the called method
+        method = self._decode_request(req)[0]
+        return f'{super()._endpoint(req)} {method}'
+
     def merged_multicall(self, *, reqs, **kw):
         return MergedMulticall(reqs=reqs, service=self, **kw)
 
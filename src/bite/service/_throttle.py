@@ -0,0 +1,156 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import threading
+import time
+from urllib.parse import urlparse
+
+
+def retry_after(response):
+    """Return the number of seconds a response asks clients to wait, if any."""
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max((date - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+class TokenBucket(object):
+    """Token bucket limiting the rate of requests.
+
+    Tokens are refilled at the given rate per second up to the burst size,
+    with each request consuming a single token.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError(f'invalid rate: {rate!r}')
+        if burst is not None and burst < 1:
+            raise ValueError(f'invalid burst: {burst!r}')
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveConcurrency(object):
+    """Concurrency limit controlled using additive increase, multiplicative decrease.
+
+    The limit is halved when the service signals it's overloaded and is
+    increased by roughly one request per round trip when responses are
+    successful and not noticeably slower than usual.
+    """
+
+    # status codes signaling the service is throttling requests
+    throttled = frozenset((429, 503))
+
+    def __init__(self, limit, min_limit=1):
+        self.max_limit = limit
+        self.min_limit = min(min_limit, limit)
+        self.limit = float(limit)
+        self._active = 0
+        self._paused_until = 0
+        self._decreased = 0
+        # smoothed response time for successful requests
+        self._latency = None
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Block until a request is allowed to be sent."""
+        with self._cond:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    self._cond.wait(pause)
+                elif self._active >= int(self.limit):
+                    self._cond.wait()
+                else:
+                    self._active += 1
+                    return
+
+    def release(self, response=None):
+        """Release a request slot, adjusting the limit based on its response."""
+        with self._cond:
+            self._active -= 1
+            if response is not None:
+                self._update(response)
+            self._cond.notify_all()
+
+    def _update(self, response):
+        delay = retry_after(response)
+        if response.status_code in self.throttled or (delay is not None and not response.ok):
+            # only back off once for responses to requests sent concurrently
+            now = time.monotonic()
+            if now - self._decreased >= (self._latency or 0):
+                self.limit = max(self.min_limit, self.limit / 2)
+                self._decreased = now
+            if delay:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        elif 200 <= response.status_code < 300:
+            elapsed = response.elapsed.total_seconds()
+            if self._latency is None:
+                self._latency = elapsed
+            fast = elapsed <= self._latency * 2
+            self._latency = self._latency * 0.8 + elapsed * 0.2
+            if fast:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+class RequestPolicy(object):
+    """Policy controlling the rate and concurrency of requests per host."""
+
+    def __init__(self, concurrent, rate_limit=None, rate_burst=None, adaptive=True):
+        self.concurrent = concurrent
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self.adaptive = adaptive
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url):
+        url = urlparse(url)
+        key = (url.scheme, url.netloc)
+        with self._lock:
+            try:
+                return self._hosts[key]
+            except KeyError:
+                bucket = TokenBucket(self.rate_limit, self.rate_burst) if self.rate_limit else None
+                controller = AdaptiveConcurrency(self.concurrent) if self.adaptive else None
+                self._hosts[key] = (bucket, controller)
+                return self._hosts[key]
+
+    def acquire(self, url):
+        """Block until a request to the given URL is allowed to be sent."""
+        bucket, controller = self._host(url)
+        if controller is not None:
+            controller.acquire()
+        if bucket is not None:
+            bucket.acquire()
+
+    def release(self, url, response=None):
+        """Mark a request to the given URL as finished."""
+        bucket, controller = self._host(url)
+        if controller is not None:
+            controller.release(response)
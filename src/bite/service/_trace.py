@@ -0,0 +1,137 @@
+from collections import defaultdict
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class Hooks(object):
+    """Request lifecycle hooks run by a service.
+
+    Subclasses override the events they're interested in. Hooks are run from
+    the threads sending requests so implementations must be thread-safe.
+    """
+
+    def on_request_start(self, req, queued):
+        """An HTTP request started being sent after waiting queued for a number of seconds."""
+
+    def on_response(self, req, response):
+        """The response headers for an HTTP request were received."""
+
+    def on_request_done(self, req, error=None):
+        """The response for an HTTP request was downloaded and decoded, or the request failed."""
+
+    def on_parse_done(self, req, elapsed):
+        """Parsing a request's results finished after taking a number of seconds."""
+
+
+def timed(iterable, callback):
+    """Iterate over an iterable, passing the total time spent pulling items to a callback."""
+    elapsed = 0
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            elapsed += time.perf_counter() - start
+            break
+        elapsed += time.perf_counter() - start
+        yield item
+    callback(elapsed)
+
+
+def _percentile(values, percent):
+    """Return the nearest-rank percentile of sorted values."""
+    index = max(0, -(-len(values) * percent // 100) - 1)
+    return values[int(index)]
+
+
+class Tracer(Hooks):
+    """Collect request timings as Chrome trace events.
+
+    The resulting trace can be loaded in chrome://tracing or Perfetto to view
+    the timeline of requests while summaries show the latency per endpoint.
+    """
+
+    def __init__(self, endpoint=None):
+        self._endpoint = endpoint if endpoint is not None else self._default_endpoint
+        self._origin = time.perf_counter()
+        self._events = []
+        self._active = {}
+        self._latency = defaultdict(list)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _default_endpoint(req):
+        return f'{req.method} {urlparse(req.url).path}'
+
+    def _ts(self, t):
+        """Convert a performance counter value to microseconds since tracing started."""
+        return round((t - self._origin) * 1e6, 3)
+
+    def _event(self, name, start, end, cat='request', **args):
+        self._events.append({
+            'name': name, 'cat': cat, 'ph': 'X', 'pid': os.getpid(),
+            'tid': threading.get_ident(), 'ts': self._ts(start),
+            'dur': round((end - start) * 1e6, 3), 'args': args,
+        })
+
+    def on_request_start(self, req, queued):
+        now = time.perf_counter()
+        with self._lock:
+            if queued:
+                self._event('queued', now - queued, now, cat='queue')
+            self._active[(threading.get_ident(), id(req))] = [now, None, None]
+
+    def on_response(self, req, response):
+        with self._lock:
+            state = self._active.get((threading.get_ident(), id(req)))
+            if state is not None:
+                state[1] = time.perf_counter()
+                state[2] = response.status_code
+
+    def on_request_done(self, req, error=None):
+        now = time.perf_counter()
+        endpoint = self._endpoint(req)
+        with self._lock:
+            state = self._active.pop((threading.get_ident(), id(req)), None)
+            if state is None:
+                return
+            start, headers, status = state
+            args = {'url': req.url, 'status': status}
+            if error is not None:
+                args['error'] = str(error)
+            self._event(endpoint, start, now, **args)
+            if headers is not None:
+                self._event('wait', start, headers, cat='network')
+                self._event('download', headers, now, cat='network')
+            self._latency[endpoint].append(now - start)
+
+    def on_parse_done(self, req, elapsed):
+        now = time.perf_counter()
+        name = f'parse {req.__class__.__name__}' if req is not None else 'parse'
+        with self._lock:
+            self._event(name, now - elapsed, now, cat='parse')
+
+    def write(self, path):
+        """Write the collected trace events to a file in the Chrome trace format."""
+        with self._lock:
+            data = {'traceEvents': list(self._events), 'displayTimeUnit': 'ms'}
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+    def summary(self):
+        """Generate lines summarizing request latency per endpoint."""
+        with self._lock:
+            latency = {k: sorted(v) for k, v in self._latency.items()}
+        if not latency:
+            return
+        width = max(len('endpoint'), *(len(x) for x in latency))
+        yield f"{'endpoint':<{width}}  {'count':>5}  {'p50':>8}  {'p95':>8}  {'total':>8}"
+        for endpoint, values in sorted(latency.items(), key=lambda x: -sum(x[1])):
+            yield (
+                f'{endpoint:<{width}}  {len(values):>5}  '
+                f'{_percentile(values, 50):>7.3f}s  {_percentile(values, 95):>7.3f}s  '
+                f'{sum(values):>7.3f}s')
@@ -50,12 +50,21 @@ class Bugzilla(Service):
     attachment = BugzillaAttachment
     attachment_endpoint = '/attachment.cgi?id={id}'
 
+    # pull closed bugs as well when syncing the local store
+    sync_params = {'status': ['all']}
+
     def __init__(self, max_results=None, **kw):
         # most bugzilla instances default to 10k results per req
         if max_results is None:
             max_results = 10000
         super().__init__(max_results=max_results, **kw)
 
+    @property
+    def attachment_downloads(self):
+        # attachment.cgi doesn't support API key or token auth so private
+        # attachments can only be pulled inline when logged in
+        return not self.auth
+
     @property
     def cache_updates(self):
         """Pull latest data from service for cache update."""
@@ -1,5 +1,7 @@
 """Generic support for Bugzilla's RPC interfaces."""
 
+from copy import copy
+
 from . import Bugzilla, Bugzilla5_0, Bugzilla5_2
 from .reqs import (
     SearchRequest4_4, SearchRequest5_0, ChangesRequest, CommentsRequest,
@@ -7,8 +9,8 @@ from .reqs import (
     AttachRequest, CreateRequest, ExtensionsRequest, VersionRequest, FieldsRequest,
     ProductsRequest, UsersRequest,
 )
-from .._reqs import req_cmd
-from .._rpc import RPCRequest
+from .._reqs import BaseGetRequest, NullRequest, req_cmd
+from .._rpc import Multicall, RPCRequest
 
 
 class Bugzilla4_4Rpc(Bugzilla):
@@ -17,6 +19,12 @@ class Bugzilla4_4Rpc(Bugzilla):
     API docs: https://www.bugzilla.org/docs/4.4/en/html/api/Bugzilla/WebService.html
     """
 
+    def __init__(self, multicall_size=None, **kw):
+        # Max payload size in bytes for batched calls, batching is disabled by
+        # default since not all servers support system.multicall.
+        self.multicall_size = multicall_size if multicall_size is not None else 0
+        super().__init__(**kw)
+
 
 class Bugzilla5_0Rpc(Bugzilla4_4Rpc, Bugzilla5_0):
     """Support bugzilla 5.0 RPC calls."""
@@ -122,6 +130,106 @@ class _AttachmentsRequest(AttachmentsRequest, RPCRequest):
         super().__init__(command='Bug.attachments', **kw)
 
 
+@req_cmd(Bugzilla4_4Rpc, cmd='get')
+class _GetRequest(BaseGetRequest):
+    """Construct a get request.
+
+    If a multicall size is set, the item, comments, attachments, and changes
+    calls for the requested IDs are batched together into system.multicall
+    requests, split into chunks of IDs so the payload of each request stays
+    under the size limit. Batched requests fail on the first invalid ID since
+    their faults are returned alongside the items of valid IDs.
+    """
+
+    def __init__(self, **kw):
+        super().__init__(**kw)
+        if self.service.multicall_size:
+            self._reqs = tuple(
+                _MulticallGetRequest(reqs=reqs, service=self.service)
+                for reqs in self._chunks(self._reqs))
+
+    def _chunks(self, reqs):
+        """Split calls into groups for the same chunk of IDs."""
+        length = len(reqs[0].params['ids'])
+        # estimate the payload size per ID from the full and single ID requests
+        size = self._size(reqs)
+        base = self._size([self._chunk(r, slice(0, 1)) for r in reqs])
+        id_size = (size - base) / (length - 1) if length > 1 else size
+        limit = self.service.multicall_size
+        chunk_size = max(1, int((limit - base) // id_size) + 1)
+        i = 0
+        while i < length:
+            chunk = [self._chunk(r, slice(i, i + chunk_size)) for r in reqs]
+            # IDs lengthen as they increase so shrink chunks exceeding the estimate
+            size = self._size(chunk)
+            while size > limit and chunk_size > 1:
+                chunk_size = max(1, min(chunk_size - 1, int(chunk_size * limit / size)))
+                chunk = [self._chunk(r, slice(i, i + chunk_size)) for r in reqs]
+                size = self._size(chunk)
+            yield chunk
+            i += chunk_size
+
+    def _size(self, reqs):
+        return len(_MulticallGetRequest(reqs=reqs, service=self.service).encode())
+
+    def _chunk(self, req, ids):
+        """Copy a call to only request the given slice of IDs."""
+        if isinstance(req, NullRequest):
+            return req
+        req = copy(req)
+        req.params['ids'] = req.params['ids'][ids]
+        if getattr(req, 'ids', None) is not None:
+            req.ids = req.ids[ids]
+        return req
+
+    def parse(self, data):
+        if not self.service.multicall_size:
+            yield from super().parse(data)
+        else:
+            for items in data:
+                yield from items
+
+
+class _MulticallGetRequest(Multicall):
+    """Construct a system.multicall request for a chunk of get request calls."""
+
+    def __init__(self, reqs, **kw):
+        self.reqs = reqs
+        # skip null requests for data that wasn't requested
+        self.calls = [r for r in reqs if not isinstance(r, NullRequest)]
+        super().__init__(
+            command=[r.command for r in self.calls],
+            params=[(r.params,) for r in self.calls], **kw)
+
+    def _finalize(self):
+        self._finalized = True
+        # authentication is injected into each call instead of the multicall
+        if not self.service.authenticated and self.service.auth:
+            self.params = [
+                (self.service.inject_auth(self._req, dict(p))[1],) for p, in self.params]
+        self._req.data = self.encode()
+
+    def encode(self):
+        """Encode the data body of the request."""
+        return self.service._encode_request(self.command, self.encode_params())
+
+    def parse(self, data):
+        data = iter(super().parse(data))
+        results = [None if isinstance(r, NullRequest) else next(data) for r in self.reqs]
+        # faults for invalid IDs aren't caught when parsing batched responses
+        faults = results[0].get('faults')
+        if faults:
+            self.service.handle_error(code=faults[0]['faultCode'], msg=faults[0]['faultString'])
+        items, comments, attachments, changes = (
+            r._none_gen if isinstance(r, NullRequest) else r.parse(x)
+            for r, x in zip(self.reqs, results))
+        for item in items:
+            item.comments = next(comments)
+            item.attachments = next(attachments)
+            item.changes = next(changes)
+            yield item
+
+
 @req_cmd(Bugzilla4_4Rpc)
 class _GetItemRequest(GetItemRequest, RPCRequest):
     def __init__(self, **kw):
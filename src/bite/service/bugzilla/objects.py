@@ -6,14 +6,23 @@ import string
 from dateutil.parser import parse as dateparse
 from snakeoil.osutils import sizeof_fmt
 
-from ... import utc, const
-from ...objects import Item, Change, Comment, Attachment, decompress
+from ... import utc, const, rfc3339
+from ...objects import Item, Change, Comment, Attachment, compact, decompress, obj_attrs
 from ...utils import nonstring_iterable
 
 
+# unknown fields matching this are assumed to be timestamps
+_timestamp_re = re.compile(r'^\d\d\d\d-\d\d-\d\dT\d\d:\d\d:\d\dZ$')
+
+
 def parsetime(time):
     if not isinstance(time, datetime.datetime):
-        return dateparse(str(time))
+        time = str(time)
+        try:
+            return rfc3339.parse_utc_datetime(time)
+        except ValueError:
+            # fallback for non-RFC 3339 formats, e.g. XML-RPC datetimes
+            return dateparse(time)
     else:
         return time.replace(tzinfo=utc.utc)
 
@@ -21,6 +30,8 @@ def parsetime(time):
 class BugzillaBug(Item):
     """Bugzilla bug object."""
 
+    __slots__ = ('service',)
+
     attributes = {
         'actual_time': 'Actual time',
         'alias': 'Alias',
@@ -118,8 +129,20 @@ class BugzillaBug(Item):
 
     type = 'bug'
 
+    # known fields that hold timestamps
+    _time_fields = frozenset(['creation_time', 'last_change_time'])
+
+    # known fields with values from small sets that are repeated across bugs
+    _compact_fields = frozenset([
+        'status', 'resolution', 'product', 'component', 'classification',
+        'version', 'target_milestone', 'priority', 'severity', 'platform',
+        'op_sys', 'keywords',
+    ])
+
     def __init__(self, service, **kw):
         self.service = service
+        # strip service suffixes once instead of on every attribute access
+        desuffix = service is not None and service.suffix is not None
 
         for k, v in kw.items():
             if not v or v == '---':
@@ -127,16 +150,51 @@ class BugzillaBug(Item):
                 continue
             elif v == 'flags':
                 self.flags = [flag['name'] for flag in kw['flags']]
-            elif k in ['creation_time', 'last_change_time']:
+            elif k in self._time_fields:
+                setattr(self, k, parsetime(v))
+            elif k not in self.attributes and isinstance(v, str) and _timestamp_re.match(v):
+                # custom fields aren't known in advance so check their values
                 setattr(self, k, parsetime(v))
             else:
-                if isinstance(v, str) and re.match(r'^\d\d\d\d-\d\d-\d\dT\d\d:\d\d:\d\dZ$', v):
-                    setattr(self, k, parsetime(v))
+                if k in self._compact_fields:
+                    v = compact(v)
+                if desuffix:
+                    self._set_desuffixed(k, v)
                 else:
                     setattr(self, k, v)
 
+    def _set_desuffixed(self, k, v):
+        """Set a field value with the service suffix removed, saving the raw value."""
+        if k == 'cc' and isinstance(v, list):
+            value = list(map(self.service._desuffix, v))
+        elif isinstance(v, str):
+            value = self.service._desuffix(v)
+        else:
+            value = v
+
+        if value != v:
+            try:
+                self._raw[k] = v
+            except AttributeError:
+                self._raw = {k: v}
+        setattr(self, k, value)
+
+    def raw(self, name):
+        """Return a field value as it was returned by the service."""
+        try:
+            return self._raw[name]
+        except (AttributeError, KeyError):
+            return getattr(self, name)
+
+    # mapping access uses raw values, e.g. when passing items to requests
+    def __getitem__(self, key):
+        try:
+            return self._raw[key]
+        except (AttributeError, KeyError):
+            return super().__getitem__(key)
+
     def _custom_str_fields(self):
-        custom_fields = ((k, v) for (k, v) in vars(self).items()
+        custom_fields = ((k, v) for (k, v) in obj_attrs(self).items()
                          if re.match(r'^cf_\w+$', k))
         for k, v in custom_fields:
             title = string.capwords(k[3:], '_')
@@ -155,19 +213,12 @@ class BugzillaBug(Item):
                 value = value[0]
             yield f'{title:<12}: {value}'
 
-    def __getattribute__(self, name):
-        value = object.__getattribute__(self, name)
-        if name == 'cc' and isinstance(value, list):
-            return list(map(self.service._desuffix, value))
-        elif isinstance(value, str):
-            return self.service._desuffix(value)
-        else:
-            return value
-
 
 class BugzillaComment(Comment):
     """Bugzilla comment object."""
 
+    __slots__ = ('comment_id',)
+
     def __init__(self, comment, id, count, rest=False, **kw):
         self.comment_id = comment['id']
 
@@ -205,6 +256,8 @@ class BugzillaComment(Comment):
 class BugzillaEvent(Change):
     """Bugzilla change object."""
 
+    __slots__ = ('alias',)
+
     change_aliases = {
         'attachment-description': 'attachments.description',
         'attachment-filename': 'attachments.filename',
@@ -264,8 +317,10 @@ class BugzillaEvent(Change):
             created = parsetime(change['when'])
         changes = {}
         for c in change['changes']:
-            field = c['field_name']
+            field = compact(c['field_name'])
             removed, added = c['removed'], c['added']
+            if field in BugzillaBug._compact_fields:
+                removed, added = compact(removed), compact(added)
             removed = self._change_map.get(removed, removed)
             added = self._change_map.get(added, added)
             change = (removed, added)
@@ -313,8 +368,8 @@ class BugzillaEvent(Change):
 class BugzillaAttachment(Attachment):
     """Bugzilla attachment object."""
 
-    def __init__(self, id, file_name, size=None, content_type=None,
-                 data=None, creator=None, creation_time=None, last_change_time=None, **kw):
+    def __init__(self, id, file_name, size=None, content_type=None, data=None, creator=None,
+                 creation_time=None, last_change_time=None, service=None, **kw):
 
         if creation_time is not None:
             creation_time = parsetime(creation_time)
@@ -327,6 +382,7 @@ class BugzillaAttachment(Attachment):
         super().__init__(
             id=id, filename=file_name, size=size, mimetype=content_type,
             data=data, creator=creator, created=creation_time, modified=last_change_time)
+        self.service = service
 
     def __str__(self):
         if self.size is not None:
@@ -337,3 +393,30 @@ class BugzillaAttachment(Attachment):
     @decompress
     def read(self):
         return base64.b64decode(self.data)
+
+    def write(self, path):
+        # download attachments from the service when their data wasn't requested
+        if self.data is None and self.service is not None:
+            url, = self.service.attachment_urls([self.id])
+            return self.service.download(url, path)
+        return super().write(path)
+
+    def iter_content(self, chunk_size=None):
+        """Iterate over the raw attachment data, decoding it from base64 in chunks."""
+        chunk_size = chunk_size if chunk_size is not None else self._chunk_size
+        data = self.data
+        # encoded size of the requested chunk size
+        step = max(chunk_size // 3, 1) * 4
+        pending = b''
+        for i in range(0, len(data), step):
+            chunk = data[i:i + step]
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            # only decode complete groups of four characters, ignoring line breaks
+            chunk = pending + chunk.translate(None, b' \t\r\n')
+            end = len(chunk) - len(chunk) % 4
+            pending = chunk[end:]
+            if end:
+                yield base64.b64decode(chunk[:end])
+        if pending:
+            yield base64.b64decode(pending)
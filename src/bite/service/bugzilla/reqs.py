@@ -7,12 +7,12 @@ from snakeoil.klass import aliased, alias
 from . import Bugzilla
 from .objects import BugzillaEvent, BugzillaComment
 from .._reqs import (
-    OffsetPagedRequest, Request, ParseRequest, req_cmd,
+    OffsetPagedRequest, Request, IDsRequest, ParseRequest, req_cmd,
     BaseGetRequest, BaseCommentsRequest, BaseChangesRequest,
 )
 from ... import const, magic
 from ...exceptions import BiteError
-from ...objects import TimeInterval
+from ...objects import MAGIC_PREFIX_SIZE, TimeInterval
 
 
 @req_cmd(Bugzilla, cmd='get')
@@ -288,7 +288,7 @@ class SearchRequest5_0(SearchRequest4_4):
                     self.params[k] = v if len(v) > 1 else v[0]
 
 
-class ChangesRequest(BaseChangesRequest, ParseRequest):
+class ChangesRequest(IDsRequest, BaseChangesRequest, ParseRequest):
     """Construct a changes request."""
 
     def parse(self, data):
@@ -310,7 +310,7 @@ class ChangesRequest(BaseChangesRequest, ParseRequest):
             self.options.append(f'{k.capitalize()}: {v} or later')
 
 
-class CommentsRequest(BaseCommentsRequest, ParseRequest):
+class CommentsRequest(IDsRequest, BaseCommentsRequest, ParseRequest):
     """Construct a comments request."""
 
     def parse(self, data):
@@ -340,7 +340,7 @@ class CommentsRequest(BaseCommentsRequest, ParseRequest):
             self.params['include_fields'] = v
 
 
-class AttachmentsRequest(Request):
+class AttachmentsRequest(IDsRequest):
     """Construct an attachments request."""
 
     def __init__(self, ids=None, attachment_ids=None, fields=None,
@@ -365,19 +365,32 @@ class AttachmentsRequest(Request):
 
         self.ids = ids
         self.attachment_ids = attachment_ids
+        self._get_data = get_data
+
+    def _request_ids(self):
+        # attachment IDs are returned together after all bug IDs so requests
+        # including them aren't split
+        if self._init_kw.get('attachment_ids') is not None:
+            return None
+        return super()._request_ids()
+
+    def _attachment(self, data):
+        # attachments without inline data can be downloaded from the service
+        service = None if self._get_data else self.service
+        return self.service.attachment(service=service, **data)
 
     def parse(self, data):
         if self.ids:
             bugs = data['bugs']
             for i in self.ids:
-                yield tuple(self.service.attachment(**attachment) for attachment in bugs[str(i)])
+                yield tuple(self._attachment(attachment) for attachment in bugs[str(i)])
 
         if self.attachment_ids:
             attachments = data['attachments']
             files = []
             try:
                 for i in self.attachment_ids:
-                    files.append(self.service.attachment(**attachments[str(i)]))
+                    files.append(self._attachment(attachments[str(i)]))
             except KeyError:
                 raise BiteError(f'invalid attachment ID: {i}')
             yield tuple(files)
@@ -546,7 +559,7 @@ class AttachRequest(Request):
 
         if mimetype is None and not is_patch:
             if data is not None:
-                mimetype = magic.from_buffer(data, mime=True)
+                mimetype = magic.from_buffer(data[:MAGIC_PREFIX_SIZE], mime=True)
             else:
                 mimetype = magic.from_file(filepath, mime=True)
 
@@ -625,7 +638,7 @@ class CreateRequest(ParseRequest):
             self.params[k] = v
 
 
-class GetItemRequest(Request):
+class GetItemRequest(IDsRequest):
     """Construct an item retrieval request."""
 
     def __init__(self, ids, fields=None, **kw):
@@ -19,8 +19,8 @@ class _BugzillaRestBase(Bugzilla5_0, JsonREST):
     def __init__(self, **kw):
         super().__init__(endpoint='/rest', **kw)
 
-    def parse_response(self, response):
-        data = super().parse_response(response)
+    def parse_response(self, response, **kw):
+        data = super().parse_response(response, **kw)
         if 'error' not in data:
             return data
         else:
@@ -82,6 +82,10 @@ class _SearchRequest5_0(SearchRequest5_0, RESTRequest):
     def __init__(self, **kw):
         super().__init__(endpoint='/bug', **kw)
 
+    def parse_response(self, response):
+        # decode bugs as they're received instead of after the entire response
+        return self.service.parse_response(response, stream='bugs')
+
 
 @req_cmd(Bugzilla5_0Rest, cmd='changes')
 class _ChangesRequest(ChangesRequest, RESTRequest):
@@ -41,3 +41,7 @@ class BugzillaAttachmentXml(BugzillaAttachment):
     @decompress
     def read(self):
         return self.data.data
+
+    def iter_content(self, chunk_size=None):
+        # data is already decoded from base64 when parsing responses
+        return super(BugzillaAttachment, self).iter_content(chunk_size)
@@ -179,8 +179,8 @@ class Jira(JsonREST):
     def inject_auth(self, request, params):
         raise NotImplementedError
 
-    def parse_response(self, response):
-        data = super().parse_response(response)
+    def parse_response(self, response, **kw):
+        data = super().parse_response(response, **kw)
         if 'errorMessages' not in data:
             return data
         else:
@@ -202,6 +202,10 @@ class _SearchRequest(QueryParseRequest, JiraPagedRequest):
         # use POST requests to avoid URL length issues with massive JQL queries
         super().__init__(endpoint='/search', method='POST', **kw)
 
+    def parse_response(self, response):
+        # decode issues as they're received instead of after the entire response
+        return self.service.parse_response(response, stream='issues')
+
     def parse(self, data):
         data = super().parse(data)
         issues = data['issues']
@@ -77,10 +77,42 @@ class LaunchpadComment(Comment):
 
 class LaunchpadAttachment(Attachment):
 
-    def __init__(self, data_link, self_link, message_link, title, data=None, **kw):
+    def __init__(self, data_link, self_link, message_link, title, data=None, service=None, **kw):
         super().__init__(id=self_link.rsplit('/', 1)[1], filename=title, data=data)
         self.comment = message_link.rsplit('/', 1)[1]
         self.data_link = data_link
+        # data is requested from the service on first use
+        self.service = service
+
+    def _content_type(self, response):
+        """Use the content type returned with the attachment data if it's specific."""
+        mimetype = response.headers.get('Content-Type', '').split(';')[0].strip()
+        if mimetype and mimetype != 'application/octet-stream':
+            self.mimetype = mimetype
+
+    def read(self, raw=False):
+        if self.data is None and self.service is not None:
+            with self.service.stream(self.data_link) as response:
+                self.data = response.content
+                self._content_type(response)
+            # only detect the type from the data when the service omits it
+            self._sniff = self.mimetype is None
+        return super().read(raw=raw)
+
+    def write(self, path):
+        if self.data is None and self.service is not None:
+            return self.service.download(self.data_link, path)
+        return super().write(path)
+
+    def iter_content(self, chunk_size=None):
+        """Iterate over the raw attachment data, streaming it from the service if required."""
+        if self.data is None and self.service is not None:
+            chunk_size = chunk_size if chunk_size is not None else self._chunk_size
+            with self.service.stream(self.data_link) as response:
+                self._content_type(response)
+                yield from response.iter_content(chunk_size)
+        else:
+            yield from super().iter_content(chunk_size)
 
 
 class LaunchpadEvent(Change):
@@ -414,16 +446,9 @@ class _AttachmentsRequest(Request):
         for attachments in data:
             if self.ids:
                 attachments = attachments['entries']
-            if self._get_data:
-                reqs = tuple(Request(
-                    service=self.service, method='GET', url=x['data_link'], raw=True)
-                    for x in attachments)
-                content = Request(
-                    service=self.service, reqs=reqs, raw=True).send(allow_redirects=True)
-            else:
-                content = self._none_gen
-            yield tuple(self.service.attachment(data=c, **a)
-                        for a, c in zip(attachments, content))
+            # attachment data is streamed from the service when it's used
+            service = self.service if self._get_data else None
+            yield tuple(self.service.attachment(service=service, **a) for a in attachments)
 
 
 @req_cmd(Launchpad, cmd='get')
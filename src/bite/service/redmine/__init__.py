@@ -4,13 +4,11 @@ API docs:
     - https://www.redmine.org/projects/redmine/wiki/Rest_api
 """
 
-from itertools import chain
-
 from dateutil.parser import parse as dateparse
 from snakeoil.klass import aliased, alias
 
 from .._reqs import (
-    OffsetPagedRequest, Request, req_cmd,
+    OffsetPagedRequest, IDsRequest, req_cmd,
     BaseCommentsRequest, QueryParseRequest,
 )
 from .._rest import REST, RESTRequest
@@ -104,7 +102,7 @@ class Redmine(REST):
     item = RedmineIssue
     item_endpoint = '/issues/{id}'
 
-    def __init__(self, base, max_results=None, **kw):
+    def __init__(self, base, max_results=None, max_ids=None, **kw):
         try:
             api_base, project = base.split('/projects/', 1)
         except ValueError as e:
@@ -113,7 +111,10 @@ class Redmine(REST):
         # most redmine instances default to 100 results per query
         if max_results is None:
             max_results = 100
-        super().__init__(base=base, max_results=max_results, **kw)
+        # requests for more IDs tend to cause HTTP 500s due to URL length
+        if max_ids is None:
+            max_ids = 100
+        super().__init__(base=base, max_results=max_results, max_ids=max_ids, **kw)
 
         self._project = project
         self.webbase = api_base
@@ -139,7 +140,7 @@ class RedminePagedRequest(OffsetPagedRequest, RESTRequest):
 
 
 @req_cmd(Redmine)
-class _GetItemRequest(QueryParseRequest, RedminePagedRequest):
+class _GetItemRequest(IDsRequest, QueryParseRequest, RedminePagedRequest):
     """Construct an issue request."""
 
     def __init__(self, *, service, ids=None, searchreq=False, get_desc=True,
@@ -157,21 +158,20 @@ class _GetItemRequest(QueryParseRequest, RedminePagedRequest):
         # Slice request into pieces if it gets too long otherwise we get
         # HTTP 500s due to URL length. Note that this means sorting won't
         # work for large queries.
-        if self._ids and len(self._ids) > 100:
-            ids = list(self._ids)
-            reqs = []
-            while ids:
-                req = self.__class__(service=self.service, get_desc=self._get_desc, sliced=True)
-                req.params = dict(self.params)
-                req.params['issue_id'] = ','.join(ids[:100])
-                reqs.append(req)
-                ids = ids[100:]
-            combined_req = Request(service=self.service, reqs=reqs)
-            items = chain.from_iterable(combined_req.send(**kw))
-        else:
-            items = super().send(**kw)
-
-        return items
+        req = self.split()
+        if req is not self:
+            return req.send(**kw)
+        return super().send(**kw)
+
+    def _request_ids(self):
+        return self._ids
+
+    def _chunk(self, ids):
+        req = self.__class__(service=self.service, get_desc=self._get_desc, sliced=True)
+        req.params = dict(self.params)
+        req.params['issue_id'] = ','.join(ids)
+        req._ids = ids
+        return req
 
     def parse(self, data):
         issues = data['issues']
@@ -0,0 +1,223 @@
+from datetime import datetime
+from functools import reduce
+from importlib import import_module
+import json
+import os
+import sqlite3
+
+from . import const
+from .exceptions import BiteError
+from .objects import Item, Comment, Change, Attachment, DateTime, obj_attrs
+from .service import Service
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    modified TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_modified ON items (modified);
+
+CREATE TABLE IF NOT EXISTS comments (
+    item_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS comments_item_id ON comments (item_id);
+
+CREATE TABLE IF NOT EXISTS changes (
+    item_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS changes_item_id ON changes (item_id);
+
+CREATE TABLE IF NOT EXISTS attachments (
+    item_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attachments_item_id ON attachments (item_id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# item attributes stored in their own tables
+_EVENTS = ('comments', 'changes', 'attachments')
+
+# private object attributes that are stored
+_PRIVATE = frozenset(['_raw', '_mimetype'])
+
+# object types that can be recreated from stored data
+_CLASSES = (Item, Comment, Change, Attachment)
+
+
+def _object(obj, skip=()):
+    """Serialize an object's class and its public attributes."""
+    cls = obj.__class__
+    # raw field values are kept so objects that alter them on creation round-trip
+    attrs = {k: v for k, v in obj_attrs(obj).items()
+             if (not k.startswith('_') or k in _PRIVATE) and k not in skip}
+    return {'__object__': f'{cls.__module__}:{cls.__qualname__}', 'attrs': attrs}
+
+
+class _Encoder(json.JSONEncoder):
+    """Encode item related objects to JSON."""
+
+    def default(self, o):
+        if isinstance(o, (datetime, DateTime)):
+            return {'__datetime__': o.isoformat()}
+        elif isinstance(o, (set, frozenset)):
+            return {'__set__': list(o)}
+        elif isinstance(o, Service):
+            # objects referencing their related service have it reattached on load
+            return {'__service__': True}
+        elif hasattr(o, '__dict__'):
+            if isinstance(o, Attachment):
+                # attachment data isn't stored, only its metadata
+                obj = _object(o, skip=('data',))
+                obj['attrs']['data'] = None
+                return obj
+            return _object(o)
+        return super().default(o)
+
+
+class Store(object):
+    """Local SQLite store of items and their related data for a connection."""
+
+    def __init__(self, *, connection, service=None, path=None):
+        self.connection = connection
+        self.service = service
+
+        if path is not None:
+            self.path = path
+        elif self.connection is not None:
+            self.path = os.path.join(const.USER_CACHE_PATH, 'store', f'{self.connection}.db')
+        else:
+            raise BiteError('a connection is required to use a local store')
+
+        self._db = None
+
+    @property
+    def db(self):
+        """Database connection, the store is created on first use."""
+        if self._db is None:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._db = sqlite3.connect(self.path)
+                self._db.executescript(_SCHEMA)
+            except (OSError, sqlite3.Error) as e:
+                raise BiteError(f'failed opening store: {self.path!r}: {e}')
+        return self._db
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _dumps(self, obj):
+        return json.dumps(obj, cls=_Encoder)
+
+    def _loads(self, s):
+        return json.loads(s, object_hook=self._decode)
+
+    def _decode(self, d):
+        if '__datetime__' in d:
+            return datetime.fromisoformat(d['__datetime__'])
+        elif '__set__' in d:
+            return set(d['__set__'])
+        elif '__service__' in d:
+            return self.service
+        elif '__object__' in d:
+            obj = d['__object__']
+            module, _, name = obj.partition(':')
+            # only recreate known object types, stores aren't trusted to run code
+            cls = None
+            if module.split('.')[0] == __package__:
+                try:
+                    cls = reduce(getattr, name.split('.'), import_module(module))
+                except (ImportError, AttributeError):
+                    pass
+            if not isinstance(cls, type) or not issubclass(cls, _CLASSES):
+                raise BiteError(f'invalid object in store: {self.path!r}: {obj!r}')
+            obj = cls.__new__(cls)
+            for k, v in d['attrs'].items():
+                object.__setattr__(obj, k, v)
+            return obj
+        return d
+
+    @property
+    def synced(self):
+        """Modification time of the most recently updated item stored."""
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'synced'").fetchone()
+        return datetime.fromisoformat(row[0]) if row is not None else None
+
+    @synced.setter
+    def synced(self, value):
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('synced', ?)",
+                (value.isoformat(),))
+
+    def update(self, items):
+        """Add or replace items in the store.
+
+        Returns the latest modification time of the items added.
+        """
+        latest = None
+        with self.db:
+            for item in items:
+                item_id = str(item.id)
+                modified = getattr(item, 'modified', None)
+                if modified is not None and (latest is None or modified > latest):
+                    latest = modified
+
+                self.db.execute(
+                    'INSERT OR REPLACE INTO items (id, modified, data) VALUES (?, ?, ?)',
+                    (item_id, modified.isoformat() if modified is not None else None,
+                     self._dumps(_object(item, skip=_EVENTS))))
+
+                for table in _EVENTS:
+                    self.db.execute(f'DELETE FROM {table} WHERE item_id = ?', (item_id,))
+                    events = getattr(item, table, None)
+                    if events:
+                        self.db.executemany(
+                            f'INSERT INTO {table} (item_id, data) VALUES (?, ?)',
+                            ((item_id, self._dumps(x)) for x in events))
+        return latest
+
+    def _item(self, item_id, data):
+        """Recreate an item object from its stored data."""
+        item = self._loads(data)
+        for table in _EVENTS:
+            rows = self.db.execute(
+                f'SELECT data FROM {table} WHERE item_id = ? ORDER BY rowid', (item_id,))
+            events = tuple(self._loads(x) for x, in rows)
+            setattr(item, table, events if events else None)
+        return item
+
+    def get(self, ids):
+        """Get stored items matching the given IDs."""
+        for i in ids:
+            row = self.db.execute('SELECT data FROM items WHERE id = ?', (str(i),)).fetchone()
+            if row is None:
+                raise BiteError(f'item not in local store: {i!r} (try syncing it)')
+            yield self._item(str(i), row[0])
+
+    def __iter__(self):
+        for item_id, data in self.db.execute('SELECT id, data FROM items ORDER BY modified'):
+            yield self._item(item_id, data)
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+
+    def remove(self):
+        """Remove the store if it exists."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except IOError as e:
+            raise BiteError(f'unable to remove store: {self.path!r}: {e.strerror}')
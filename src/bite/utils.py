@@ -14,6 +14,24 @@ from .exceptions import BiteError
 
 PROG = prog.upper()
 
+# contents of files read using read_cached() keyed by path
+_file_cache = {}
+
+
+def read_cached(path):
+    """Read a text file, reusing its previous contents while it's unchanged.
+
+    Files are keyed by their modification time and size so long-running
+    processes such as `bite serve` only reread them after they're altered.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _file_cache.get(path)
+    if cached is None or cached[0] != key:
+        with open(path) as f:
+            cached = _file_cache[path] = (key, f.read())
+    return cached[1]
+
 
 def raw_input_block():
     """Generator that yields multi-line input until EOF is detected."""
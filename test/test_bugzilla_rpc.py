@@ -0,0 +1,89 @@
+from unittest.mock import patch
+
+from pytest import raises
+
+from bite.exceptions import RequestError
+from bite.service._reqs import NullRequest, Request
+from bite.service.bugzilla._rpc import _MulticallGetRequest
+from bite.service.bugzilla.jsonrpc import Bugzilla5_0Jsonrpc
+
+
+def _service(**kw):
+    return Bugzilla5_0Jsonrpc(base='https://bugs.example.com', connection=None, **kw)
+
+
+def _ids(req):
+    """Return the IDs requested by each call of a batched request."""
+    return [list(map(str, r.params['ids'])) for r in req.calls]
+
+
+def test_multicall_disabled():
+    service = _service()
+    req = service.GetRequest(ids=[1, 2, 3])
+    assert not any(isinstance(r, _MulticallGetRequest) for r in req._reqs)
+
+
+def test_multicall_chunks():
+    ids = list(range(1, 200))
+    for size in (300, 1000, 2000, 10 ** 6):
+        service = _service(multicall_size=size)
+        req = service.GetRequest(ids=ids, get_comments=True, get_attachments=False)
+        chunks = req._reqs
+        assert all(isinstance(r, _MulticallGetRequest) for r in chunks)
+        # all IDs are requested in order with each call covering the same chunk
+        chunk_ids = [_ids(r) for r in chunks]
+        assert all(len(set(map(tuple, x))) == 1 for x in chunk_ids)
+        assert [i for x in chunk_ids for i in x[0]] == list(map(str, ids))
+        # payloads stay under the size limit unless a chunk only has one ID
+        for r, x in zip(chunks, chunk_ids):
+            assert len(r.encode()) <= size or len(x[0]) == 1
+        if size == 10 ** 6:
+            assert len(chunks) == 1
+        else:
+            assert len(chunks) > 1
+
+
+def test_multicall_null_requests():
+    service = _service(multicall_size=300)
+    # null requests for data that isn't requested are skipped without
+    # preparing any requests or injecting authentication
+    with patch.object(Request, '__len__', side_effect=AssertionError('prepared')), \
+            patch.object(service, 'inject_auth', side_effect=AssertionError('auth')):
+        req = service.GetRequest(ids=list(range(1, 50)), get_comments=False, get_attachments=False)
+    for r in req._reqs:
+        assert [type(x) for x in r.reqs[1:]] == [NullRequest] * 3
+        assert [x.command for x in r.calls] == ['Bug.get']
+
+
+def _results(req, faults=()):
+    """Create multicall results for a chunk of get request calls."""
+    ids = req.calls[0].params['ids']
+    results = [{'bugs': [{'id': i, 'summary': f'bug {i}'} for i in ids], 'faults': list(faults)}]
+    for call in req.calls[1:]:
+        results.append({'bugs': {str(i): {'comments': [{
+            'id': i * 10, 'creator': 'user@example.com', 'text': f'comment {i}',
+            'creation_time': '2020-01-01T00:00:00Z', 'count': 0}]} for i in ids}})
+    return [{'result': x, 'error': None} for x in results]
+
+
+def test_multicall_parse():
+    service = _service(multicall_size=300)
+    req = service.GetRequest(ids=list(range(1, 50)), get_attachments=False)
+    assert len(req._reqs) > 1
+    # results are split back into their calls and merged into items in order
+    data = [list(r.parse(_results(r))) for r in req._reqs]
+    bugs = list(req.parse(data))
+    assert [x.id for x in bugs] == list(range(1, 50))
+    for bug in bugs:
+        comment, = bug.comments
+        assert comment.text == f'comment {bug.id}'
+        assert bug.attachments is None
+        assert bug.changes is None
+
+
+def test_multicall_faults():
+    service = _service(multicall_size=10 ** 6)
+    req, = service.GetRequest(ids=[1, 2], get_attachments=False)._reqs
+    fault = {'id': 3, 'faultCode': 101, 'faultString': 'Bug #3 does not exist.'}
+    with raises(RequestError, match='does not exist'):
+        list(req.parse(_results(req, faults=[fault])))
@@ -0,0 +1,127 @@
+import base64
+import gzip
+import json
+from unittest.mock import patch
+
+from pytest import fixture, raises
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from bite.exceptions import BiteError
+from bite.service._cassette import CassetteError, RecordAdapter, ReplayAdapter
+
+
+_XMLRPC_LOGIN = b"""<?xml version="1.0" encoding="UTF-8"?>
+<methodResponse><params><param><value><struct>
+<member><name>id</name><value><int>1</int></value></member>
+<member><name>token</name><value><string>1-xmlsecret</string></value></member>
+</struct></value></param></params></methodResponse>"""
+
+
+def _response(content, content_type='application/json', status=200):
+    response = requests.Response()
+    response.status_code = status
+    response.reason = 'OK'
+    response.headers = CaseInsensitiveDict({
+        'Content-Type': content_type,
+        'Content-Length': str(len(content)),
+        'Set-Cookie': 'session=secret',
+    })
+    response._content = content
+    return response
+
+
+def _request(url, method='GET', body=None):
+    return requests.Request(method, url, data=body).prepare()
+
+
+@fixture
+def cassette(tmpdir):
+    return str(tmpdir.join('cassette.gz'))
+
+
+def _record(path, exchanges):
+    """Record the given request and response pairs to a cassette."""
+    adapter = RecordAdapter(path)
+    for req, response in exchanges:
+        with patch.object(HTTPAdapter, 'send', return_value=response):
+            # responses are returned unaltered to the caller
+            assert adapter.send(req).content == response.content
+    adapter.close()
+
+
+def test_round_trip(cassette):
+    items = json.dumps({'bugs': [{'id': 1, 'summary': 'crash'}]}).encode()
+    _record(cassette, [
+        (_request('https://bugs.example.com/rest/bug?id=1'), _response(items)),
+        (_request('https://bugs.example.com/rest/bug?id=2'), _response(b'', status=404)),
+        (_request('https://bugs.example.com/xmlrpc.cgi', 'POST', '<methodCall/>'),
+         _response(b'<methodResponse/>', 'text/xml')),
+    ])
+
+    adapter = ReplayAdapter(cassette)
+    response = adapter.send(_request('https://bugs.example.com/rest/bug?id=1'))
+    assert response.status_code == 200
+    assert response.content == items
+    assert response.headers['Content-Type'] == 'application/json'
+    assert 'Set-Cookie' not in response.headers
+    assert adapter.send(_request('https://bugs.example.com/rest/bug?id=2')).status_code == 404
+
+    # request bodies are matched
+    req = _request('https://bugs.example.com/xmlrpc.cgi', 'POST', '<methodCall/>')
+    assert adapter.send(req).content == b'<methodResponse/>'
+    with raises(CassetteError):
+        adapter.send(_request('https://bugs.example.com/xmlrpc.cgi', 'POST', '<other/>'))
+    with raises(CassetteError):
+        adapter.send(_request('https://bugs.example.com/rest/bug?id=3'))
+
+
+def test_repeated_requests(cassette):
+    url = 'https://bugs.example.com/rest/bug?id=1'
+    _record(cassette, [
+        (_request(url), _response(b'{"n": 1}')), (_request(url), _response(b'{"n": 2}'))])
+    adapter = ReplayAdapter(cassette)
+    # responses are replayed in order with the last one reused
+    assert [adapter.send(_request(url)).json()['n'] for _ in range(3)] == [1, 2, 2]
+
+
+def test_credentials(cassette):
+    login = json.dumps({'id': 1, 'token': '1-jsonsecret'}).encode()
+    nested = json.dumps(
+        {'result': {'api_key': 'keysecret', 'items': [{'password': 'pwsecret'}]}}).encode()
+    _record(cassette, [
+        (_request('https://bugs.example.com/rest/login?login=alice&password=pwsecret'),
+         _response(login)),
+        (_request('https://bugs.example.com/rest/user?token=1-jsonsecret'), _response(nested)),
+        (_request('https://bugs.example.com/xmlrpc.cgi', 'POST', '<login/>'),
+         _response(_XMLRPC_LOGIN, 'text/xml')),
+    ])
+
+    with gzip.open(cassette, 'rt') as f:
+        entries = [json.loads(line) for line in f]
+    stored = json.dumps(entries) + ''.join(
+        base64.b64decode(x['content']).decode() for x in entries)
+    for secret in ('jsonsecret', 'xmlsecret', 'keysecret', 'pwsecret', 'alice', 'session='):
+        assert secret not in stored
+    assert all(k.lower() != 'content-length' for x in entries for k, _v in x['headers'])
+
+    # credentials in URLs are ignored when matching requests
+    adapter = ReplayAdapter(cassette)
+    response = adapter.send(_request('https://bugs.example.com/rest/login?login=other&password=x'))
+    assert response.json() == {'id': 1, 'token': 'REDACTED'}
+    response = adapter.send(_request('https://bugs.example.com/rest/user?token=1-other'))
+    assert response.json() == {
+        'result': {'api_key': 'REDACTED', 'items': [{'password': 'REDACTED'}]}}
+    response = adapter.send(_request('https://bugs.example.com/xmlrpc.cgi', 'POST', '<login/>'))
+    assert b'<name>token</name><value><string>REDACTED</string>' in response.content
+    assert b'<int>1</int>' in response.content
+
+
+def test_invalid_cassette(tmpdir, cassette):
+    with raises(BiteError, match='failed reading cassette'):
+        ReplayAdapter(str(tmpdir.join('missing.gz')))
+    with gzip.open(cassette, 'wt') as f:
+        f.write('not json\n')
+    with raises(BiteError, match='invalid cassette'):
+        ReplayAdapter(cassette)
@@ -0,0 +1,172 @@
+import argparse
+from functools import partial
+import os
+import socket
+import sys
+import threading
+from unittest.mock import patch
+
+from pytest import fixture, raises
+
+from bite import __title__ as project
+from bite.argparser import ArgumentParser
+from bite.daemon import Daemon, forward
+from bite.scripts import run
+from bite.utils import read_cached
+
+
+@fixture
+def daemon(tmpdir):
+    server = Daemon(path=str(tmpdir.join('daemon.sock')))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _run(args):
+    """Fake command run by the daemon, refusing commands that aren't searches."""
+    if args[0] != 'search':
+        return None
+    sys.stdout.write(f"{' '.join(args)}: {os.getcwd()}: {os.environ.get('BITE_TEST')}\n")
+    sys.stdout.flush()
+    return 3
+
+
+def test_forward_skipped(tmpdir):
+    path = str(tmpdir.join('daemon.sock'))
+    # no daemon running
+    assert forward(['search', 'foo'], path=path) is None
+
+    # commands the daemon doesn't handle or that read args from stdin
+    with patch('bite.daemon.os.path.exists', return_value=True), \
+            patch('bite.daemon.socket.socket') as sock:
+        assert forward(['connections'], path=path) is None
+        assert forward(['search', '-'], path=path) is None
+        assert not sock.called
+
+
+def test_forward(daemon, tmpdir, capfd, monkeypatch):
+    monkeypatch.setenv('BITE_TEST', 'client')
+    monkeypatch.chdir(str(tmpdir))
+    with patch.object(Daemon, '_run', side_effect=_run):
+        # commands are run using the caller's streams, environment, and cwd
+        assert forward(['search', 'foo'], path=daemon.path) == 3
+        out, _err = capfd.readouterr()
+        assert out == f'search foo: {tmpdir}: client\n'
+
+        # the daemon's own settings are restored afterwards
+        monkeypatch.delenv('BITE_TEST')
+        assert forward(['search', 'bar'], path=daemon.path) == 3
+        out, _err = capfd.readouterr()
+        assert out == f'search bar: {tmpdir}: None\n'
+
+
+def test_forward_refused(daemon, capfd):
+    # commands refused before running are run by the client instead
+    with patch.object(Daemon, '_run', side_effect=_run):
+        assert forward(['get', 'foo'], path=daemon.path) is None
+    out, err = capfd.readouterr()
+    assert out == err == ''
+
+    # invalid messages are refused
+    assert daemon.handle_msg({'cmd': 'run', 'args': 'search'}, [0, 1, 2]) == \
+        {'refused': 'invalid message'}
+    assert 'refused' in daemon.handle_msg({'cmd': 'run'}, [])
+    assert 'refused' in daemon.handle_msg({'cmd': 'foo'}, [])
+
+
+def test_forward_lost_connection(tmpdir, capfd):
+    # commands may have run if the connection is lost so they aren't rerun
+    path = str(tmpdir.join('daemon.sock'))
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(path)
+        server.listen(1)
+
+        def accept():
+            conn, _addr = server.accept()
+            conn.recv(1024 * 1024)
+            conn.close()
+
+        thread = threading.Thread(target=accept, daemon=True)
+        thread.start()
+        assert forward(['search', 'foo'], path=path) == 1
+        thread.join()
+    _out, err = capfd.readouterr()
+    assert 'lost connection to daemon' in err
+
+
+def test_script_forward():
+    with patch('sys.argv', [project, 'search', 'foo']):
+        # the daemon's exit status is used if it ran the command
+        with patch('bite.daemon.forward', return_value=3) as forward, \
+                patch(f'{project}.scripts.import_module') as import_module:
+            with raises(SystemExit) as excinfo:
+                run(project)
+            assert excinfo.value.code == 3
+            forward.assert_called_once_with(['search', 'foo'])
+            assert not import_module.called
+
+        # otherwise the command is run directly
+        with patch('bite.daemon.forward', return_value=None), \
+                patch(f'{project}.scripts.import_module') as import_module:
+            import_module.side_effect = ImportError('no module')
+            with raises(SystemExit) as excinfo:
+                run(project)
+            assert excinfo.value.code == 1
+            assert import_module.called
+
+    # other scripts aren't forwarded
+    with patch('sys.argv', ['bite-other', 'search']), \
+            patch('bite.daemon.forward') as forward, \
+            patch(f'{project}.scripts.import_module', side_effect=ImportError('no module')):
+        with raises(SystemExit):
+            run('bite-other')
+        assert not forward.called
+
+
+def test_parser_checkpoint():
+    parser = ArgumentParser(description='test')
+    # skip bite's parsing which requires configured services
+    parse = partial(argparse.ArgumentParser.parse_args, parser)
+    parser.add_argument('--foo')
+    group = parser.add_argument_group('Service specific options')
+    subparsers = parser.add_subparsers()
+    subparsers.add_parser('connections')
+    reset = parser.checkpoint()
+
+    for _ in range(2):
+        # parsing alters the parser similar to adding service options and subcommands
+        group.add_argument('--bar')
+        group.title = 'Bugzilla specific options'
+        subparsers.add_parser('search')
+        parser.set_defaults(foo='default', connection='gentoo')
+        assert parse(['--bar', '1', 'search']).foo == 'default'
+
+        reset()
+        assert group.title == 'Service specific options'
+        assert parse(['connections']).foo is None
+        with raises(SystemExit):
+            parse(['--bar', '1', 'connections'])
+        with raises(SystemExit):
+            parse(['search'])
+
+
+def test_read_cached(tmpdir):
+    path = str(tmpdir.join('bite.conf'))
+    with open(path, 'w') as f:
+        f.write('[gentoo]\n')
+    assert read_cached(path) == '[gentoo]\n'
+
+    # unchanged files are reused
+    with patch('builtins.open') as opened:
+        assert read_cached(path) == '[gentoo]\n'
+        assert not opened.called
+
+    # altered files are reread
+    with open(path, 'w') as f:
+        f.write('[gentoo]\nbase = https://bugs.gentoo.org\n')
+    os.utime(path, ns=(0, 0))
+    assert read_cached(path) == '[gentoo]\nbase = https://bugs.gentoo.org\n'
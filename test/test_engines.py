@@ -0,0 +1,157 @@
+import json
+from types import GeneratorType
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from pytest import fixture, raises
+import requests
+
+from bite.exceptions import RequestError
+from bite.service import Session
+from bite.service._reqs import ExtractData, OffsetPagedRequest, Request, URLRequest
+from bite.service.bugzilla.rest import Bugzilla5_0Rest
+
+
+_TOTAL = 23
+
+
+def _serve(req, **kw):
+    """Serve items and pages of items from a fake JSON API."""
+    url = urlparse(req.url)
+    params = {k: v[0] for k, v in parse_qs(url.query).items()}
+    response = requests.Response()
+    response.url = req.url
+    response.headers['Content-Type'] = 'application/json'
+    endpoint = url.path.rsplit('/', 1)[-1]
+    if endpoint == 'items':
+        data = {'items': [int(x) for x in params['ids'].split(',')]}
+    elif endpoint == 'paged':
+        offset, limit = int(params.get('offset', 0)), int(params['limit'])
+        data = {'total': _TOTAL, 'items': list(range(offset, min(offset + limit, _TOTAL)))}
+    else:
+        response.status_code = 404
+        response.reason = 'Not Found'
+        response._content = b'{}'
+        return response
+    response.status_code = 200
+    response._content = json.dumps(data).encode()
+    return response
+
+
+class _ItemsRequest(URLRequest):
+
+    def __init__(self, ids, **kw):
+        super().__init__(endpoint='/items', **kw)
+        self.params['ids'] = ','.join(map(str, ids))
+
+    def parse(self, data):
+        return data['items']
+
+
+class _MissingRequest(URLRequest):
+
+    def __init__(self, **kw):
+        super().__init__(endpoint='/missing', **kw)
+
+
+class _PagedRequest(OffsetPagedRequest, URLRequest):
+
+    _offset_key = 'offset'
+    _size_key = 'limit'
+    _total_key = 'total'
+
+    def __init__(self, **kw):
+        super().__init__(endpoint='/paged', **kw)
+
+    def parse(self, data):
+        return super().parse(data)['items']
+
+
+class _LinkedRequest(_ItemsRequest):
+    """Request sending further requests while its results are parsed."""
+
+    def parse(self, data):
+        for x in super().parse(data):
+            yield x, self.service.send(_ItemsRequest(ids=[x * 10, x * 100], service=self.service))
+
+
+def _results(data):
+    """Recursively consume lazily parsed results."""
+    if isinstance(data, (list, tuple, GeneratorType, ExtractData)):
+        return [_results(x) for x in data]
+    return data
+
+
+@fixture
+def service():
+    service = Bugzilla5_0Rest(base='https://bugs.example.com', connection=None, max_results=5)
+    with patch.object(Session, '_send', side_effect=_serve):
+        yield service
+
+
+def _send(service, reqs):
+    """Send requests using both engines, verifying they return the same results."""
+    results = {}
+    for engine in service.engines:
+        service.engine = engine
+        with patch.object(service, '_send_async', wraps=service._send_async) as send_async:
+            results[engine] = _results(service.send(*reqs(service)))
+        assert send_async.called == (engine == 'async')
+    assert results['thread'] == results['async']
+    return results['thread']
+
+
+def test_single(service):
+    assert _send(service, lambda s: [_ItemsRequest(ids=[1, 2], service=s)]) == [1, 2]
+
+
+def test_multiple(service):
+    reqs = lambda s: [_ItemsRequest(ids=[x], service=s) for x in range(10)]
+    assert _send(service, reqs) == [[x] for x in range(10)]
+    reqs = lambda s: [[_ItemsRequest(ids=[x], service=s) for x in range(3)]]
+    assert _send(service, reqs) == [[0], [1], [2]]
+
+
+def test_nested(service):
+    def reqs(s):
+        inner = Request(service=s, reqs=[
+            _ItemsRequest(ids=[3], service=s), _ItemsRequest(ids=[4, 5], service=s)])
+        return [Request(service=s, reqs=[_ItemsRequest(ids=[1, 2], service=s), inner])]
+    assert _send(service, reqs) == [[1, 2], [[3], [4, 5]]]
+
+
+def test_linked(service):
+    # requests sent by parsers running on the event loop fall back to threads
+    reqs = lambda s: [_LinkedRequest(ids=[1, 2], service=s)]
+    assert _send(service, reqs) == [[1, [10, 100]], [2, [20, 200]]]
+
+
+def test_paged(service):
+    for kw, expected in (({}, list(range(_TOTAL))), ({'limit': 3}, [0, 1, 2])):
+        results = {}
+        for engine in service.engines:
+            service.engine = engine
+            results[engine] = list(_PagedRequest(service=service, **kw).send())
+        assert results['thread'] == results['async'] == expected
+
+
+def test_errors(service):
+    for engine in service.engines:
+        service.engine = engine
+        with raises(RequestError, match='HTTP Error 404: not found'):
+            service.send(_MissingRequest(service=service))
+
+        # errors are raised lazily after the results preceding them
+        data = service.send(
+            _ItemsRequest(ids=[1], service=service), _MissingRequest(service=service),
+            _ItemsRequest(ids=[2], service=service))
+        assert next(data) == [1]
+        with raises(RequestError, match='HTTP Error 404'):
+            next(data)
+
+        # errors from nested requests propagate to their parents
+        req = Request(service=service, reqs=[
+            _ItemsRequest(ids=[1], service=service),
+            Request(service=service, reqs=[_MissingRequest(service=service)])])
+        with raises(RequestError, match='HTTP Error 404'):
+            _results(service.send(req))
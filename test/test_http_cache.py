@@ -0,0 +1,92 @@
+import os
+from unittest.mock import patch
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from bite.cache import HTTPCache
+from bite.service import Session
+
+
+def _response(status=200, headers=None, content=b''):
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers if headers is not None else {})
+    response._content = content
+    return response
+
+
+def _request(url='https://bugs.example.com/rest/bug/1', **headers):
+    return requests.Request('GET', url, headers=headers).prepare()
+
+
+def test_update_and_get(tmpdir):
+    cache = HTTPCache(None, path=str(tmpdir))
+    req = _request()
+    response = _response(headers={'ETag': '"abc"', 'Content-Encoding': 'gzip'}, content=b'data')
+    cache.update(req, response)
+    headers, content = cache.get(req)
+    assert content == b'data'
+    assert 'Content-Encoding' not in headers
+    assert cache.conditional_headers(headers) == {'If-None-Match': '"abc"'}
+
+    # responses without validators or that can't be stored are skipped
+    for headers in ({}, {'ETag': '"a"', 'Cache-Control': 'no-store'}, {'ETag': '"a"', 'Vary': '*'}):
+        req = _request(url='https://bugs.example.com/skipped')
+        cache.update(req, _response(headers=headers, content=b'data'))
+        assert cache.get(req) is None
+
+
+def test_credentials_and_vary(tmpdir):
+    cache = HTTPCache(None, path=str(tmpdir))
+    req = _request(Cookie='user=a', Accept='application/json')
+    cache.update(req, _response(headers={'ETag': '"abc"', 'Vary': 'Accept'}, content=b'data'))
+    assert cache.get(req) is not None
+    assert cache.get(_request(Cookie='user=b', Accept='application/json')) is None
+    assert cache.get(_request(Cookie='user=a', Accept='text/html')) is None
+
+
+def test_eviction(tmpdir):
+    cache = HTTPCache(None, path=str(tmpdir), max_size=4096)
+    reqs = [_request(url=f'https://bugs.example.com/rest/bug/{i}') for i in range(8)]
+    for i, req in enumerate(reqs):
+        cache.update(req, _response(headers={'ETag': f'"{i}"'}, content=b'x' * 1000))
+        # spread out modification times so entries are ordered by use
+        path = cache._entry(req)
+        os.utime(path, (i, i))
+    size = sum(os.path.getsize(os.path.join(str(tmpdir), x)) for x in os.listdir(str(tmpdir)))
+    assert size <= 4096
+    # the most recently stored entries are kept
+    assert cache.get(reqs[-1]) is not None
+    assert cache.get(reqs[0]) is None
+
+    # oversized responses aren't stored
+    req = _request(url='https://bugs.example.com/large')
+    cache.update(req, _response(headers={'ETag': '"l"', 'Content-Length': '4096'}, content=b''))
+    assert cache.get(req) is None
+
+
+def test_session_cached_responses(tmpdir):
+    session = Session(http_cache=HTTPCache(None, path=str(tmpdir)), retries=0)
+    req = _request()
+
+    # 200 responses with validators are stored
+    with patch.object(Session, '_send', return_value=_response(
+            headers={'ETag': '"abc"'}, content=b'data')) as send:
+        response = session.send(req)
+        assert response.content == b'data'
+        assert 'If-None-Match' not in send.call_args[0][0].headers
+
+    # later requests are conditional and 304 responses use the stored body
+    with patch.object(Session, '_send', return_value=_response(status=304)) as send:
+        response = session.send(req)
+        assert send.call_args[0][0].headers['If-None-Match'] == '"abc"'
+        assert response.status_code == 200
+        assert response.content == b'data'
+        assert response.from_cache
+
+    # caching can be skipped per request
+    with patch.object(Session, '_send', return_value=_response(status=304)) as send:
+        response = session.send(req, cache=False)
+        assert 'If-None-Match' not in send.call_args[0][0].headers
+        assert response.status_code == 304
@@ -0,0 +1,107 @@
+import json
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from pytest import fixture
+import requests
+
+from bite.service import Session
+from bite.service._reqs import ChunkedRequest, IDsRequest
+from bite.service.bugzilla.jsonrpc import Bugzilla5_0Jsonrpc
+from bite.service.bugzilla.rest import Bugzilla5_0Rest
+
+
+@fixture
+def rest():
+    return Bugzilla5_0Rest(base='https://bugs.example.com', connection=None)
+
+
+@fixture
+def jsonrpc():
+    return Bugzilla5_0Jsonrpc(base='https://bugs.example.com', connection=None)
+
+
+def _chunk_ids(req):
+    """Return the IDs requested by each chunk of a split request."""
+    if isinstance(req, ChunkedRequest):
+        return [list(r._request_ids()) for r in req._reqs]
+    return [list(req._request_ids())]
+
+
+def _encoded(req):
+    reqs = req._reqs if isinstance(req, ChunkedRequest) else (req,)
+    return [IDsRequest._encoded_size(r) for r in reqs]
+
+
+def test_split_small(rest, jsonrpc):
+    # requests for a few IDs aren't prepared to estimate their size
+    with patch.object(IDsRequest, '_encoded_size', side_effect=AssertionError('prepared')):
+        for service in (rest, jsonrpc):
+            req = service.GetItemRequest(ids=list(range(1, 50)))
+            assert req.split() is req
+            req = service.GetItemRequest(ids=[1])
+            assert req.split() is req
+
+
+def test_split_max_ids(rest):
+    rest.max_ids = 10
+    ids = list(range(1, 26))
+    with patch.object(IDsRequest, '_encoded_size', side_effect=AssertionError('prepared')):
+        req = rest.GetItemRequest(ids=ids).split()
+    assert [len(x) for x in _chunk_ids(req)] == [10, 10, 5]
+    assert sum(_chunk_ids(req), []) == ids
+
+    # requests at the limit aren't split
+    req = rest.GetItemRequest(ids=ids[:10])
+    assert req.split() is req
+
+
+def test_split_url_length(rest):
+    ids = list(range(1, 500))
+    for limit in (100, 300, 1000):
+        rest.max_url_length = limit
+        req = rest.GetItemRequest(ids=ids).split()
+        chunks = _chunk_ids(req)
+        assert len(chunks) > 1
+        assert sum(chunks, []) == ids
+        for (url_length, _body_size), chunk in zip(_encoded(req), chunks):
+            assert url_length <= limit or len(chunk) == 1
+
+    # requests within the limit aren't split
+    rest.max_url_length = 10 ** 6
+    req = rest.GetItemRequest(ids=ids)
+    assert req.split() is req
+
+
+def test_split_body_size(jsonrpc):
+    ids = list(range(1, 2000))
+    for limit in (200, 1000, 5000):
+        jsonrpc.max_body_size = limit
+        req = jsonrpc.GetItemRequest(ids=ids).split()
+        chunks = _chunk_ids(req)
+        assert len(chunks) > 1
+        assert sum(chunks, []) == ids
+        for (_url_length, body_size), chunk in zip(_encoded(req), chunks):
+            assert body_size <= limit or len(chunk) == 1
+
+
+def _get(req, **kw):
+    """Serve bugs for the IDs requested in a REST URL."""
+    ids = parse_qs(urlparse(req.url).query)['id']
+    response = requests.Response()
+    response.status_code = 200
+    response.url = req.url
+    response.headers['Content-Type'] = 'application/json'
+    response._content = json.dumps({'bugs': [{'id': int(x)} for x in ids]}).encode()
+    return response
+
+
+def test_merged_order(rest):
+    rest.max_url_length = 200
+    rest.max_ids = 7
+    ids = [5, 1000, 3, 42, 99999, 1] * 20
+    assert len(_chunk_ids(rest.GetItemRequest(ids=ids).split())) > 1
+    # results for chunks are merged in the order their IDs were requested
+    with patch.object(Session, '_send', side_effect=_get):
+        bugs = rest.send(rest.GetItemRequest(ids=ids))
+        assert [x.id for x in bugs] == ids
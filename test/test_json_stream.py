@@ -0,0 +1,93 @@
+import gc
+from inspect import isgenerator
+import json
+
+import pytest
+
+from bite.exceptions import ParsingError
+from bite.service._json import JsonStream
+
+
+def _chunks(data, size):
+    data = data.encode()
+    return iter([data[i:i + size] for i in range(0, len(data), size)])
+
+
+def _parse(data, key='bugs', size=1, close=None):
+    data = JsonStream(_chunks(data, size), key, close=close).parse()
+    if isgenerator(data.get(key)):
+        data[key] = list(data[key])
+    return data
+
+
+def test_chunk_splits():
+    obj = {
+        'total': 12345, 'bugs': [{'id': 1, 'summary': 'foo'}, 2.5e10, None, True, 'bar'],
+        'faults': [],
+    }
+    data = json.dumps(obj)
+    # every chunk size splits values at different points, including numbers
+    for size in range(1, len(data) + 1):
+        assert _parse(data, size=size) == obj
+
+
+def test_escapes():
+    obj = {'bugs': ['"quoted"', 'back\\slash', 'é☃\U0001f41b', 'new\nline', '\\"]}']}
+    for ensure_ascii in (True, False):
+        data = json.dumps(obj, ensure_ascii=ensure_ascii)
+        # multibyte characters are split across chunks
+        for size in (1, 2, 3, 5):
+            assert _parse(data, size=size) == obj
+
+
+def test_trailing_members():
+    data = '{"offset": 0, "bugs": [1, 2], "total": 2, "faults": [{"id": 3}]}'
+    stream = JsonStream(_chunks(data, 4), 'bugs').parse()
+    assert stream == {'offset': 0, 'bugs': stream['bugs']}
+    assert list(stream['bugs']) == [1, 2]
+    # members following the array are added once its elements are consumed
+    assert stream == {'offset': 0, 'bugs': stream['bugs'], 'total': 2, 'faults': [{'id': 3}]}
+
+
+def test_missing_key():
+    obj = {'total': 0, 'issues': [1, 2]}
+    assert _parse(json.dumps(obj)) == obj
+    assert _parse('{}') == {}
+
+
+def test_invalid():
+    with pytest.raises(json.decoder.JSONDecodeError):
+        _parse('[1, 2]')
+    with pytest.raises(ParsingError):
+        _parse('{"bugs": [1, 2')
+
+
+def test_close():
+    data = json.dumps({'bugs': list(range(10)), 'total': 10})
+    closed = []
+
+    # closed when fully consumed
+    _parse(data, close=lambda: closed.append(1))
+    assert closed == [1]
+
+    # closed when decoding fails
+    closed.clear()
+    with pytest.raises(ParsingError):
+        _parse('{"bugs": [1, }', close=lambda: closed.append(1))
+    assert closed == [1]
+
+    # closed when elements are discarded before being exhausted
+    closed.clear()
+    bugs = JsonStream(_chunks(data, 4), 'bugs', close=lambda: closed.append(1)).parse()['bugs']
+    assert next(bugs) == 0
+    assert not closed
+    del bugs
+    gc.collect()
+    assert closed == [1]
+
+    # closed when elements are never consumed
+    closed.clear()
+    bugs = JsonStream(_chunks(data, 4), 'bugs', close=lambda: closed.append(1)).parse()['bugs']
+    del bugs
+    gc.collect()
+    assert closed == [1]
@@ -0,0 +1,112 @@
+from collections import namedtuple
+from itertools import islice
+import threading
+
+from pytest import raises
+
+from bite import multi_search
+from bite.exceptions import RequestError
+from bite.service import Service
+
+
+_Item = namedtuple('_Item', ['id', 'modified'])
+
+
+class _Search(object):
+
+    def __init__(self, service, params):
+        self.service = service
+        self.params = params
+
+    def send(self):
+        limit = self.params.get('limit')
+        items = self.service.items[:limit] if limit is not None else self.service.items
+        for i, item in enumerate(items):
+            if i == self.service.fail_at:
+                raise RequestError('search failed')
+            if i == self.service.pause_at:
+                self.service.resume.wait(5)
+            self.service.sent.append(item)
+            yield item
+        self.service.finished.set()
+
+
+class _Service(Service):
+    """Service returning a fixed list of search results."""
+
+    def __init__(self, items, fail_at=None, pause_at=None):
+        self.items = items
+        self.fail_at = fail_at
+        self.pause_at = pause_at
+        self.sent = []
+        self.searches = []
+        self.resume = threading.Event()
+        self.finished = threading.Event()
+
+    def SearchRequest(self, params):
+        self.searches.append(params)
+        return _Search(self, params)
+
+
+def _items(*values, start=0):
+    return [_Item(i, v) for i, v in enumerate(values, start)]
+
+
+def test_unsorted():
+    a, b = _Service(_items(1, 2, 3)), _Service(_items(4, 5, start=10))
+    results = list(multi_search([a, b]))
+    # results from each service are yielded in the order they're returned
+    assert sorted(x.id for _s, x in results) == [0, 1, 2, 10, 11]
+    for s in (a, b):
+        assert [x for service, x in results if service is s] == s.items
+
+
+def test_sorted():
+    a, b = _Service(_items(1, 4, 6)), _Service(_items(2, 3, 7, start=10))
+    results = list(multi_search([a, b], key='modified'))
+    assert [x.modified for _s, x in results] == [1, 2, 3, 4, 6, 7]
+    assert [s for s, _x in results] == [a, b, b, a, a, b]
+
+    a, b = _Service(_items(6, 4, 1)), _Service(_items(7, 3, 2, start=10))
+    results = list(multi_search([a, b], key=lambda x: x.modified, reverse=True))
+    assert [x.modified for _s, x in results] == [7, 6, 4, 3, 2, 1]
+
+
+def test_sorted_missing():
+    # items missing sort values are yielded after the others
+    a, b = _Service(_items(1, 5, None)), _Service(_items(None, 2, start=10))
+    results = list(multi_search([a, b], key='modified'))
+    assert [x.modified for _s, x in results] == [1, 5, None, None, 2]
+
+    a, b = _Service(_items(5, None)), _Service(_items(7, 2, None, start=10))
+    results = list(multi_search([a, b], key='modified', reverse=True))
+    assert [x.modified for _s, x in results] == [7, 5, 2, None, None]
+
+
+def test_limits():
+    a, b = _Service(_items(*range(10))), _Service(_items(*range(10), start=10))
+    # search params are passed to every service
+    results = list(multi_search([a, b], key='modified', limit=3))
+    assert [x.modified for _s, x in results] == [0, 0, 1, 1, 2, 2]
+    assert a.searches == b.searches == [{'limit': 3}]
+
+    # searches stop when results are no longer consumed
+    services = [_Service(_items(*range(100), start=i * 100), pause_at=10) for i in range(2)]
+    gen = multi_search(services, key='modified')
+    assert len(list(islice(gen, 5))) == 5
+    gen.close()
+    for s in services:
+        s.resume.set()
+    for s in services:
+        assert not s.finished.wait(0.1)
+        assert len(s.sent) <= 11
+
+
+def test_failed():
+    for key in (None, 'modified'):
+        a, b = _Service(_items(1, 2, 3)), _Service(_items(1, 2, 3, start=10), fail_at=1)
+        with raises(RequestError, match='search failed'):
+            list(multi_search([a, b], key=key))
+
+    # no services means no results
+    assert list(multi_search([])) == []
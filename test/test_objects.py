@@ -0,0 +1,62 @@
+import bz2
+import gzip
+import lzma
+
+from pytest import raises
+
+from bite.exceptions import BiteError
+from bite.objects import Attachment, decompress_chunks
+
+
+_TEXT = b'line of text\n' * 1000
+
+
+def _decompress(data, chunk_size=None):
+    chunk_size = chunk_size if chunk_size is not None else len(data)
+    chunks = (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+    mimetype, chunks = decompress_chunks(chunks)
+    return mimetype, b''.join(chunks)
+
+
+def test_decompress():
+    for compress in (gzip.compress, bz2.compress, lzma.compress):
+        data = compress(_TEXT)
+        for chunk_size in (1, 7, 1024, None):
+            assert _decompress(data, chunk_size) == ('text/plain', _TEXT)
+
+    # nested compression layers are all removed
+    assert _decompress(gzip.compress(bz2.compress(_TEXT)))[1] == _TEXT
+
+
+def test_concatenated_streams():
+    for compress in (gzip.compress, bz2.compress, lzma.compress):
+        data = compress(_TEXT) + compress(b'more text\n')
+        for chunk_size in (1, 5, 1024, None):
+            assert _decompress(data, chunk_size)[1] == _TEXT + b'more text\n'
+
+
+def test_trailing_data():
+    # padding or garbage following the last stream is ignored
+    for compress in (gzip.compress, bz2.compress, lzma.compress):
+        for trailing in (b'\0' * 512, b'garbage', b'\x1f'):
+            data = compress(_TEXT) + trailing
+            for chunk_size in (1, 3, 1024, None):
+                assert _decompress(data, chunk_size)[1] == _TEXT
+
+
+def test_padded_gzip_attachment():
+    data = gzip.compress(_TEXT) + b'\0' * 1024
+    attachment = Attachment(filename='foo.txt.gz', data=data)
+    assert attachment.mimetype == 'text/plain'
+    assert attachment.read() == _TEXT
+    assert attachment.read(raw=True) == data
+
+
+def test_corrupt_data():
+    data = bytearray(gzip.compress(_TEXT))
+    data[20:40] = b'\xff' * 20
+    with raises(BiteError):
+        _decompress(bytes(data))
+    attachment = Attachment(filename='foo.gz', data=bytes(data))
+    with raises(BiteError):
+        attachment.read()
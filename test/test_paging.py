@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from bite.service._reqs import PagedRequest, OffsetPagedRequest
+
+
+class FakeService(object):
+    """Service serving pages of integers from a fixed number of results."""
+
+    authenticated = True
+    auth = None
+
+    def __init__(self, total, max_results=10, prefetch=0, concurrent=4):
+        self.total = total
+        self.max_results = max_results
+        self.prefetch = prefetch
+        self.executor = ThreadPoolExecutor(max_workers=concurrent)
+        self.sent = []
+
+    def send(self, reqs):
+        # pages are requested and parsed by the executor similar to real services
+        if isinstance(reqs, (list, tuple)):
+            jobs = [self.executor.submit(self._page, r) for r in reqs]
+            return [x.result() for x in jobs]
+        return self.executor.submit(self._page, reqs).result()
+
+    def _page(self, req):
+        req._finalize()
+        self.sent.append(dict(req.params))
+        start, size = req.start, req.params['size']
+        data = {'total': self.total, 'items': list(range(start, min(start + size, self.total)))}
+        return req.parse(data)
+
+
+class _Paged(PagedRequest):
+
+    _page_key = 'page'
+    _size_key = 'size'
+    _total_key = 'total'
+
+    @property
+    def start(self):
+        return self.params['page'] * self.params['size']
+
+    def parse(self, data):
+        return super().parse(data)['items']
+
+
+class _OffsetPaged(OffsetPagedRequest):
+
+    _offset_key = 'offset'
+    _size_key = 'size'
+    _total_key = 'total'
+
+    @property
+    def start(self):
+        return self.params.get('offset', 0)
+
+    def parse(self, data):
+        return super().parse(data)['items']
+
+
+def test_paged_unlimited():
+    for cls in (_Paged, _OffsetPaged):
+        service = FakeService(total=35)
+        assert list(cls(service=service).send()) == list(range(35))
+        assert len(service.sent) == 4
+
+
+def test_paged_limited():
+    for cls in (_Paged, _OffsetPaged):
+        service = FakeService(total=35)
+        assert list(cls(service=service, limit=5).send()) == list(range(5))
+        assert len(service.sent) == 1
+        assert service.sent[0]['size'] == 5
+
+
+def test_paged_empty():
+    for cls in (_Paged, _OffsetPaged):
+        service = FakeService(total=0)
+        assert list(cls(service=service).send()) == []
+        assert len(service.sent) == 1
+
+
+class _UnknownTotalPaged(_OffsetPaged):
+
+    _total_key = None
+
+
+def test_prefetched():
+    service = FakeService(total=35, prefetch=2)
+    assert list(_UnknownTotalPaged(service=service).send()) == list(range(35))
+    # pages are speculatively requested past the end of the results
+    assert len(service.sent) >= 4
+
+
+def test_prefetched_single_worker():
+    # prefetching doesn't block when the service only has one worker
+    service = FakeService(total=35, prefetch=2, concurrent=1)
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.extend(_UnknownTotalPaged(service=service).send()), daemon=True)
+    thread.start()
+    thread.join(10)
+    assert results == list(range(35))
+
+
+def test_prefetched_limited():
+    service = FakeService(total=35, prefetch=2)
+    assert list(_UnknownTotalPaged(service=service, limit=10).send()) == list(range(10))
+    assert len(service.sent) == 1
@@ -0,0 +1,121 @@
+from unittest.mock import patch
+
+from pytest import raises
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from bite.exceptions import RequestError
+from bite.service import Session
+
+
+def _response(status=200, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers if headers is not None else {})
+    return response
+
+
+def _request(method='GET'):
+    return requests.Request(method, 'https://bugs.example.com/rest/bug/1').prepare()
+
+
+def _send(req, responses, retries=3):
+    """Send a request using the given responses or exceptions per attempt."""
+    session = Session(retries=retries)
+    with patch.object(Session, '_send', side_effect=responses) as send, \
+            patch('bite.service.time.sleep') as sleep:
+        try:
+            return session.send(req), send.call_count, [x[0][0] for x in sleep.call_args_list]
+        except RequestError as e:
+            return e, send.call_count, [x[0][0] for x in sleep.call_args_list]
+
+
+def test_retry_transient():
+    # transient errors and statuses are retried until they succeed
+    for failure in (requests.exceptions.ConnectionError('reset'),
+                    requests.exceptions.ReadTimeout('timeout'),
+                    _response(502), _response(503), _response(504), _response(429)):
+        response, attempts, delays = _send(_request(), [failure, failure, _response(200)])
+        assert response.status_code == 200
+        assert attempts == 3
+        assert len(delays) == 2
+
+
+def test_retry_limit():
+    response, attempts, delays = _send(_request(), [_response(503)] * 4)
+    assert response.status_code == 503
+    assert attempts == 4
+    assert len(delays) == 3
+
+    error, attempts, _delays = _send(_request(), [requests.exceptions.ConnectionError('reset')] * 4)
+    assert isinstance(error, RequestError)
+    assert attempts == 4
+
+    # retries can be disabled
+    response, attempts, delays = _send(_request(), [_response(503)], retries=0)
+    assert response.status_code == 503
+    assert (attempts, delays) == (1, [])
+
+
+def test_no_retry():
+    # permanent failures aren't retried
+    for failure in (_response(500), _response(404)):
+        response, attempts, _delays = _send(_request(), [failure])
+        assert response is failure
+        assert attempts == 1
+    error, attempts, _delays = _send(_request(), [requests.exceptions.SSLError('cert')])
+    assert error.message == 'SSL certificate verification failed'
+    assert attempts == 1
+
+
+def test_retry_non_idempotent():
+    # requests that may have reached the service aren't repeated
+    for method in ('POST', 'PUT', 'DELETE', 'PATCH'):
+        for failure in (requests.exceptions.ReadTimeout('timeout'),
+                        requests.exceptions.ConnectionError('reset'),
+                        _response(502), _response(503), _response(504)):
+            result, attempts, _delays = _send(_request(method), [failure, _response(200)])
+            assert attempts == 1
+            if isinstance(failure, requests.Response):
+                assert result is failure
+            else:
+                assert isinstance(result, RequestError)
+
+        # requests rejected before being processed are retried
+        for failure in (requests.exceptions.ConnectTimeout('timeout'), _response(429)):
+            response, attempts, _delays = _send(_request(method), [failure, _response(200)])
+            assert response.status_code == 200
+            assert attempts == 2
+
+
+def test_backoff_jitter():
+    session = Session()
+    with patch('bite.service.random.uniform', side_effect=lambda a, b: b) as uniform:
+        delays = [session._retry_delay(i) for i in range(10)]
+    # delays are randomly chosen up to an exponentially increasing cap
+    assert delays[:4] == [0.5, 1, 2, 4]
+    assert max(delays) == session._retry_max_delay
+    assert all(x[0][0] == 0 for x in uniform.call_args_list)
+
+    for attempt in range(10):
+        delay = session._retry_delay(attempt)
+        assert 0 <= delay <= min(session._retry_max_delay, session._retry_backoff * 2 ** attempt)
+
+
+def test_retry_after():
+    # the delay requested by the service is used instead of backing off
+    response, attempts, delays = _send(
+        _request(), [_response(503, {'Retry-After': '7'}), _response(200)])
+    assert response.status_code == 200
+    assert delays == [7]
+
+    response, attempts, delays = _send(
+        _request(), [_response(429, {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}), _response(200)])
+    assert response.status_code == 200
+    assert delays == [0]
+
+    # responses asking clients to wait too long are returned immediately
+    response, attempts, delays = _send(
+        _request(), [_response(503, {'Retry-After': '3600'}), _response(200)])
+    assert response.status_code == 503
+    assert (attempts, delays) == (1, [])
@@ -0,0 +1,150 @@
+from functools import partial
+import json
+from unittest.mock import patch
+
+from pytest import raises
+
+from bite.client import Cli
+from bite.exceptions import BiteError
+from bite.objects import obj_attrs
+from bite.service.bugzilla.objects import BugzillaAttachment, BugzillaBug, BugzillaComment
+from bite.store import Store
+
+
+def _bug(id, modified, comments=('comment',)):
+    bug = BugzillaBug(
+        service=None, id=id, summary=f'bug {id}', status='NEW', keywords=['a', 'b'],
+        creation_time='2020-01-01T00:00:00Z', last_change_time=modified)
+    bug.comments = tuple(
+        BugzillaComment(comment={
+            'id': i, 'creator': 'user@example.com', 'creation_time': modified,
+            'count': i, 'text': text}, id=id, count=i)
+        for i, text in enumerate(comments))
+    bug.attachments = (BugzillaAttachment(
+        id=id * 10, file_name='foo.txt', size=3, content_type='text/plain',
+        data='Zm9v', creation_time=modified, summary='foo'),)
+    return bug
+
+
+def test_round_trip(tmpdir):
+    store = Store(connection='test', path=str(tmpdir.join('store.db')))
+    bug = _bug(1, '2020-01-02T00:00:00Z')
+    bug.tags = {'x', 'y'}
+    assert store.update([bug]) == bug.modified
+
+    stored, = store.get([1])
+    assert type(stored) is BugzillaBug
+    for k, v in obj_attrs(bug).items():
+        if k not in ('comments', 'attachments'):
+            assert getattr(stored, k) == v, k
+
+    comment, = stored.comments
+    assert type(comment) is BugzillaComment
+    assert (comment.text, comment.created) == ('comment', bug.modified)
+
+    # attachment data isn't stored, only its metadata
+    attachment, = stored.attachments
+    assert type(attachment) is BugzillaAttachment
+    assert attachment.filename == 'foo.txt'
+    assert attachment.data is None
+    assert stored.changes is None
+
+    with raises(BiteError):
+        list(store.get([2]))
+    store.close()
+
+
+def test_incremental_sync(tmpdir):
+    store = Store(connection='test', path=str(tmpdir.join('store.db')))
+    assert store.synced is None
+    latest = store.update([_bug(1, '2020-01-02T00:00:00Z'), _bug(2, '2020-01-03T00:00:00Z')])
+    store.synced = latest
+    assert len(store) == 2
+
+    # items modified since the previous sync replace their stored data
+    updated = _bug(1, '2020-01-04T00:00:00Z', comments=('comment', 'reply'))
+    assert store.synced < updated.modified
+    latest = store.update([updated])
+    store.synced = latest
+    store.close()
+
+    store = Store(connection='test', path=str(tmpdir.join('store.db')))
+    assert store.synced == updated.modified
+    assert len(store) == 2
+    # items are ordered by modification time
+    assert [x.id for x in store] == [2, 1]
+    bug, = store.get([1])
+    assert bug.modified == updated.modified
+    assert [x.text for x in bug.comments] == ['comment', 'reply']
+    assert len(bug.attachments) == 1
+    store.close()
+
+
+class _SyncService(object):
+    """Service searching a fixed set of bugs by modification time."""
+
+    connection = 'test'
+    sync_params = {'status': ['all']}
+
+    class item(object):
+        type = 'bug'
+
+    def __init__(self, bugs):
+        self.bugs = bugs
+        self.searches = []
+
+    def SearchRequest(self, params):
+        self.searches.append(params)
+        # matches items modified after the given time similar to bugzilla
+        bugs = [x for x in self.bugs if x.modified > params['modified']]
+        return _Send(bugs)
+
+    def GetRequest(self, ids, **kw):
+        return _Send([x for x in self.bugs if x.id in ids])
+
+
+class _Send(object):
+
+    def __init__(self, data):
+        self.data = data
+
+    def send(self):
+        return iter(self.data)
+
+
+def _sync(service, path):
+    cli = Cli.__new__(Cli)
+    cli.service = service
+    cli.log = cli.log_t = lambda *args, **kw: None
+    # skip authentication handling
+    with patch('bite.client.Store', partial(Store, path=path)):
+        Cli.sync.__wrapped__(cli)
+
+
+def test_cli_sync(tmpdir):
+    path = str(tmpdir.join('store.db'))
+    service = _SyncService([_bug(1, '2020-01-02T00:00:00Z'), _bug(2, '2020-01-02T00:00:05Z')])
+    _sync(service, path)
+    store = Store(connection='test', path=path)
+    assert len(store) == 2
+    synced = store.synced
+    assert synced == service.bugs[1].modified
+    store.close()
+
+    # items modified during the same second as the previous sync aren't skipped
+    service.bugs.append(_bug(3, '2020-01-02T00:00:05Z'))
+    _sync(service, path)
+    assert service.searches[-1]['modified'] < synced
+    store = Store(connection='test', path=path)
+    assert sorted(x.id for x in store) == [1, 2, 3]
+    assert store.synced == synced
+    store.close()
+
+
+def test_untrusted_objects(tmpdir):
+    store = Store(connection='test', path=str(tmpdir.join('store.db')))
+    for obj in ('os:system', 'subprocess:Popen', 'bite.store:Store',
+                'bite.objects:obj_attrs', 'bite.missing:Foo', 'invalid'):
+        data = json.dumps({'__object__': obj, 'attrs': {}})
+        with raises(BiteError):
+            store._loads(data)
@@ -0,0 +1,181 @@
+from datetime import timedelta
+import threading
+from unittest.mock import patch
+
+from pytest import approx, fixture, raises
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from bite.service._throttle import AdaptiveConcurrency, RequestPolicy, TokenBucket
+
+
+class Clock(object):
+    """Fake monotonic clock advanced by sleeping."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, secs):
+        self.slept.append(secs)
+        self.now += secs
+
+
+@fixture
+def clock():
+    clock = Clock()
+    with patch('bite.service._throttle.time.monotonic', clock.monotonic), \
+            patch('bite.service._throttle.time.sleep', clock.sleep):
+        yield clock
+
+
+def _response(status=200, elapsed=0.1, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.elapsed = timedelta(seconds=elapsed)
+    response.headers = CaseInsensitiveDict(headers if headers is not None else {})
+    return response
+
+
+def test_token_bucket_invalid():
+    for rate in (0, -1):
+        with raises(ValueError):
+            TokenBucket(rate)
+    for burst in (0, 0.5, -1):
+        with raises(ValueError):
+            TokenBucket(1, burst)
+
+
+def test_token_bucket_burst(clock):
+    bucket = TokenBucket(2, burst=3)
+    # the initial burst doesn't wait
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.slept == []
+
+    # later requests are limited to the refill rate
+    for _ in range(4):
+        bucket.acquire()
+    assert sum(clock.slept) == 2
+
+    # tokens don't accumulate past the burst size while idle
+    clock.now += 60
+    clock.slept.clear()
+    for _ in range(4):
+        bucket.acquire()
+    assert sum(clock.slept) == 0.5
+
+
+def test_token_bucket_fractional_rate(clock):
+    # rates below one request per second default to single request bursts
+    bucket = TokenBucket(0.5)
+    assert bucket.burst == 1
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.slept == [2]
+
+
+def test_adaptive_decrease(clock):
+    controller = AdaptiveConcurrency(8)
+    controller.acquire()
+    controller.release(_response(200, elapsed=0.1))
+    assert controller.limit == 8
+
+    # throttled responses halve the limit
+    controller.acquire()
+    controller.release(_response(503))
+    assert controller.limit == 4
+
+    # responses to concurrently sent requests only back off once
+    controller.acquire()
+    controller.release(_response(429))
+    assert controller.limit == 4
+    clock.now += 1
+    controller.acquire()
+    controller.release(_response(429))
+    assert controller.limit == 2
+
+    # the limit never drops below the minimum
+    for _ in range(5):
+        clock.now += 1
+        controller.acquire()
+        controller.release(_response(503))
+    assert controller.limit == 1
+
+
+def test_adaptive_increase(clock):
+    controller = AdaptiveConcurrency(4)
+    controller.limit = 2.0
+    # successful responses increase the limit by roughly one per round trip
+    for _ in range(2):
+        controller.acquire()
+        controller.release(_response(200, elapsed=0.1))
+    assert controller.limit == approx(2 + 1 / 2 + 1 / 2.5)
+
+    # noticeably slower responses don't increase it
+    limit = controller.limit
+    controller.acquire()
+    controller.release(_response(200, elapsed=10))
+    assert controller.limit == limit
+
+    # nor does it grow past the maximum
+    for _ in range(100):
+        controller.acquire()
+        controller.release(_response(200, elapsed=0.1))
+    assert controller.limit == 4
+
+    # failures without responses or unrelated errors don't change it
+    controller.acquire()
+    controller.release()
+    controller.acquire()
+    controller.release(_response(404))
+    assert controller.limit == 4
+
+
+def test_adaptive_retry_after(clock):
+    controller = AdaptiveConcurrency(4)
+    controller.acquire()
+    controller.release(_response(503, headers={'Retry-After': '5'}))
+    assert controller.limit == 2
+    # new requests wait for the requested delay
+    assert controller._paused_until == clock.now + 5
+    clock.now += 5
+    controller.acquire()
+
+
+def test_adaptive_limit():
+    controller = AdaptiveConcurrency(2)
+    controller.acquire()
+    controller.acquire()
+    acquired = threading.Event()
+
+    def acquire():
+        controller.acquire()
+        acquired.set()
+
+    # requests past the limit block until others finish
+    thread = threading.Thread(target=acquire, daemon=True)
+    thread.start()
+    assert not acquired.wait(0.1)
+    controller.release(_response(200))
+    assert acquired.wait(5)
+    thread.join()
+
+
+def test_request_policy(clock):
+    policy = RequestPolicy(4, rate_limit=1, rate_burst=1)
+    # hosts are limited separately
+    policy.acquire('https://bugs.gentoo.org/rest/bug')
+    policy.acquire('https://bugzilla.kernel.org/rest/bug')
+    assert clock.slept == []
+    policy.acquire('https://bugs.gentoo.org/rest/bug/1')
+    assert clock.slept == [1]
+
+    # adaptive concurrency can be disabled
+    policy = RequestPolicy(4, adaptive=False)
+    policy.acquire('https://bugs.gentoo.org')
+    assert policy._host('https://bugs.gentoo.org') == (None, None)
+    policy.release('https://bugs.gentoo.org', _response(503))